@@ -1,5 +1,6 @@
 from fastapi import FastAPI
-from routes import auth, ads, campaigns, assets
+from routes import auth, ads, campaigns, assets, jobs, metrics, sync
+from services.auth_state import auth_states
 import os
 
 app = FastAPI()
@@ -10,6 +11,13 @@ app.include_router(auth.router, tags=["auth"])
 app.include_router(campaigns.router, tags=["campaigns"])
 app.include_router(ads.router, tags=["ads"])
 app.include_router(assets.router, tags=["assets"])
+app.include_router(jobs.router, tags=["jobs"])
+app.include_router(sync.router, tags=["sync"])
+app.include_router(metrics.router, tags=["metrics"])
+
+@app.on_event("startup")
+def start_auth_state_cleanup():
+    auth_states.start_cleanup()
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
-from typing import List
+from typing import List, Optional
 
 class CampaignCreate(BaseModel):
     customer_id: str
@@ -9,6 +9,18 @@ class CampaignCreate(BaseModel):
     start_date: date
     end_date: date
     credentials: dict
+    atomic: bool = True
+
+class CampaignSpec(BaseModel):
+    campaign_name: str
+    daily_budget: float
+    start_date: date
+    end_date: date
+
+class BulkCampaignCreate(BaseModel):
+    customer_id: str
+    credentials: dict
+    campaigns: List[CampaignSpec]
 
 class BudgetUpdate(BaseModel):
     customer_id: str
@@ -19,6 +31,19 @@ class BudgetUpdate(BaseModel):
 class CampaignsList(BaseModel):
     customer_id: str
     credentials: dict
+    concurrent: bool = False
+    max_in_flight: Optional[int] = Field(default=None, ge=1)
+
+class CampaignReport(BaseModel):
+    customer_id: str
+    credentials: dict
+    fields: Optional[List[str]] = None
+    include_removed: bool = False
+
+class MirrorChanges(BaseModel):
+    customer_id: str
+    credentials: dict
+    since_version: int = 0
 
 class AuthRequest(BaseModel):
     customer_id: str
@@ -33,6 +58,18 @@ class AdCreate(BaseModel):
     credentials: dict
     final_url: str
 
+class AdSpec(BaseModel):
+    campaign_name: str
+    headlines: List[str]
+    descriptions: List[str]
+    keywords: List[str]
+    final_url: str
+
+class BulkAdCreate(BaseModel):
+    customer_id: str
+    credentials: dict
+    ads: List[AdSpec]
+
 class Credentials(BaseModel):
     refresh_token: str
     token_uri: str
@@ -47,4 +84,30 @@ class Credentials(BaseModel):
 class AssetUpload(BaseModel):
     customer_id: str
     campaign_name: str
-    credentials: Credentials
\ No newline at end of file
+    credentials: Credentials
+
+class PriceOfferingSpec(BaseModel):
+    header: str
+    description: str
+    price: float
+    currency_code: str
+    final_url: str
+    unit: Optional[str] = None
+
+class PriceAssetUpload(BaseModel):
+    customer_id: str
+    campaign_name: str
+    credentials: Credentials
+    type: str = "SERVICES"
+    language_code: str = "en"
+    price_qualifier: Optional[str] = None
+    offerings: List[PriceOfferingSpec] = []
+
+class AssetPage(BaseModel):
+    customer_id: str
+    credentials: Credentials
+    page_size: Optional[int] = None
+    page_token: Optional[str] = None
+    fields: Optional[List[str]] = None
+    name_prefix: Optional[str] = None
+    created_after_id: Optional[int] = None
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from models.schemas import AdCreate
+from models.schemas import AdCreate, BulkAdCreate
 from services.google_ads_manager import GoogleAdsManager
 from google.ads.googleads.errors import GoogleAdsException
+from services.scheduler import RateLimitExceeded
+from routes.errors import google_ads_error, rate_limited
 
 router = APIRouter()
 
@@ -19,12 +21,25 @@ def create_ad(ad: AdCreate):
         )
         return {"message": "Ad created successfully", "ad_group_id": result}
     except GoogleAdsException as ex:
-        error_message = f"Google Ads API error occurred: {ex}"
-        for error in ex.failure.errors:
-            error_message += f"\n\tError with message '{error.message}'."
-            if error.location:
-                for field_path_element in error.location.field_path_elements:
-                    error_message += f"\n\t\tOn field: {field_path_element.field_name}"
-        raise HTTPException(status_code=400, detail=error_message)
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/create_ads")
+def create_ads(bulk: BulkAdCreate):
+    try:
+        manager = GoogleAdsManager(client=bulk.credentials, customer_id=bulk.customer_id)
+        results = manager.create_search_ads([ad.dict() for ad in bulk.ads])
+        failed = sum(1 for result in results if result["errors"])
+        return {
+            "message": f"Created {len(results) - failed} of {len(results)} ads",
+            "results": results
+        }
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
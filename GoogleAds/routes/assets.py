@@ -1,76 +1,137 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from models.schemas import AssetUpload
-from services.google_ads_manager import GoogleAdsManager
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi.responses import StreamingResponse
+from models.schemas import AssetPage, AssetUpload, CampaignsList, Credentials, PriceAssetUpload
+from typing import List, Optional
+import json
+from services.asset_index import asset_index
+from services.async_manager import AsyncGoogleAdsManager
+from services.ndjson import NDJSON_MEDIA_TYPE, ndjson_lines
 from google.ads.googleads.errors import GoogleAdsException
+from services.scheduler import RateLimitExceeded
+from routes.errors import google_ads_error, rate_limited
 
 router = APIRouter()
 
 @router.post("/upload_logo")
 async def upload_logo(asset: AssetUpload, file: UploadFile = File(...)):
     try:
-        manager = GoogleAdsManager(client=asset.credentials, customer_id=asset.customer_id)
-        result = manager.upload_logo(asset.campaign_name, file)
+        manager = AsyncGoogleAdsManager(client=asset.credentials.dict(), customer_id=asset.customer_id)
+        result = await manager.upload_logo(asset.campaign_name, file)
         return {"message": "Logo uploaded successfully", "asset_id": result}
     except GoogleAdsException as ex:
-        error_message = f"Google Ads API error occurred: {ex}"
-        for error in ex.failure.errors:
-            error_message += f"\n\tError with message '{error.message}'."
-            if error.location:
-                for field_path_element in error.location.field_path_elements:
-                    error_message += f"\n\t\tOn field: {field_path_element.field_name}"
-        raise HTTPException(status_code=400, detail=error_message)
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/upload_logos")
+async def upload_logos(
+    customer_id: str = Form(...),
+    campaign_name: str = Form(...),
+    credentials: str = Form(...),
+    files: List[UploadFile] = File(...)
+):
+    try:
+        credentials = Credentials(**json.loads(credentials)).dict()
+        manager = AsyncGoogleAdsManager(client=credentials, customer_id=customer_id)
+        results = await manager.upload_logos(campaign_name, files)
+        failed = sum(1 for result in results if result["error"])
+        return {"message": f"Uploaded {len(results) - failed} of {len(results)} logos", "results": results}
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/refresh_asset_index")
+async def refresh_asset_index(campaigns_list: CampaignsList):
+    try:
+        manager = AsyncGoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        await manager.refresh_asset_index()
+        return {"message": "Asset index rebuilt", "stats": asset_index.stats()}
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/upload_price")
-async def upload_price(asset: AssetUpload, price: float):
+async def upload_price(asset: PriceAssetUpload, price: Optional[float] = None):
+    if price is not None:
+        raise HTTPException(status_code=400, detail=(
+            "The price query parameter is no longer supported: a price asset needs 3 to 8 offerings, "
+            "sent in the request body as 'offerings' (header, description, price, currency_code, final_url)"
+        ))
     try:
-        manager = GoogleAdsManager(client=asset.credentials, customer_id=asset.customer_id)
-        result = manager.upload_price(asset.campaign_name, price)
+        manager = AsyncGoogleAdsManager(client=asset.credentials.dict(), customer_id=asset.customer_id)
+        result = await manager.upload_price(
+            asset.campaign_name, asset.dict(include={"type", "language_code", "price_qualifier", "offerings"})
+        )
         return {"message": "Price uploaded successfully", "asset_id": result}
     except GoogleAdsException as ex:
-        error_message = f"Google Ads API error occurred: {ex}"
-        for error in ex.failure.errors:
-            error_message += f"\n\tError with message '{error.message}'."
-            if error.location:
-                for field_path_element in error.location.field_path_elements:
-                    error_message += f"\n\t\tOn field: {field_path_element.field_name}"
-        raise HTTPException(status_code=400, detail=error_message)
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/get_logo_assets")
-async def get_logo_assets(asset: AssetUpload):
+async def get_logo_assets(asset: AssetUpload, format: str = "json"):
     print("Received credentials:", asset)
 
     try:
-        manager = GoogleAdsManager(client=asset.credentials.dict(), customer_id=asset.customer_id)
-        result = manager.get_logo_assets()
+        manager = AsyncGoogleAdsManager(client=asset.credentials.dict(), customer_id=asset.customer_id)
+        if format == "ndjson":
+            await manager.initialize_client()
+            return StreamingResponse(ndjson_lines(manager.iter_logo_assets()), media_type=NDJSON_MEDIA_TYPE)
+        result = await manager.get_logo_assets()
         return {"message": "Logo assets retrieved successfully", "assets": result}
     except GoogleAdsException as ex:
-        error_message = f"Google Ads API error occurred: {ex}"
-        for error in ex.failure.errors:
-            error_message += f"\n\tError with message '{error.message}'."
-            if error.location:
-                for field_path_element in error.location.field_path_elements:
-                    error_message += f"\n\t\tOn field: {field_path_element.field_name}"
-        raise HTTPException(status_code=400, detail=error_message)
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/get_price_assets")
-async def get_price_assets(asset: AssetUpload):
+async def get_price_assets(asset: AssetUpload, format: str = "json"):
     try:
-        manager = GoogleAdsManager(client=asset.credentials, customer_id=asset.customer_id)
-        result = manager.get_price_assets()
+        manager = AsyncGoogleAdsManager(client=asset.credentials.dict(), customer_id=asset.customer_id)
+        if format == "ndjson":
+            await manager.initialize_client()
+            return StreamingResponse(ndjson_lines(manager.iter_price_assets()), media_type=NDJSON_MEDIA_TYPE)
+        result = await manager.get_price_assets()
         return {"message": "Price assets retrieved successfully", "assets": result}
     except GoogleAdsException as ex:
-        error_message = f"Google Ads API error occurred: {ex}"
-        for error in ex.failure.errors:
-            error_message += f"\n\tError with message '{error.message}'."
-            if error.location:
-                for field_path_element in error.location.field_path_elements:
-                    error_message += f"\n\t\tOn field: {field_path_element.field_name}"
-        raise HTTPException(status_code=400, detail=error_message)
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def list_asset_page(kind, page: AssetPage):
+    try:
+        manager = AsyncGoogleAdsManager(client=page.credentials.dict(), customer_id=page.customer_id)
+        return await manager.list_assets(
+            kind,
+            page_size=page.page_size,
+            page_token=page.page_token,
+            fields=page.fields,
+            name_prefix=page.name_prefix,
+            created_after_id=page.created_after_id
+        )
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/list_logo_assets")
+async def list_logo_assets(page: AssetPage):
+    return await list_asset_page("logo", page)
+
+@router.post("/list_price_assets")
+async def list_price_assets(page: AssetPage):
+    return await list_asset_page("price", page)
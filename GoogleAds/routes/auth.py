@@ -1,24 +1,21 @@
 from fastapi import APIRouter, HTTPException, Request, Response
 from google_auth_oauthlib.flow import Flow
-from google.oauth2.credentials import Credentials
 from models.schemas import AuthRequest
-from typing import Dict, Any
+import json
 import uuid
 
-from services.google_ads_manager import GoogleAdsManager
+from services.auth_state import auth_states
+from services.async_manager import AsyncGoogleAdsManager, run_blocking
+from services.token_manager import token_manager
+from services.scheduler import RateLimitExceeded
+from routes.errors import rate_limited
 
 router = APIRouter()
 
-state_store: Dict[str, Dict[str, Any]] = {}
-global_credentials = None
-global_customer_id = None
-
 def generate_state():
     return str(uuid.uuid4())
 
 def authentication_google(customer_id: str, credentials: dict):
-    global global_credentials, global_customer_id
-    
     if 'web' not in credentials:
         raise ValueError(f"Credentials must contain a 'web' key. Received keys: {list(credentials.keys())}")
     
@@ -26,16 +23,13 @@ def authentication_google(customer_id: str, credentials: dict):
     refresh_token = client_config.get("refresh_token")
     
     if refresh_token:
-        global_credentials = Credentials.from_authorized_user_info(
-            {
-                "client_id": client_config["client_id"],
-                "client_secret": client_config["client_secret"],
-                "refresh_token": refresh_token
-            },
-            scopes=['https://www.googleapis.com/auth/adwords']
-        )
-        global_customer_id = customer_id
-        return global_credentials
+        return token_manager.get_credentials({
+            "client_id": client_config["client_id"],
+            "client_secret": client_config["client_secret"],
+            "refresh_token": refresh_token,
+            "token_uri": client_config.get("token_uri"),
+            "scopes": ['https://www.googleapis.com/auth/adwords']
+        })
     
     flow = Flow.from_client_config(
         client_config={'web': client_config},
@@ -44,25 +38,27 @@ def authentication_google(customer_id: str, credentials: dict):
     
     flow.redirect_uri = "http://127.0.0.1:8000/oauth2callback"
 
-    global_credentials = credentials
-    global_customer_id = customer_id
-
     state = generate_state()
     auth_url, _ = flow.authorization_url(
         access_type='offline',
         prompt='consent',
         state=state
     ) 
-    state_store[state] = {
+    # Only what the callback needs to redeem the code; the client secret is encrypted
+    auth_states.put(state, {
         "customer_id": customer_id,
-        "credentials": credentials
-    }
+        "client_id": client_config["client_id"],
+        "client_secret": auth_states.seal(client_config["client_secret"]),
+        "auth_uri": flow.client_config["auth_uri"],
+        "token_uri": flow.client_config["token_uri"],
+        "code_verifier": flow.code_verifier
+    })
     return {"state": state, "auth_url": auth_url}
 
 @router.post("/authenticate")
 async def authenticate(auth_request: AuthRequest):
     try:
-        auth_result = authentication_google(auth_request.customer_id, auth_request.credentials)
+        auth_result = await run_blocking(authentication_google, auth_request.customer_id, auth_request.credentials)
         if isinstance(auth_result, dict):
             return Response(content=json.dumps(auth_result), media_type="application/json")
         elif hasattr(auth_result, 'to_json'):
@@ -85,22 +81,32 @@ async def authenticate(auth_request: AuthRequest):
 async def oauth2callback(request: Request):
     try:
         state = request.query_params.get("state")
-        if not state or state not in state_store:
+        stored_state = await run_blocking(auth_states.get, state) if state else None
+        if stored_state is None:
             raise HTTPException(status_code=400, detail="Invalid or expired state")
 
-        stored_state = state_store[state]
         flow = Flow.from_client_config(
-            client_config={'web': stored_state['credentials']['web']},
-            scopes=['https://www.googleapis.com/auth/adwords']
+            client_config={'web': {
+                "client_id": stored_state["client_id"],
+                "client_secret": auth_states.unseal(stored_state["client_secret"]),
+                "auth_uri": stored_state["auth_uri"],
+                "token_uri": stored_state["token_uri"]
+            }},
+            scopes=['https://www.googleapis.com/auth/adwords'],
+            code_verifier=stored_state["code_verifier"]
         )
         flow.redirect_uri = request.url_for("oauth2callback")
 
         authorization_response = str(request.url)
-        flow.fetch_token(authorization_response=authorization_response)
+        await run_blocking(flow.fetch_token, authorization_response=authorization_response)
 
         credentials = flow.credentials
         refresh_token = credentials.refresh_token
-        state_store[state]["refresh_token"] = refresh_token
+        # The client secret is not needed once the code is redeemed
+        if not await run_blocking(
+            auth_states.update, state, refresh_token=auth_states.seal(refresh_token), client_secret=None
+        ):
+            raise HTTPException(status_code=400, detail="Invalid or expired state")
 
         html_content = """
         <html>
@@ -121,12 +127,15 @@ async def oauth2callback(request: Request):
 
 @router.get("/check_auth_status/{state}")
 async def check_auth_status(state: str):
-    if state not in state_store:
+    stored_state = await run_blocking(auth_states.get, state)
+    if stored_state is None:
         raise HTTPException(status_code=404, detail="State not found")
     
-    refresh_token = state_store[state].get("refresh_token")
+    refresh_token = stored_state.get("refresh_token")
     if refresh_token:
-        return {"status": "complete", "refresh_token": refresh_token}
+        # Handed out once; the state is not needed afterwards
+        await run_blocking(auth_states.delete, state)
+        return {"status": "complete", "refresh_token": auth_states.unseal(refresh_token)}
     else:
         return {"status": "pending"}
 
@@ -139,8 +148,13 @@ async def complete_auth_and_get_campaigns(request: Request):
 
     try:
         credentials['web']['refresh_token'] = refresh_token
-        manager = GoogleAdsManager(client=credentials, customer_id=customer_id)
-        campaigns = manager.get_ad_campaigns()
+        manager = AsyncGoogleAdsManager(client=credentials, customer_id=customer_id)
+        if data.get("concurrent"):
+            result = await manager.get_ad_campaigns_concurrent(max_in_flight=data.get("max_in_flight"))
+            return {"campaigns": result["campaigns"], "errors": result["errors"]}
+        campaigns = await manager.get_ad_campaigns()
         return {"campaigns": campaigns}
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to complete operation: {str(e)}")
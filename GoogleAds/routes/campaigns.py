@@ -1,11 +1,17 @@
+from typing import Literal
 from fastapi import APIRouter, HTTPException
-from models.schemas import CampaignCreate, BudgetUpdate, CampaignsList
+from fastapi.responses import StreamingResponse
+from models.schemas import CampaignCreate, BulkCampaignCreate, BudgetUpdate, CampaignsList, CampaignReport
 from services.google_ads_manager import GoogleAdsManager
+from services.ndjson import NDJSON_MEDIA_TYPE, ndjson_lines
+from services.report_engine import validate_fields
+from services.scheduler import RateLimitExceeded
+from routes.errors import rate_limited
 
 router = APIRouter()
 
 @router.post("/get_campaigns")
-def get_campaigns(campaigns_list: CampaignsList):
+def get_campaigns(campaigns_list: CampaignsList, format: Literal["json", "ndjson"] = "json"):
     try:
         # Remove hyphens from customer_id
         customer_id = str(campaigns_list.customer_id.replace('-', ''))
@@ -16,18 +22,54 @@ def get_campaigns(campaigns_list: CampaignsList):
         for field in required_fields:
             if field not in campaigns_list.credentials:
                 raise ValueError(f"Missing required field: {field}")
+        if format == "ndjson" and (campaigns_list.concurrent or campaigns_list.max_in_flight is not None):
+            # The stream reads child accounts one at a time and has no per-account error list
+            raise ValueError("concurrent and max_in_flight cannot be combined with format=ndjson")
 
         manager = GoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
         manager.initialize_client()  
+        if format == "ndjson":
+            return StreamingResponse(ndjson_lines(manager.iter_ad_campaigns()), media_type=NDJSON_MEDIA_TYPE)
+        if campaigns_list.concurrent:
+            return manager.get_ad_campaigns_concurrent(max_in_flight=campaigns_list.max_in_flight)
         campaigns = manager.get_ad_campaigns()
         return campaigns
     except ValueError as e:
         print(f"ValueError in get_campaigns: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         print(f"Error in get_campaigns: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Failed to get campaigns: {str(e)}")
 
+@router.post("/invalidate_customer_hierarchy")
+def invalidate_customer_hierarchy(campaigns_list: CampaignsList):
+    try:
+        manager = GoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        manager.invalidate_customer_hierarchy()
+        return {"message": "Customer hierarchy cache invalidated"}
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/campaign_report")
+def campaign_report(report: CampaignReport):
+    try:
+        if report.fields:
+            validate_fields(report.fields)
+        manager = GoogleAdsManager(client=report.credentials, customer_id=report.customer_id)
+        manager.initialize_client()
+        rows = manager.stream_campaign_report(report.fields, report.include_removed)
+        return StreamingResponse(ndjson_lines(rows), media_type=NDJSON_MEDIA_TYPE)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get campaign report: {str(e)}")
+
 @router.post("/create_campaign")
 def create_campaign(campaign: CampaignCreate):
     print('accessed')
@@ -37,9 +79,27 @@ def create_campaign(campaign: CampaignCreate):
             campaign.campaign_name,
             campaign.daily_budget,
             campaign.start_date,
-            campaign.end_date
+            campaign.end_date,
+            atomic=campaign.atomic
         )
         return {"message": "Campaign created successfully", "campaign_id": result}
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/create_campaigns")
+def create_campaigns(bulk: BulkCampaignCreate):
+    try:
+        manager = GoogleAdsManager(client=bulk.credentials, customer_id=bulk.customer_id)
+        results = manager.create_campaigns([campaign.dict() for campaign in bulk.campaigns])
+        failed = sum(1 for result in results if result["errors"])
+        return {
+            "message": f"Created {len(results) - failed} of {len(results)} campaigns",
+            "results": results
+        }
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -49,5 +109,7 @@ def update_campaign_budget(budget_update: BudgetUpdate):
         manager = GoogleAdsManager(client=budget_update.credentials, customer_id=budget_update.customer_id)
         result = manager.update_campaign_budget(budget_update.campaign_name, budget_update.new_budget)
         return {"message": "Campaign budget updated successfully", "success": result}
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
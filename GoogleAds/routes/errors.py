@@ -0,0 +1,11 @@
+import math
+from fastapi import HTTPException
+from services.errors import describe_error
+
+
+def google_ads_error(ex):
+    return HTTPException(status_code=400, detail=describe_error(ex))
+
+
+def rate_limited(ex):
+    return HTTPException(status_code=429, detail=str(ex), headers={"Retry-After": str(math.ceil(ex.retry_after))})
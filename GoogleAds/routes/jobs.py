@@ -0,0 +1,70 @@
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import JSONResponse
+from models.schemas import AdCreate, BulkAdCreate, BulkCampaignCreate, CampaignsList
+from services.google_ads_manager import GoogleAdsManager
+from services.job_queue import JobQueueFull, job_queue
+
+router = APIRouter()
+
+def submit_job(kind, fn, *args, **kwargs):
+    try:
+        job_id = job_queue.submit(kind, fn, *args, **kwargs)
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return JSONResponse(status_code=202, content={"job_id": job_id, "status": "pending"})
+
+@router.post("/jobs/get_campaigns")
+def submit_get_campaigns(campaigns_list: CampaignsList):
+    try:
+        manager = GoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if campaigns_list.concurrent:
+        return submit_job("get_campaigns", manager.get_ad_campaigns_concurrent,
+                          max_in_flight=campaigns_list.max_in_flight)
+    return submit_job("get_campaigns", manager.get_ad_campaigns)
+
+@router.post("/jobs/create_ad")
+def submit_create_ad(ad: AdCreate):
+    try:
+        manager = GoogleAdsManager(client=ad.credentials, customer_id=ad.customer_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return submit_job("create_ad", manager.create_search_ad, ad.campaign_name, ad.headlines,
+                      ad.descriptions, ad.keywords, ad.final_url)
+
+@router.post("/jobs/create_ads")
+def submit_create_ads(bulk: BulkAdCreate):
+    try:
+        manager = GoogleAdsManager(client=bulk.credentials, customer_id=bulk.customer_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return submit_job("create_ads", manager.create_search_ads, [ad.dict() for ad in bulk.ads])
+
+@router.post("/jobs/create_campaigns")
+def submit_create_campaigns(bulk: BulkCampaignCreate):
+    try:
+        manager = GoogleAdsManager(client=bulk.credentials, customer_id=bulk.customer_id)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return submit_job("create_campaigns", manager.create_campaigns,
+                      [campaign.dict() for campaign in bulk.campaigns])
+
+@router.get("/jobs/{job_id}")
+def check_job_status(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    job.pop("result")
+    return job
+
+@router.get("/jobs/{job_id}/result")
+def get_job_result(job_id: str):
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["status"] == "failed":
+        raise HTTPException(status_code=400, detail=job["error"])
+    if job["status"] != "complete":
+        return JSONResponse(status_code=202, content={"job_id": job_id, "status": job["status"]})
+    return {"job_id": job_id, "status": "complete", "result": job["result"]}
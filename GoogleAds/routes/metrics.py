@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from services.asset_index import asset_index
+from services.auth_state import auth_states
+from services.campaign_index import campaign_index
+from services.change_mirror import change_mirror
+from services.client_pool import client_pool
+from services.hierarchy_cache import hierarchy_cache
+from services.job_queue import job_queue
+from services.metrics import metrics
+from services.response_cache import response_cache
+from services.scheduler import scheduler
+from services.single_flight import single_flight
+from services.token_manager import token_manager
+
+router = APIRouter()
+
+metrics.register_stats("client_pool", client_pool.stats, counters=("hits", "misses", "evictions"))
+metrics.register_stats(
+    "token_manager", token_manager.stats,
+    counters=("hits", "refreshes", "background_refreshes", "failures"),
+)
+metrics.register_stats("scheduler", scheduler.stats, counters=("throttled", "rejected", "quota_errors"))
+metrics.register_stats(
+    "hierarchy_cache", hierarchy_cache.stats, counters=("hits", "stale_hits", "misses", "evictions")
+)
+metrics.register_stats("campaign_index", campaign_index.stats, counters=("hits", "misses", "reloads"))
+metrics.register_stats("asset_index", asset_index.stats, counters=("hits", "misses", "rebuilds"))
+metrics.register_stats("response_cache", response_cache.stats, counters=("hits", "stale_hits", "misses"))
+metrics.register_stats("job_queue", job_queue.stats)
+metrics.register_stats("auth_states", auth_states.stats, counters=("purged",))
+metrics.register_stats("single_flight", single_flight.stats, counters=("executions", "shared"))
+metrics.register_stats("change_mirror", change_mirror.stats, counters=("syncs", "full_loads", "changed"))
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
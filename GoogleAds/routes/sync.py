@@ -0,0 +1,82 @@
+from fastapi import APIRouter, HTTPException
+from google.ads.googleads.errors import GoogleAdsException
+from services.scheduler import RateLimitExceeded
+from routes.errors import google_ads_error, rate_limited
+from models.schemas import CampaignsList, MirrorChanges
+from services.async_manager import AsyncGoogleAdsManager
+from services.asset_index import IMAGE, PRICE
+
+router = APIRouter()
+
+@router.post("/sync_changes")
+async def sync_changes(campaigns_list: CampaignsList):
+    try:
+        manager = AsyncGoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        return await manager.sync_changes()
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/get_changes")
+async def get_changes(changes: MirrorChanges):
+    try:
+        manager = AsyncGoogleAdsManager(client=changes.credentials, customer_id=changes.customer_id)
+        return await manager.get_mirror_changes(changes.since_version)
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/mirror/get_campaigns")
+async def get_mirrored_campaigns(campaigns_list: CampaignsList):
+    try:
+        manager = AsyncGoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        return await manager.get_mirrored_campaigns()
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/mirror/get_logo_assets")
+async def get_mirrored_logo_assets(campaigns_list: CampaignsList):
+    try:
+        manager = AsyncGoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        return {"message": "Logo assets retrieved successfully", "assets": await manager.get_mirrored_assets(IMAGE)}
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/mirror/get_price_assets")
+async def get_mirrored_price_assets(campaigns_list: CampaignsList):
+    try:
+        manager = AsyncGoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        return {"message": "Price assets retrieved successfully", "assets": await manager.get_mirrored_assets(PRICE)}
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/invalidate_mirror")
+async def invalidate_mirror(campaigns_list: CampaignsList):
+    try:
+        manager = AsyncGoogleAdsManager(client=campaigns_list.credentials, customer_id=campaigns_list.customer_id)
+        await manager.invalidate_mirror()
+        return {"message": "Mirror will be fully reloaded on the next sync"}
+    except GoogleAdsException as ex:
+        raise google_ads_error(ex)
+    except RateLimitExceeded as e:
+        raise rate_limited(e)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -0,0 +1,149 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+
+from services.image_assets import DIGEST_LENGTH, asset_name_digest
+
+IMAGE = "IMAGE"
+PRICE = "PRICE"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assets (
+    customer_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    resource_name TEXT NOT NULL,
+    PRIMARY KEY (customer_id, scope, kind, digest)
+);
+CREATE TABLE IF NOT EXISTS indexed_customers (
+    customer_id TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    rebuilt_at REAL NOT NULL,
+    PRIMARY KEY (customer_id, scope)
+);
+"""
+
+
+def price_digest(price_asset):
+    # Like image digests, this covers the content only: assets belong to the customer, and the
+    # campaign name in an asset's name is just a label from its first upload. 10, 10.0 and
+    # "10.00" are the same price.
+    offerings = [
+        {**offering, "price": format(Decimal(str(offering["price"])).normalize(), "f")}
+        for offering in price_asset["offerings"]
+    ]
+    content = json.dumps({**price_asset, "offerings": offerings}, sort_keys=True)
+    return hashlib.sha256(content.encode()).hexdigest()[:DIGEST_LENGTH]
+
+
+class AssetIndex:
+    """Content-addressed map of (customer, scope, asset kind, digest) -> asset resource name.
+
+    Backed by SQLite so it survives restarts and is shared by worker processes
+    on one host. A customer's entries are rebuilt from a single asset query,
+    reading the digest tagged onto asset names, at most every ``ttl`` seconds;
+    uploads through this service add their entries as they are created.
+    Entries are kept per ``scope`` identifying the caller's credentials, so an
+    existing asset is only returned to credentials that listed it themselves.
+    """
+
+    def __init__(self, path=":memory:", ttl=86400):
+        self.path = path
+        self.ttl = ttl
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        columns = [row[1] for row in self._connection.execute("PRAGMA table_info(assets)")]
+        if columns and "scope" not in columns:
+            # Written before entries were scoped; the index is rebuilt from the API anyway
+            self._connection.executescript("DROP TABLE assets; DROP TABLE IF EXISTS indexed_customers;")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rebuilds = 0
+
+    def needs_rebuild(self, customer_id, scope=""):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT rebuilt_at FROM indexed_customers WHERE customer_id = ? AND scope = ?", (customer_id, scope)
+            ).fetchone()
+        return row is None or time.time() - row[0] >= self.ttl
+
+    def rebuild(self, customer_id, assets, scope=""):
+        """Replaces a customer's entries with ``assets``, an iterable of (kind, name, resource name)."""
+        entries = {}
+        for kind, name, resource_name in assets:
+            digest = asset_name_digest(name)
+            if digest:
+                entries.setdefault((kind, digest), resource_name)
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM assets WHERE customer_id = ? AND scope = ?", (customer_id, scope))
+            self._connection.executemany(
+                "INSERT INTO assets VALUES (?, ?, ?, ?, ?)",
+                [(customer_id, scope, kind, digest, resource_name)
+                 for (kind, digest), resource_name in entries.items()]
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO indexed_customers VALUES (?, ?, ?)", (customer_id, scope, time.time())
+            )
+            self.rebuilds += 1
+
+    def get_many(self, customer_id, kind, digests, scope=""):
+        digests = list(digests)
+        found = {}
+        with self._lock:
+            for start in range(0, len(digests), 500):
+                chunk = digests[start:start + 500]
+                rows = self._connection.execute(
+                    "SELECT digest, resource_name FROM assets WHERE customer_id = ? AND scope = ? AND kind = ? "
+                    f"AND digest IN ({', '.join('?' * len(chunk))})",
+                    (customer_id, scope, kind, *chunk)
+                )
+                found.update(rows)
+            self.hits += len(found)
+            self.misses += len(digests) - len(found)
+        return found
+
+    def get(self, customer_id, kind, digest, scope=""):
+        return self.get_many(customer_id, kind, [digest], scope).get(digest)
+
+    def put(self, customer_id, kind, digest, resource_name, scope=""):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO assets VALUES (?, ?, ?, ?, ?)",
+                (customer_id, scope, kind, digest, resource_name)
+            )
+
+    def invalidate(self, customer_id, resource_name=None):
+        with self._lock, self._connection:
+            if resource_name is None:
+                self._connection.execute("DELETE FROM assets WHERE customer_id = ?", (customer_id,))
+                self._connection.execute("DELETE FROM indexed_customers WHERE customer_id = ?", (customer_id,))
+            else:
+                self._connection.execute(
+                    "DELETE FROM assets WHERE customer_id = ? AND resource_name = ?", (customer_id, resource_name)
+                )
+
+    def stats(self):
+        with self._lock:
+            assets = self._connection.execute("SELECT COUNT(*) FROM assets").fetchone()[0]
+            customers = self._connection.execute(
+                "SELECT COUNT(DISTINCT customer_id) FROM indexed_customers"
+            ).fetchone()[0]
+            return {
+                "customers": customers,
+                "assets": assets,
+                "hits": self.hits,
+                "misses": self.misses,
+                "rebuilds": self.rebuilds,
+            }
+
+
+asset_index = AssetIndex(
+    path=os.getenv("GOOGLE_ADS_ASSET_INDEX_PATH", "asset_index.sqlite3"),
+    ttl=float(os.getenv("GOOGLE_ADS_ASSET_INDEX_TTL", "86400")),
+)
@@ -0,0 +1,81 @@
+import base64
+import binascii
+import json
+import os
+
+DEFAULT_PAGE_SIZE = int(os.getenv("GOOGLE_ADS_ASSET_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("GOOGLE_ADS_ASSET_MAX_PAGE_SIZE", "1000"))
+
+LOGO_ASSET_FIELDS = {
+    "id": "asset.id",
+    "resource_name": "asset.resource_name",
+    "name": "asset.name",
+    "file_size": "asset.image_asset.file_size",
+    "width": "asset.image_asset.full_size.width_pixels",
+    "height": "asset.image_asset.full_size.height_pixels",
+    "url": "asset.image_asset.full_size.url",
+}
+PRICE_ASSET_FIELDS = {
+    "id": "asset.id",
+    "resource_name": "asset.resource_name",
+    "name": "asset.name",
+    "type": "asset.price_asset.type",
+    # GAQL only selects the offerings as a whole; FIELD_TRANSFORMS read the first one
+    "header": "asset.price_asset.price_offerings",
+    "description": "asset.price_asset.price_offerings",
+    "price_amount": "asset.price_asset.price_offerings",
+    "currency_code": "asset.price_asset.price_offerings",
+    "unit": "asset.price_asset.price_offerings",
+}
+
+# kind -> (output key -> GAQL field, base filters)
+ASSET_LISTINGS = {
+    "logo": (LOGO_ASSET_FIELDS, ("asset.type = IMAGE", "asset.name LIKE '%Logo%'")),
+    "price": (PRICE_ASSET_FIELDS, ("asset.type = PRICE",)),
+}
+
+def _first_offering(read):
+    return lambda offerings: read(offerings[0]) if offerings else None
+
+
+FIELD_TRANSFORMS = {
+    "header": _first_offering(lambda offering: offering.header),
+    "description": _first_offering(lambda offering: offering.description),
+    "price_amount": _first_offering(lambda offering: offering.price.amount_micros / 1000000),
+    "currency_code": _first_offering(lambda offering: offering.price.currency_code),
+    "unit": _first_offering(lambda offering: offering.unit.name),
+}
+
+
+def select_fields(field_map, fields=None):
+    """Returns the requested output keys, always starting with ``id`` which the page cursor needs."""
+    if not fields:
+        return list(field_map)
+    unknown = [field for field in fields if field not in field_map]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(field_map)}")
+    return ["id"] + [field for field in dict.fromkeys(fields) if field != "id"]
+
+
+def validate_page_size(page_size):
+    if page_size < 1 or page_size > MAX_PAGE_SIZE:
+        raise ValueError(f"page_size must be between 1 and {MAX_PAGE_SIZE}")
+    return page_size
+
+
+def encode_page_token(after_id):
+    return base64.urlsafe_b64encode(json.dumps({"after_id": after_id}).encode()).decode()
+
+
+def decode_page_token(token):
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(token.encode()))["after_id"])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid page token")
+
+
+def like_prefix(prefix):
+    # GAQL LIKE treats [, ], % and _ as special; wrapping one in brackets matches it literally
+    escaped = "".join(f"[{char}]" if char in "[]%_" else char for char in prefix)
+    escaped = escaped.replace("\\", "\\\\").replace("'", "\\'")
+    return f"{escaped}%"
@@ -0,0 +1,39 @@
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+from services.google_ads_manager import GoogleAdsManager
+
+# The google-ads library only ships a synchronous gRPC transport, so blocking
+# calls run here instead of on the event loop
+blocking_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv("GOOGLE_ADS_BLOCKING_WORKERS", "32")),
+    thread_name_prefix="google-ads",
+)
+
+
+async def run_blocking(fn, /, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(blocking_executor, functools.partial(fn, *args, **kwargs))
+
+
+class AsyncGoogleAdsManager:
+    """Awaitable façade over GoogleAdsManager for async routes.
+
+    Each public manager method is exposed as a coroutine that runs the call on
+    ``blocking_executor``. Lazy ``iter_*`` and ``stream_*`` generators are
+    returned as is, since StreamingResponse already iterates them in a thread.
+    """
+
+    def __init__(self, client, customer_id):
+        self.manager = GoogleAdsManager(client=client, customer_id=customer_id)
+
+    def __getattr__(self, name):
+        attr = getattr(self.manager, name)
+        if not callable(attr) or name.startswith(("iter_", "stream_")):
+            return attr
+
+        @functools.wraps(attr)
+        async def call(*args, **kwargs):
+            return await run_blocking(attr, *args, **kwargs)
+        return call
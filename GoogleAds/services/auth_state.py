@@ -0,0 +1,190 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from cryptography.fernet import Fernet
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteAuthStateBackend:
+    """Keeps OAuth states in a SQLite file that every worker process on the host can open."""
+
+    def __init__(self, path):
+        self.path = path
+        if path != ":memory:":
+            # Only the service's user may read pending states; SQLite gives its WAL files the same mode
+            os.close(os.open(path, os.O_CREAT | os.O_RDWR, 0o600))
+            os.chmod(path, 0o600)
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS auth_states (state TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def put(self, state, data, ttl):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO auth_states VALUES (?, ?, ?)", (state, json.dumps(data), time.time() + ttl)
+            )
+
+    def get(self, state):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT data FROM auth_states WHERE state = ? AND expires_at > ?", (state, time.time())
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def update(self, state, fields):
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT data FROM auth_states WHERE state = ? AND expires_at > ?", (state, time.time())
+            ).fetchone()
+            if row is None:
+                return False
+            data = {**json.loads(row[0]), **fields}
+            self._connection.execute("UPDATE auth_states SET data = ? WHERE state = ?", (json.dumps(data), state))
+            return True
+
+    def delete(self, state):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM auth_states WHERE state = ?", (state,))
+
+    def purge_expired(self):
+        with self._lock, self._connection:
+            return self._connection.execute("DELETE FROM auth_states WHERE expires_at <= ?", (time.time(),)).rowcount
+
+    def count(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM auth_states WHERE expires_at > ?", (time.time(),)
+            ).fetchone()[0]
+
+
+class RedisAuthStateBackend:
+    """Keeps OAuth states in a Redis-compatible server shared by every node. Redis expires keys itself."""
+
+    def __init__(self, url, prefix="google_ads:auth_state:"):
+        try:
+            import redis
+            from redis.exceptions import WatchError
+        except ImportError:
+            raise RuntimeError("The redis package is required for GOOGLE_ADS_AUTH_STATE_URL")
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+        self._watch_error = WatchError
+
+    def put(self, state, data, ttl):
+        self._redis.set(self.prefix + state, json.dumps(data), ex=max(1, int(ttl)))
+
+    def get(self, state):
+        raw = self._redis.get(self.prefix + state)
+        return None if raw is None else json.loads(raw)
+
+    def update(self, state, fields):
+        key = self.prefix + state
+        with self._redis.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(key)
+                    raw = pipe.get(key)
+                    if raw is None:
+                        return False
+                    pipe.multi()
+                    pipe.set(key, json.dumps({**json.loads(raw), **fields}), keepttl=True)
+                    pipe.execute()
+                    return True
+                except self._watch_error:
+                    # Another worker changed the state between WATCH and EXEC
+                    continue
+
+    def delete(self, state):
+        self._redis.delete(self.prefix + state)
+
+    def purge_expired(self):
+        return 0
+
+    def count(self):
+        return sum(1 for _ in self._redis.scan_iter(self.prefix + "*"))
+
+
+class AuthStateStore:
+    """OAuth state store shared by all workers, so a callback can land on any process.
+
+    States expire ``ttl`` seconds after ``/authenticate`` created them. A daemon
+    thread removes expired states every ``cleanup_interval`` seconds. Secrets in
+    a state are stored with ``seal`` and read back with ``unseal``, which encrypt
+    them with ``key``; every worker must share the key to read each other's
+    states.
+    """
+
+    def __init__(self, backend, ttl=900, cleanup_interval=300, key=None):
+        if key is None:
+            logger.warning('GOOGLE_ADS_AUTH_STATE_KEY is not set; OAuth callbacks must reach the worker that started them')
+            key = Fernet.generate_key()
+        self._fernet = Fernet(key)
+        self.backend = backend
+        self.ttl = ttl
+        self.cleanup_interval = cleanup_interval
+        self._cleanup_thread = None
+        self._lock = threading.Lock()
+        self.purged = 0
+
+    def put(self, state, data):
+        self.backend.put(state, data, self.ttl)
+
+    def seal(self, secret):
+        return self._fernet.encrypt(secret.encode()).decode()
+
+    def unseal(self, sealed):
+        return self._fernet.decrypt(sealed.encode()).decode()
+
+    def get(self, state):
+        return self.backend.get(state)
+
+    def update(self, state, **fields):
+        return self.backend.update(state, fields)
+
+    def delete(self, state):
+        self.backend.delete(state)
+
+    def start_cleanup(self):
+        with self._lock:
+            if self._cleanup_thread is None:
+                self._cleanup_thread = threading.Thread(target=self._cleanup_loop, daemon=True)
+                self._cleanup_thread.start()
+
+    def _cleanup_loop(self):
+        while True:
+            time.sleep(self.cleanup_interval)
+            try:
+                self.purged += self.backend.purge_expired()
+            except Exception as e:
+                logger.error(f'Failed to purge expired auth states: {e}')
+
+    def stats(self):
+        return {
+            "backend": type(self.backend).__name__,
+            "states": self.backend.count(),
+            "purged": self.purged,
+        }
+
+
+def build_backend():
+    url = os.getenv("GOOGLE_ADS_AUTH_STATE_URL")
+    if url:
+        return RedisAuthStateBackend(url)
+    return SQLiteAuthStateBackend(os.getenv("GOOGLE_ADS_AUTH_STATE_PATH", "auth_state.sqlite3"))
+
+
+auth_states = AuthStateStore(
+    build_backend(),
+    ttl=float(os.getenv("GOOGLE_ADS_AUTH_STATE_TTL", "900")),
+    cleanup_interval=float(os.getenv("GOOGLE_ADS_AUTH_STATE_CLEANUP_INTERVAL", "300")),
+    key=os.getenv("GOOGLE_ADS_AUTH_STATE_KEY"),
+)
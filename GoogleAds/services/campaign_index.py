@@ -0,0 +1,92 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+CampaignIndexEntry = namedtuple("CampaignIndexEntry", ["id", "budget_resource_name", "status"])
+
+
+class _CustomerIndex:
+    __slots__ = ("campaigns", "loaded_at")
+
+    def __init__(self, campaigns):
+        self.campaigns = campaigns
+        self.loaded_at = time.monotonic()
+
+
+class CampaignIndex:
+    """Per-customer map of campaign name -> (campaign id, budget resource name, status).
+
+    A customer's index is loaded in bulk with one query and kept for ``ttl``
+    seconds; writes through this service update it in place. Lookups that miss
+    may trigger a reload, but no more often than every ``refresh_interval``
+    seconds per customer so unknown names cannot cause a query storm. Indexes
+    are kept per customer and a ``scope`` identifying the caller's credentials,
+    so names are only resolved for credentials that loaded the index themselves.
+    """
+
+    def __init__(self, ttl=900, refresh_interval=10):
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self._customers = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _live(self, key):
+        index = self._customers.get(key)
+        if index is not None and time.monotonic() - index.loaded_at >= self.ttl:
+            del self._customers[key]
+            return None
+        return index
+
+    def get(self, customer_id, campaign_name, scope=None):
+        with self._lock:
+            index = self._live((customer_id, scope))
+            entry = index.campaigns.get(campaign_name) if index else None
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return entry
+
+    def should_reload(self, customer_id, scope=None):
+        with self._lock:
+            index = self._live((customer_id, scope))
+            return index is None or time.monotonic() - index.loaded_at >= self.refresh_interval
+
+    def load(self, customer_id, campaigns, scope=None):
+        with self._lock:
+            self._customers[(customer_id, scope)] = _CustomerIndex(campaigns)
+            self.reloads += 1
+
+    def put(self, customer_id, campaign_name, entry, scope=None):
+        with self._lock:
+            index = self._live((customer_id, scope))
+            if index is not None:
+                index.campaigns[campaign_name] = entry
+
+    def invalidate(self, customer_id, campaign_name=None):
+        # Every scope's index of the customer goes stale together
+        with self._lock:
+            for key in [key for key in self._customers if key[0] == customer_id]:
+                if campaign_name is None:
+                    del self._customers[key]
+                else:
+                    self._customers[key].campaigns.pop(campaign_name, None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "indexes": len(self._customers),
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+            }
+
+
+campaign_index = CampaignIndex(
+    ttl=float(os.getenv("GOOGLE_ADS_CAMPAIGN_INDEX_TTL", "900")),
+    refresh_interval=float(os.getenv("GOOGLE_ADS_CAMPAIGN_INDEX_REFRESH_INTERVAL", "10")),
+)
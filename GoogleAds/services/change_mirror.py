@@ -0,0 +1,234 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CAMPAIGN = "campaign"
+BUDGET = "budget"
+ASSET = "asset"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entities (
+    customer_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    resource_name TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    removed INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (customer_id, kind, resource_name)
+);
+CREATE INDEX IF NOT EXISTS entities_by_version ON entities (customer_id, version);
+CREATE TABLE IF NOT EXISTS sync_state (
+    customer_id TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    stream TEXT NOT NULL,
+    watermark TEXT NOT NULL,
+    event_watermark TEXT,
+    synced_at REAL NOT NULL,
+    PRIMARY KEY (customer_id, account_id, stream)
+);
+CREATE TABLE IF NOT EXISTS mirrored_customers (
+    customer_id TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    synced_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS verified_access (
+    customer_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    verified_at REAL NOT NULL,
+    PRIMARY KEY (customer_id, fingerprint)
+);
+"""
+
+
+class ChangeMirror:
+    """Local SQLite copy of each customer's campaigns, budgets and assets.
+
+    Every sync that changes something bumps the customer's version and stamps
+    the changed rows with it, so ``changes(customer, since)`` returns exactly
+    what differs from a reader's last known version. Removed entities stay as
+    tombstones so they show up in diffs. ``sync_state`` keeps the change
+    watermark of each (account, stream) the sync engine follows.
+    ``verified_access`` records which credentials fingerprints recently proved
+    they can read a customer, since reads from the mirror make no API call.
+    """
+
+    def __init__(self, path=":memory:"):
+        self.path = path
+        self._connection = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        if path != ":memory:":
+            self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.syncs = 0
+        self.full_loads = 0
+        self.changed = 0
+
+    def needs_sync(self, customer_id, interval):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT synced_at FROM mirrored_customers WHERE customer_id = ?", (customer_id,)
+            ).fetchone()
+        return row is None or time.time() - row[0] >= interval
+
+    def stream_state(self, customer_id, account_id, stream):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT watermark, event_watermark, synced_at FROM sync_state "
+                "WHERE customer_id = ? AND account_id = ? AND stream = ?",
+                (customer_id, account_id, stream)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"watermark": row[0], "event_watermark": row[1], "synced_at": row[2]}
+
+    def apply(self, customer_id, upserts=(), removals=(), replace=(), states=(), full_loads=0):
+        """Writes one sync's results in a single transaction and returns (version, changed rows).
+
+        ``upserts`` are (kind, resource name, account ID, data) tuples, ``removals``
+        are (kind, resource name) pairs, and every live entity of a (kind, account ID)
+        in ``replace`` that is not among ``upserts`` is removed. ``states`` are
+        (account ID, stream, watermark, event watermark) tuples to record.
+        """
+        now = time.time()
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT version FROM mirrored_customers WHERE customer_id = ?", (customer_id,)
+            ).fetchone()
+            version = (row[0] if row else 0) + 1
+            changed = 0
+
+            seen = set()
+            for kind, resource_name, account_id, data in upserts:
+                seen.add((kind, resource_name))
+                encoded = json.dumps(data, sort_keys=True)
+                current = self._connection.execute(
+                    "SELECT data, removed FROM entities WHERE customer_id = ? AND kind = ? AND resource_name = ?",
+                    (customer_id, kind, resource_name)
+                ).fetchone()
+                if current == (encoded, 0):
+                    continue
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO entities VALUES (?, ?, ?, ?, ?, ?, 0)",
+                    (customer_id, kind, resource_name, account_id, encoded, version)
+                )
+                changed += 1
+
+            removals = list(removals)
+            for kind, account_id in replace:
+                live = self._connection.execute(
+                    "SELECT resource_name FROM entities "
+                    "WHERE customer_id = ? AND kind = ? AND account_id = ? AND removed = 0",
+                    (customer_id, kind, account_id)
+                )
+                removals.extend((kind, name) for (name,) in live if (kind, name) not in seen)
+            for kind, resource_name in removals:
+                changed += self._connection.execute(
+                    "UPDATE entities SET removed = 1, version = ? "
+                    "WHERE customer_id = ? AND kind = ? AND resource_name = ? AND removed = 0",
+                    (version, customer_id, kind, resource_name)
+                ).rowcount
+
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?, ?, ?)",
+                [(customer_id, account_id, stream, watermark, event_watermark, now)
+                 for account_id, stream, watermark, event_watermark in states]
+            )
+            if not changed:
+                version -= 1
+            self._connection.execute(
+                "INSERT OR REPLACE INTO mirrored_customers VALUES (?, ?, ?)", (customer_id, version, now)
+            )
+            self.syncs += 1
+            self.full_loads += full_loads
+            self.changed += changed
+        return version, changed
+
+    def version(self, customer_id):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT version FROM mirrored_customers WHERE customer_id = ?", (customer_id,)
+            ).fetchone()
+        return row[0] if row else 0
+
+    def entities(self, customer_id, kind):
+        """Returns the live entities of a kind as (resource name, account ID, data) tuples."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT resource_name, account_id, data FROM entities "
+                "WHERE customer_id = ? AND kind = ? AND removed = 0 ORDER BY resource_name",
+                (customer_id, kind)
+            ).fetchall()
+        return [(resource_name, account_id, json.loads(data)) for resource_name, account_id, data in rows]
+
+    def changes(self, customer_id, since_version=0):
+        """Returns the current version and every entity changed or removed after ``since_version``."""
+        with self._lock:
+            version_row = self._connection.execute(
+                "SELECT version FROM mirrored_customers WHERE customer_id = ?", (customer_id,)
+            ).fetchone()
+            rows = self._connection.execute(
+                "SELECT kind, resource_name, account_id, data, removed FROM entities "
+                "WHERE customer_id = ? AND version > ? ORDER BY version, kind, resource_name",
+                (customer_id, since_version)
+            ).fetchall()
+        changes = [
+            {
+                "kind": kind,
+                "resource_name": resource_name,
+                "account_id": account_id,
+                "removed": bool(removed),
+                "data": None if removed else json.loads(data),
+            }
+            for kind, resource_name, account_id, data, removed in rows
+        ]
+        return (version_row[0] if version_row else 0), changes
+
+    def is_verified(self, customer_id, fingerprint, ttl):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT verified_at FROM verified_access WHERE customer_id = ? AND fingerprint = ?",
+                (customer_id, fingerprint)
+            ).fetchone()
+        return row is not None and time.time() - row[0] < ttl
+
+    def mark_verified(self, customer_id, fingerprint, ttl):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM verified_access WHERE verified_at <= ?", (now - ttl,))
+            self._connection.execute(
+                "INSERT OR REPLACE INTO verified_access VALUES (?, ?, ?)", (customer_id, fingerprint, now)
+            )
+
+    def mark_stale(self, customer_id):
+        # The next read syncs instead of waiting for the interval
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE mirrored_customers SET synced_at = 0 WHERE customer_id = ?", (customer_id,)
+            )
+
+    def invalidate(self, customer_id):
+        # Forgetting the watermarks makes the next sync a full load. Entities are kept so
+        # that load can still report what disappeared in the meantime.
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM sync_state WHERE customer_id = ?", (customer_id,))
+            self._connection.execute(
+                "UPDATE mirrored_customers SET synced_at = 0 WHERE customer_id = ?", (customer_id,)
+            )
+
+    def stats(self):
+        with self._lock:
+            customers = self._connection.execute("SELECT COUNT(*) FROM mirrored_customers").fetchone()[0]
+            entities = self._connection.execute("SELECT COUNT(*) FROM entities WHERE removed = 0").fetchone()[0]
+            return {
+                "customers": customers,
+                "entities": entities,
+                "syncs": self.syncs,
+                "full_loads": self.full_loads,
+                "changed": self.changed,
+            }
+
+
+change_mirror = ChangeMirror(path=os.getenv("GOOGLE_ADS_SYNC_PATH", "change_mirror.sqlite3"))
@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from google.ads.googleads.client import GoogleAdsClient
+from services.single_flight import SingleFlight
+from services.token_manager import token_manager
+
+logger = logging.getLogger(__name__)
+
+
+def build_client(config):
+    # Clients share the token manager's credentials, so they never exchange the refresh token themselves
+    return GoogleAdsClient(
+        credentials=token_manager.get_credentials(config),
+        developer_token=config["developer_token"],
+        login_customer_id=config.get("login_customer_id"),
+        use_proto_plus=config.get("use_proto_plus", True),
+    )
+
+
+class _PoolEntry:
+    __slots__ = ("client", "services", "created_at", "lock")
+
+    def __init__(self, client):
+        self.client = client
+        self.services = {}
+        self.created_at = time.monotonic()
+        self.lock = threading.Lock()
+
+
+class GoogleAdsClientPool:
+    """Process-wide cache of GoogleAdsClient instances and their service clients.
+
+    Building a client and the gRPC channel behind each service is the expensive
+    part of a Google Ads call, so entries are shared across requests that use the
+    same credentials and login customer. Entries expire after ``ttl`` seconds and
+    the least recently used entry is evicted once ``max_size`` is reached.
+
+    Closing a gRPC channel aborts the calls still running on it, and a request
+    may hold an evicted client's services for the length of a report stream.
+    Evicted entries are therefore retired and their channels closed only after
+    ``close_grace`` seconds.
+    """
+
+    def __init__(self, max_size=32, ttl=1800, close_grace=600, factory=build_client):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.close_grace = close_grace
+        self.factory = factory
+        self._entries = OrderedDict()
+        self._retired = []
+        self._lock = threading.Lock()
+        self._builds = SingleFlight()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(config):
+        # The client secret is part of the key so a pooled client is only reused by callers that know it
+        refresh_token_hash = hashlib.sha256(config["refresh_token"].encode()).hexdigest()
+        client_secret_hash = hashlib.sha256(config["client_secret"].encode()).hexdigest()
+        return (
+            config["developer_token"],
+            config["client_id"],
+            client_secret_hash,
+            refresh_token_hash,
+            config.get("login_customer_id"),
+        )
+
+    def get_client(self, config):
+        return self._get_entry(config).client
+
+    def get_service(self, config, name):
+        entry = self._get_entry(config)
+        service = entry.services.get(name)
+        if service is None:
+            with entry.lock:
+                service = entry.services.get(name)
+                if service is None:
+                    service = entry.client.get_service(name)
+                    entry.services[name] = service
+        return service
+
+    def _get_entry(self, config):
+        key = self.make_key(config)
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+        # Building a client may refresh the access token over HTTP, so it runs outside
+        # the pool lock and concurrent misses for the same key share one build.
+        return self._builds.do(key, lambda: self._build(key, config))
+
+    def _lookup(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry.created_at < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        return None
+
+    def _build(self, key, config):
+        # A build that finished between our lookup and joining the flight already stored the entry
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry
+        with self._lock:
+            self.misses += 1
+        entry = _PoolEntry(self.factory(config))
+        now = time.monotonic()
+        with self._lock:
+            stale = self._entries.pop(key, None)
+            if stale is not None:
+                self._retire(stale, now)
+                self.evictions += 1
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._retire(self._entries.popitem(last=False)[1], now)
+                self.evictions += 1
+            expired = self._expired_retirees(now)
+        self._close(expired)
+        return entry
+
+    def _retire(self, entry, now):
+        self._retired.append((now, entry))
+
+    def _expired_retirees(self, now):
+        expired = [entry for retired_at, entry in self._retired if now - retired_at >= self.close_grace]
+        if expired:
+            self._retired = [(retired_at, entry) for retired_at, entry in self._retired
+                             if now - retired_at < self.close_grace]
+        return expired
+
+    @staticmethod
+    def _close(entries):
+        for entry in entries:
+            with entry.lock:
+                services = list(entry.services.items())
+            for name, service in services:
+                transport = getattr(service, "transport", None)
+                if transport is None:
+                    continue
+                try:
+                    transport.close()
+                except Exception as e:
+                    logger.error(f'Failed to close the {name} channel of an evicted client: {e}')
+
+    def invalidate(self, config=None):
+        now = time.monotonic()
+        with self._lock:
+            if config is None:
+                removed = list(self._entries.values())
+                self._entries.clear()
+            else:
+                removed = [self._entries.pop(self.make_key(config), None)]
+            for entry in removed:
+                if entry is not None:
+                    self._retire(entry, now)
+            expired = self._expired_retirees(now)
+        self._close(expired)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "retired": len(self._retired),
+            }
+
+
+client_pool = GoogleAdsClientPool(
+    max_size=int(os.getenv("GOOGLE_ADS_CLIENT_POOL_SIZE", "32")),
+    ttl=float(os.getenv("GOOGLE_ADS_CLIENT_POOL_TTL", "1800")),
+    close_grace=float(os.getenv("GOOGLE_ADS_CLIENT_POOL_CLOSE_GRACE", "600")),
+)
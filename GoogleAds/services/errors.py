@@ -0,0 +1,14 @@
+from google.ads.googleads.errors import GoogleAdsException
+
+
+def describe_error(ex):
+    """Formats an exception for API responses, listing each Google Ads error and the fields it is on."""
+    if not isinstance(ex, GoogleAdsException):
+        return str(ex)
+    error_message = f"Google Ads API error occurred: {ex}"
+    for error in ex.failure.errors:
+        error_message += f"\n\tError with message '{error.message}'."
+        if error.location:
+            for field_path_element in error.location.field_path_elements:
+                error_message += f"\n\t\tOn field: {field_path_element.field_name}"
+    return error_message
@@ -1,11 +1,156 @@
 import datetime
+import hashlib
 import logging
+import os
 import time
-from google.ads.googleads.client import GoogleAdsClient
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from decimal import Decimal
 from google.ads.googleads.errors import GoogleAdsException
+from google.protobuf import field_mask_pb2
+from services.asset_index import IMAGE, PRICE, asset_index, price_digest
+from services.asset_pages import (
+    ASSET_LISTINGS, DEFAULT_PAGE_SIZE, FIELD_TRANSFORMS, decode_page_token, encode_page_token,
+    like_prefix, select_fields, validate_page_size
+)
+from services.campaign_index import CampaignIndexEntry, campaign_index
+from services.change_mirror import ASSET, BUDGET, CAMPAIGN, change_mirror
+from services.client_pool import client_pool
+from services.errors import describe_error
+from services.hierarchy_cache import hierarchy_cache
+from services.metrics import metrics
+from services.image_assets import scan_image, tagged_asset_name
+from services.report_engine import ReportEngine, build_query
+from services.response_cache import response_cache
+from services.retry import call_with_retry
+from services.scheduler import MUTATE, scheduler
+from services.single_flight import single_flight
+from services.token_manager import token_manager
 
 logger = logging.getLogger(__name__)
 
+# Google Ads limits for price assets
+PRICE_OFFERINGS_MIN = 3
+PRICE_OFFERINGS_MAX = 8
+PRICE_TEXT_MAX_LENGTH = 25
+
+FAN_OUT_MAX_IN_FLIGHT = int(os.getenv("GOOGLE_ADS_FAN_OUT_MAX_IN_FLIGHT", "8"))
+FAN_OUT_MAX_RETRIES = int(os.getenv("GOOGLE_ADS_FAN_OUT_MAX_RETRIES", "2"))
+FAN_OUT_ACCOUNT_TIMEOUT = float(os.getenv("GOOGLE_ADS_FAN_OUT_ACCOUNT_TIMEOUT", "60"))
+
+# Google Ads accepts at most 10,000 operations per mutate request
+MAX_MUTATE_OPERATIONS = int(os.getenv("GOOGLE_ADS_MAX_MUTATE_OPERATIONS", "5000"))
+MAX_UPLOAD_BATCH_BYTES = int(os.getenv("GOOGLE_ADS_UPLOAD_BATCH_BYTES", str(30 * 1024 * 1024)))
+MAX_UPLOAD_BATCH_SIZE = int(os.getenv("GOOGLE_ADS_UPLOAD_BATCH_SIZE", "50"))
+
+SYNC_INTERVAL = float(os.getenv("GOOGLE_ADS_SYNC_INTERVAL", "60"))
+SYNC_ACCESS_TTL = float(os.getenv("GOOGLE_ADS_SYNC_ACCESS_TTL", "300"))
+# Google Ads returns at most 10,000 change_status or change_event rows per query
+SYNC_CHANGE_LIMIT = int(os.getenv("GOOGLE_ADS_SYNC_CHANGE_LIMIT", "10000"))
+# change_event keeps 30 days of history and change_status 90; older watermarks need a full load
+CHANGE_EVENT_MAX_AGE = 29 * 86400
+CHANGE_STATUS_MAX_AGE = 89 * 86400
+SYNC_FILTER_CHUNK = 500
+
+CAMPAIGN_LIST_FIELDS = ("campaign.id", "campaign.name", "campaign_budget.amount_micros")
+CAMPAIGN_INDEX_FIELDS = ("campaign.id", "campaign.name", "campaign.status", "campaign.campaign_budget")
+DEFAULT_CAMPAIGN_REPORT_FIELDS = (
+    "customer.id",
+    "campaign.id",
+    "campaign.name",
+    "campaign.status",
+    "campaign_budget.amount_micros",
+)
+
+MIRROR_CAMPAIGN_FIELDS = (
+    "campaign.resource_name",
+    "campaign.id",
+    "campaign.name",
+    "campaign.status",
+    "campaign.campaign_budget",
+    "campaign_budget.amount_micros",
+)
+MIRROR_BUDGET_FIELDS = ("campaign_budget.resource_name", "campaign_budget.amount_micros")
+MIRROR_ASSET_FIELDS = (
+    "asset.resource_name",
+    "asset.name",
+    "asset.type",
+    "asset.image_asset.file_size",
+    "asset.image_asset.full_size.width_pixels",
+    "asset.image_asset.full_size.height_pixels",
+    "asset.image_asset.full_size.url",
+    "asset.price_asset.type",
+    "asset.price_asset.price_offerings",
+)
+
+LOGO_ASSETS_QUERY = """
+    SELECT
+        asset.resource_name,
+        asset.name,
+        asset.image_asset.file_size,
+        asset.image_asset.full_size.width_pixels,
+        asset.image_asset.full_size.height_pixels,
+        asset.image_asset.full_size.url
+    FROM asset
+    WHERE asset.type = IMAGE
+    AND asset.name LIKE '%Logo%'
+"""
+PRICE_ASSETS_QUERY = """
+    SELECT
+        asset.resource_name,
+        asset.name,
+        asset.price_asset.type,
+        asset.price_asset.price_offerings
+    FROM asset
+    WHERE asset.type = PRICE
+"""
+
+
+def _logo_asset(asset):
+    return {
+        "resource_name": asset.resource_name,
+        "name": asset.name,
+        "file_size": asset.image_asset.file_size,
+        "width": asset.image_asset.full_size.width_pixels,
+        "height": asset.image_asset.full_size.height_pixels,
+        "url": asset.image_asset.full_size.url
+    }
+
+
+def _price_asset(asset):
+    # Reported by its first offering
+    offerings = asset.price_asset.price_offerings
+    offering = offerings[0] if offerings else None
+    return {
+        "resource_name": asset.resource_name,
+        "name": asset.name,
+        "type": asset.price_asset.type_.name,
+        "header": offering.header if offering else None,
+        "description": offering.description if offering else None,
+        "price_amount": offering.price.amount_micros / 1000000 if offering else None,
+        "currency_code": offering.price.currency_code if offering else None,
+        "unit": offering.unit.name if offering else None
+    }
+
+
+def _sync_time(days=0):
+    # GAQL datetimes are in the account's time zone, which is within a day of UTC
+    moment = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(days=days)
+    return moment.strftime("%Y-%m-%d %H:%M:%S")
+
+
+def _watermark_expired(watermark, max_age):
+    changed_at = datetime.datetime.strptime(watermark[:19], "%Y-%m-%d %H:%M:%S")
+    now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+    return (now - changed_at).total_seconds() >= max_age
+
+
+def _resource_name_filters(field, names):
+    names = sorted(names)
+    for start in range(0, len(names), SYNC_FILTER_CHUNK):
+        quoted = ", ".join(f"'{name}'" for name in names[start:start + SYNC_FILTER_CHUNK])
+        yield f"{field} IN ({quoted})"
+
+
 class GoogleAdsManager:
     def __init__(self, client, customer_id):
         self.customer_id = str(customer_id).replace('-', '') 
@@ -14,9 +159,10 @@ class GoogleAdsManager:
         
         self.credentials = client  
         self.developer_token = client['developer_token']
+        self.reports = ReportEngine(self._search_stream)
 
     def initialize_client(self):
-        self.client = GoogleAdsClient.load_from_dict({
+        self.client_config = {
             "use_proto_plus": True,
             "developer_token": self.developer_token,
             "client_id": self.credentials['client_id'],
@@ -24,39 +170,18 @@ class GoogleAdsManager:
             "refresh_token": self.credentials['refresh_token'],
             "login_customer_id": self.customer_id,
             "scopes": self.credentials['scopes']
-        })
+        }
+        with metrics.span("initialize_client", self.customer_id):
+            # Renews the access token outside the pool lock if it is missing or about to expire
+            token_manager.get_credentials(self.client_config)
+            self.client = client_pool.get_client(self.client_config)
+
+    def get_service(self, name):
+        return client_pool.get_service(self.client_config, name)
 
     def get_ad_campaigns(self):
         try:
-            self.initialize_client()
-            child_accounts = self.get_customer_ids()
-            campaigns_dict = {}
-
-            for account in child_accounts:
-                ga_service = self.client.get_service("GoogleAdsService")
-                query = """
-                    SELECT
-                    campaign.id,
-                    campaign.name,
-                    campaign_budget.amount_micros
-                    FROM campaign
-                    WHERE campaign.status != 'REMOVED'
-                    ORDER BY campaign.id
-                """
-                response = ga_service.search(customer_id=account['id'], query=query)
-                campaign_details = []
-                for row in response:
-                    campaign = row.campaign
-                    campaign_details.append({
-                        "Campaign ID": campaign.id,
-                        "Campaign Name": campaign.name,
-                        "Budget": row.campaign_budget.amount_micros / 1000000
-                    })
-                campaigns_dict[account['id']] = {
-                    "Account Name": account['name'],
-                    "Campaigns": campaign_details
-                }
-            return campaigns_dict
+            return self._single_flight("get_ad_campaigns", (), self._load_ad_campaigns)
         except GoogleAdsException as ex:
             logger.error(f'A Google Ads API error occurred: {ex}')
             raise
@@ -64,44 +189,147 @@ class GoogleAdsManager:
             logger.error(f'An unexpected error occurred: {e}')
             raise
 
-    def create_campaign(self, campaign_name, daily_budget, start_date, end_date):
+    def _load_ad_campaigns(self):
+        campaigns_dict = {}
+        for account in self.iter_ad_campaigns():
+            campaigns_dict[account.pop("Account ID")] = account
+        return campaigns_dict
+
+    def iter_ad_campaigns(self):
+        self.initialize_client()
+        for account in self.get_customer_ids():
+            yield {
+                "Account ID": account['id'],
+                "Account Name": account['name'],
+                "Campaigns": self.get_account_campaigns(account['id'])
+            }
+
+    def get_ad_campaigns_concurrent(self, max_in_flight=None, max_retries=None):
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        # The tuning knobs do not change which campaigns are returned, so they are not part of the key
+        return self._single_flight(
+            "get_ad_campaigns_concurrent", (),
+            lambda: self._load_ad_campaigns_concurrent(max_in_flight, max_retries)
+        )
+
+    def _load_ad_campaigns_concurrent(self, max_in_flight=None, max_retries=None):
+        # Callers may lower the configured concurrency, never raise it
+        max_in_flight = min(max_in_flight or FAN_OUT_MAX_IN_FLIGHT, FAN_OUT_MAX_IN_FLIGHT)
+        max_retries = FAN_OUT_MAX_RETRIES if max_retries is None else max_retries
         try:
             self.initialize_client()
-            campaign_budget_service = self.client.get_service("CampaignBudgetService")
-            campaign_service = self.client.get_service("CampaignService")
+            child_accounts = self.get_customer_ids()
+        except GoogleAdsException as ex:
+            logger.error(f'A Google Ads API error occurred: {ex}')
+            raise
 
-            # Create campaign budget
-            campaign_budget_operation = self.client.get_type("CampaignBudgetOperation")
-            campaign_budget = campaign_budget_operation.create
-            campaign_budget.name = f"Budget for {campaign_name}"
-            campaign_budget.amount_micros = int(daily_budget * 1000000)
-            campaign_budget.delivery_method = self.client.enums.BudgetDeliveryMethodEnum.STANDARD
-
-            # Mutate budget
-            response = campaign_budget_service.mutate_campaign_budgets(
-                customer_id=self.customer_id,
-                operations=[campaign_budget_operation]
-            )
-            budget_resource_name = response.results[0].resource_name
-
-            # Create campaign
-            campaign_operation = self.client.get_type("CampaignOperation")
-            campaign = campaign_operation.create
-            campaign.name = campaign_name
-            campaign.advertising_channel_type = self.client.enums.AdvertisingChannelTypeEnum.SEARCH
-            campaign.status = self.client.enums.CampaignStatusEnum.PAUSED
-            campaign.manual_cpc.enhanced_cpc_enabled = True
-            campaign.campaign_budget = budget_resource_name
-            campaign.start_date = datetime.date.strftime(start_date, "%Y%m%d")
-            campaign.end_date = datetime.date.strftime(end_date, "%Y%m%d")
-
-            # Mutate campaign
-            response = campaign_service.mutate_campaigns(
-                customer_id=self.customer_id,
-                operations=[campaign_operation]
-            )
+        campaigns_dict = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            futures = {
+                executor.submit(
+                    call_with_retry, self.get_account_campaigns, account['id'],
+                    timeout=FAN_OUT_ACCOUNT_TIMEOUT, max_retries=max_retries
+                ): account['id']
+                for account in child_accounts
+            }
+            loaded_names = {account['id']: account['name'] for account in child_accounts}
+            for future in as_completed(futures):
+                account_id = futures[future]
+                # Prefer the index, which picks up renames from a background refresh during the fan-out
+                account_name = self.get_account_name(account_id) or loaded_names[account_id]
+                try:
+                    campaign_details = future.result()
+                except Exception as e:
+                    logger.error(f"Failed to get campaigns for account {account_id} ({account_name}): {e}")
+                    errors.append({
+                        "Account ID": account_id,
+                        "Account Name": account_name,
+                        "Error": str(e) or e.__class__.__name__
+                    })
+                    continue
+                campaigns_dict[account_id] = {
+                    "Account Name": account_name,
+                    "Campaigns": campaign_details
+                }
+
+        # Keep the account order of the sequential path
+        ordered = {account['id']: campaigns_dict[account['id']]
+                   for account in child_accounts if account['id'] in campaigns_dict}
+        return {"campaigns": ordered, "errors": errors}
 
-            return response.results[0].resource_name
+    def get_account_campaigns(self, account_id, timeout=None):
+        campaign_details = []
+        for row in self.reports.stream(
+            account_id, "campaign", CAMPAIGN_LIST_FIELDS,
+            where=["campaign.status != 'REMOVED'"], order_by="campaign.id", timeout=timeout
+        ):
+            campaign_details.append({
+                "Campaign ID": row.campaign_id,
+                "Campaign Name": row.campaign_name,
+                "Budget": row.campaign_budget_amount_micros / 1000000
+            })
+        return campaign_details
+
+    def stream_campaign_report(self, fields=None, include_removed=False):
+        fields = list(fields or DEFAULT_CAMPAIGN_REPORT_FIELDS)
+        if "customer.id" not in fields:
+            fields.insert(0, "customer.id")
+        where = None if include_removed else ["campaign.status != 'REMOVED'"]
+        self.initialize_client()
+        for account in self.get_customer_ids():
+            yield from self.reports.stream(account['id'], "campaign", fields, where=where, order_by="campaign.id")
+
+    def _search_stream(self, customer_id, query, timeout=None):
+        ga_service = self.get_service("GoogleAdsService")
+        kwargs = {"customer_id": customer_id, "query": query}
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        # The span covers the whole stream, including the time the caller spends between batches
+        with metrics.span("GoogleAdsService.search_stream", customer_id):
+            yield from scheduler.execute_stream(self.developer_token, customer_id, ga_service.search_stream, **kwargs)
+
+    def _mutate(self, service_name, method_name, **kwargs):
+        method = getattr(self.get_service(service_name), method_name)
+        with metrics.span(f"{service_name}.{method_name}", kwargs["customer_id"]):
+            return scheduler.execute(self.developer_token, kwargs["customer_id"], MUTATE, method, **kwargs)
+
+    def create_campaign(self, campaign_name, daily_budget, start_date, end_date, atomic=True):
+        try:
+            self.initialize_client()
+            if atomic:
+                # Budget and campaign in one request, linked by a temporary budget ID
+                operations = self._campaign_operations(campaign_name, daily_budget, start_date, end_date, -1)
+                response = self._mutate(
+                    "GoogleAdsService", "mutate", customer_id=self.customer_id, mutate_operations=operations
+                )
+                budget_resource_name = response.mutate_operation_responses[0].campaign_budget_result.resource_name
+                campaign_resource_name = response.mutate_operation_responses[1].campaign_result.resource_name
+            else:
+                budget_operation, campaign_operation = self._campaign_operations(
+                    campaign_name, daily_budget, start_date, end_date
+                )
+
+                # Mutate budget
+                response = self._mutate(
+                    "CampaignBudgetService", "mutate_campaign_budgets",
+                    customer_id=self.customer_id,
+                    operations=[budget_operation.campaign_budget_operation]
+                )
+                budget_resource_name = response.results[0].resource_name
+
+                # Mutate campaign
+                campaign_operation.campaign_operation.create.campaign_budget = budget_resource_name
+                response = self._mutate(
+                    "CampaignService", "mutate_campaigns",
+                    customer_id=self.customer_id,
+                    operations=[campaign_operation.campaign_operation]
+                )
+                campaign_resource_name = response.results[0].resource_name
+
+            self._index_campaign(campaign_name, campaign_resource_name, budget_resource_name)
+            return campaign_resource_name
 
         except GoogleAdsException as ex:
             logger.error(f'A Google Ads API error occurred: {ex}')
@@ -110,32 +338,106 @@ class GoogleAdsManager:
             logger.error(f'An unexpected error occurred: {e}')
             raise
 
+    def create_campaigns(self, campaigns):
+        self.initialize_client()
+        items = []
+        results = []
+        for index, spec in enumerate(campaigns):
+            result = {
+                "index": index, "campaign_name": spec["campaign_name"], "campaign_id": None,
+                "budget_removed": None, "errors": []
+            }
+            results.append(result)
+            operations = self._campaign_operations(
+                spec["campaign_name"], spec["daily_budget"], spec["start_date"], spec["end_date"], -(index + 1)
+            )
+            items.append((result, operations))
+
+        orphaned = []
+
+        def on_result(result, responses, failed):
+            if failed:
+                # Partial failure commits each operation on its own, so the budget may exist without its campaign
+                if 0 not in failed:
+                    orphaned.append((result, responses[0].campaign_budget_result.resource_name))
+                return
+            result["campaign_id"] = responses[1].campaign_result.resource_name
+            self._index_campaign(
+                result["campaign_name"], result["campaign_id"], responses[0].campaign_budget_result.resource_name
+            )
+
+        self._mutate_partial(items, on_result)
+        for start in range(0, len(orphaned), MAX_MUTATE_OPERATIONS):
+            self._remove_budgets(orphaned[start:start + MAX_MUTATE_OPERATIONS])
+        return results
+
+    def _remove_budgets(self, orphaned):
+        operations = []
+        for _, resource_name in orphaned:
+            operation = self.client.get_type("CampaignBudgetOperation")
+            operation.remove = resource_name
+            operations.append(operation)
+        try:
+            response = self._mutate(
+                "CampaignBudgetService", "mutate_campaign_budgets",
+                customer_id=self.customer_id, operations=operations, partial_failure=True
+            )
+            errors = self._partial_failure_errors(response)
+        except GoogleAdsException as ex:
+            errors = {index: [error.message for error in ex.failure.errors] for index in range(len(orphaned))}
+        for index, (result, resource_name) in enumerate(orphaned):
+            result["budget_removed"] = index not in errors
+            if index in errors:
+                result["errors"].extend(
+                    f"Failed to remove budget {resource_name}: {message}" for message in errors[index]
+                )
+
+    def _campaign_operations(self, campaign_name, daily_budget, start_date, end_date, temporary_id=None):
+        # Create campaign budget
+        budget_operation = self.client.get_type("MutateOperation")
+        campaign_budget = budget_operation.campaign_budget_operation.create
+        if temporary_id is not None:
+            campaign_budget.resource_name = self.get_service("CampaignBudgetService").campaign_budget_path(
+                self.customer_id, temporary_id
+            )
+        campaign_budget.name = f"Budget for {campaign_name}"
+        campaign_budget.amount_micros = int(daily_budget * 1000000)
+        campaign_budget.delivery_method = self.client.enums.BudgetDeliveryMethodEnum.STANDARD
+
+        # Create campaign
+        campaign_operation = self.client.get_type("MutateOperation")
+        campaign = campaign_operation.campaign_operation.create
+        campaign.name = campaign_name
+        campaign.advertising_channel_type = self.client.enums.AdvertisingChannelTypeEnum.SEARCH
+        campaign.status = self.client.enums.CampaignStatusEnum.PAUSED
+        campaign.manual_cpc.enhanced_cpc_enabled = True
+        if temporary_id is not None:
+            campaign.campaign_budget = campaign_budget.resource_name
+        campaign.contains_eu_political_advertising = (
+            self.client.enums.EuPoliticalAdvertisingStatusEnum.DOES_NOT_CONTAIN_EU_POLITICAL_ADVERTISING
+        )
+        # Times are in the account's time zone; the campaign runs through the whole end date
+        campaign.start_date_time = f"{start_date:%Y-%m-%d} 00:00:00"
+        campaign.end_date_time = f"{end_date:%Y-%m-%d} 23:59:59"
+
+        return [budget_operation, campaign_operation]
+
+    def _index_campaign(self, campaign_name, campaign_resource_name, budget_resource_name):
+        campaign_index.put(self.customer_id, campaign_name, CampaignIndexEntry(
+            int(campaign_resource_name.split('/')[-1]), budget_resource_name, "PAUSED"
+        ), self._campaign_index_scope())
+        change_mirror.mark_stale(self.customer_id)
+
     def update_campaign_budget(self, campaign_name, new_budget):
         try:
             self.initialize_client()
-            ga_service = self.client.get_service("GoogleAdsService")
-            campaign_budget_service = self.client.get_service("CampaignBudgetService")
 
             # Find the campaign by name
-            query = f"""
-                SELECT 
-                    campaign.id,
-                    campaign_budget.resource_name,
-                    campaign_budget.amount_micros
-                FROM campaign
-                WHERE campaign.name = '{campaign_name}'
-                AND campaign.status != 'REMOVED'
-            """
-            response = ga_service.search(customer_id=self.customer_id, query=query)
-
-            campaign_budget_resource_name = None
-            for row in response:
-                campaign_budget_resource_name = row.campaign_budget.resource_name
-                break
-
-            if campaign_budget_resource_name is None:
+            campaign = self.find_campaign(campaign_name)
+            if campaign is None:
                 logger.error(f"No campaign found with name: {campaign_name}")
                 return False
+            campaign_budget_resource_name = campaign.budget_resource_name
 
             # Update the budget
             campaign_budget_operation = self.client.get_type("CampaignBudgetOperation")
@@ -143,15 +445,20 @@ class GoogleAdsManager:
             campaign_budget.resource_name = campaign_budget_resource_name
             campaign_budget.amount_micros = int(new_budget * 1000000)
 
-            field_mask = self.client.get_type("FieldMask")
-            field_mask.paths.append("amount_micros")
-            campaign_budget_operation.update_mask.CopyFrom(field_mask)
+            campaign_budget_operation.update_mask.CopyFrom(field_mask_pb2.FieldMask(paths=["amount_micros"]))
 
-            campaign_budget_service.mutate_campaign_budgets(
-                customer_id=self.customer_id,
-                operations=[campaign_budget_operation]
-            )
+            try:
+                self._mutate(
+                    "CampaignBudgetService", "mutate_campaign_budgets",
+                    customer_id=self.customer_id,
+                    operations=[campaign_budget_operation]
+                )
+            except GoogleAdsException:
+                # The cached budget may be stale; make the next call look it up again
+                campaign_index.invalidate(self.customer_id, campaign_name)
+                raise
 
+            change_mirror.mark_stale(self.customer_id)
             logger.info(f"Successfully updated budget for campaign: {campaign_name}")
             return True
 
@@ -163,7 +470,21 @@ class GoogleAdsManager:
             raise
 
     def get_customer_ids(self):
-        ga_service = self.client.get_service("GoogleAdsService")
+        return hierarchy_cache.get(self.customer_id, self._fetch_customer_ids, self._hierarchy_scope())
+
+    def invalidate_customer_hierarchy(self):
+        # Every credential's cached hierarchy is dropped, so only callers that can read the customer may do it
+        self.verify_mirror_access()
+        hierarchy_cache.invalidate(self.customer_id)
+
+    def get_account_name(self, account_id):
+        return hierarchy_cache.get_name(self.customer_id, account_id, self._hierarchy_scope())
+
+    def _hierarchy_scope(self):
+        # Credentials that cannot list the login customer's accounts must not read them from the cache
+        return self._query_fingerprint("customer_hierarchy")
+
+    def _fetch_customer_ids(self):
         query = """
             SELECT
             customer_client.id,
@@ -171,8 +492,8 @@ class GoogleAdsManager:
             FROM customer_client
             WHERE customer_client.manager = FALSE
         """
-        stream = ga_service.search_stream(customer_id=self.customer_id, query=query)
-            
+        stream = self._search_stream(self.customer_id, query)
+
         client_customers = []
         for batch in stream:
             for row in batch.results:
@@ -187,27 +508,43 @@ class GoogleAdsManager:
             raise ValueError("Google Ads Client is not initialized")
         
         try:
-            ga_service = self.client.get_service("GoogleAdsService")
-            query = f"""
-                SELECT campaign.id
-                FROM campaign
-                WHERE campaign.name = '{campaign_name}'
-                AND campaign.status != 'REMOVED'
-                LIMIT 1
-            """
-            response = ga_service.search(customer_id=self.customer_id, query=query)
-            
-            for row in response:
-                return row.campaign.id
-            
-            return None  
+            campaign = self.find_campaign(campaign_name)
+            return campaign.id if campaign else None
         except GoogleAdsException as ex:
             logger.error(f'A Google Ads API error occurred: {ex}')
             raise
         except Exception as e:
             logger.error(f'An unexpected error occurred: {e}')
             raise
-                
+
+    def find_campaign(self, campaign_name):
+        scope = self._campaign_index_scope()
+        campaign = campaign_index.get(self.customer_id, campaign_name, scope)
+        if campaign is None and campaign_index.should_reload(self.customer_id, scope):
+            # A miss may mean the index is cold or stale, so reload it in bulk
+            self.refresh_campaign_index()
+            campaign = campaign_index.get(self.customer_id, campaign_name, scope)
+        return campaign
+
+    def _campaign_index_scope(self):
+        # Names are only resolved for credentials that listed the customer's campaigns themselves
+        return self._query_fingerprint("campaign_index")
+
+    def refresh_campaign_index(self):
+        # Concurrent misses for one customer share a single reload
+        self._single_flight("refresh_campaign_index", (), self._load_campaign_index)
+
+    def _load_campaign_index(self):
+        campaigns = {}
+        for row in self.reports.stream(
+            self.customer_id, "campaign", CAMPAIGN_INDEX_FIELDS,
+            where=["campaign.status != 'REMOVED'"]
+        ):
+            campaigns[row.campaign_name] = CampaignIndexEntry(
+                row.campaign_id, row.campaign_campaign_budget, row.campaign_status
+            )
+        campaign_index.load(self.customer_id, campaigns, self._campaign_index_scope())
+
     def create_search_ad(self, campaign_name, headlines, descriptions, keywords, business_website):
         self.initialize_client()
         try:
@@ -220,147 +557,637 @@ class GoogleAdsManager:
             # Create a unique ad group name
             ad_group_name = f"Ad Group for {campaign_name} - {int(time.time())}"
 
-            # Create ad group
-            ad_group_service = self.client.get_service("AdGroupService")
-            ad_group_operation = self.client.get_type("AdGroupOperation")
-            ad_group = ad_group_operation.create
-            ad_group.name = ad_group_name
-            ad_group.campaign = self.client.get_service("CampaignService").campaign_path(self.customer_id, campaign_id)
-            ad_group.type_ = self.client.enums.AdGroupTypeEnum.SEARCH_STANDARD
-
-            # Add the ad group
-            ad_group_response = ad_group_service.mutate_ad_groups(
-                customer_id=self.customer_id, operations=[ad_group_operation]
-            )
-            ad_group_resource_name = ad_group_response.results[0].resource_name
-
-            # Create responsive search ad
-            ad_group_ad_operation = self.client.get_type("AdGroupAdOperation")
-            ad_group_ad = ad_group_ad_operation.create
-            ad_group_ad.ad_group = ad_group_resource_name
-            ad_group_ad.status = self.client.enums.AdGroupAdStatusEnum.PAUSED
-
-            # Create the ad
-            ad = ad_group_ad.ad
-            for headline in headlines:
-                ad.responsive_search_ad.headlines.append({"text": headline})
-            for description in descriptions:
-                ad.responsive_search_ad.descriptions.append({"text": description})
-            ad.final_urls.append(business_website)
-
-            # Add the ad
-            ad_service = self.client.get_service("AdGroupAdService")
-            ad_response = ad_service.mutate_ad_group_ads(
-                customer_id=self.customer_id, operations=[ad_group_ad_operation]
-            )
-
-            # Add keywords
-            ad_group_criterion_service = self.client.get_service("AdGroupCriterionService")
-            criterion_operations = []
-            for keyword in keywords:
-                criterion_operation = self.client.get_type("AdGroupCriterionOperation")
-                criterion = criterion_operation.create
-                criterion.ad_group = ad_group_resource_name
-                criterion.keyword.text = keyword
-                criterion.keyword.match_type = self.client.enums.KeywordMatchTypeEnum.EXACT
-                criterion_operations.append(criterion_operation)
-
-            keyword_response = ad_group_criterion_service.mutate_ad_group_criteria(
-                customer_id=self.customer_id, operations=criterion_operations
+            # Ad group, ad and keywords go in one request, linked by a temporary ID
+            operations = self._search_ad_operations(
+                campaign_id, ad_group_name, headlines, descriptions, keywords, business_website, -1
             )
+            try:
+                response = self._mutate(
+                    "GoogleAdsService", "mutate", customer_id=self.customer_id, mutate_operations=operations
+                )
+            except GoogleAdsException:
+                # The cached campaign may be stale; make the next call look it up again
+                campaign_index.invalidate(self.customer_id, campaign_name)
+                raise
 
-            return ad_group_resource_name
+            return response.mutate_operation_responses[0].ad_group_result.resource_name
 
         except GoogleAdsException as ex:
-            error_message = f"Google Ads API error occurred: {ex}"
-            for error in ex.failure.errors:
-                error_message += f"\n\tError with message '{error.message}'."
-                if error.location:
-                    for field_path_element in error.location.field_path_elements:
-                        error_message += f"\n\t\tOn field: {field_path_element.field_name}"
-            raise Exception(error_message)
+            raise Exception(describe_error(ex))
         except Exception as e:
             logger.error(f'An unexpected error occurred: {e}')
             raise
     
+    def create_search_ads(self, ads):
+        self.initialize_client()
+        results = []
+        timestamp = int(time.time())
+
+        items = []
+        for index, ad in enumerate(ads):
+            result = {"index": index, "campaign_name": ad["campaign_name"], "ad_group_id": None, "errors": []}
+            results.append(result)
+            campaign = self.find_campaign(ad["campaign_name"])
+            if campaign is None:
+                result["errors"].append(f"Campaign '{ad['campaign_name']}' not found")
+                continue
+
+            operations = self._search_ad_operations(
+                campaign.id,
+                f"Ad Group for {ad['campaign_name']} - {timestamp}-{index}",
+                ad["headlines"],
+                ad["descriptions"],
+                ad["keywords"],
+                ad["final_url"],
+                -(index + 1)
+            )
+            items.append((result, operations))
+
+        def on_result(result, responses, failed):
+            # The ad group is the first operation; keep it even if its ad or keywords failed
+            if 0 not in failed:
+                result["ad_group_id"] = responses[0].ad_group_result.resource_name
+            else:
+                # The cached campaign may be stale; make the next call look it up again
+                campaign_index.invalidate(self.customer_id, result["campaign_name"])
+
+        self._mutate_partial(items, on_result)
+        return results
+
+    def _mutate_partial(self, items, on_result):
+        batch = []
+        batch_size = 0
+        for item in items:
+            # Never split one item's operations across requests, temporary IDs only live in one
+            if batch and batch_size + len(item[1]) > MAX_MUTATE_OPERATIONS:
+                self._mutate_batch(batch, on_result)
+                batch, batch_size = [], 0
+            batch.append(item)
+            batch_size += len(item[1])
+        if batch:
+            self._mutate_batch(batch, on_result)
+
+    def _mutate_batch(self, batch, on_result):
+        operations = [operation for _, item_operations in batch for operation in item_operations]
+        try:
+            response = self._mutate(
+                "GoogleAdsService", "mutate",
+                customer_id=self.customer_id, mutate_operations=operations, partial_failure=True
+            )
+        except GoogleAdsException as ex:
+            for result, item_operations in batch:
+                result["errors"].extend(error.message for error in ex.failure.errors)
+                on_result(result, [], set(range(len(item_operations))))
+            return
+
+        errors = self._partial_failure_errors(response)
+        offset = 0
+        for result, item_operations in batch:
+            failed = set()
+            for position in range(len(item_operations)):
+                if offset + position in errors:
+                    failed.add(position)
+                    result["errors"].extend(errors[offset + position])
+            on_result(result, response.mutate_operation_responses[offset:offset + len(item_operations)], failed)
+            offset += len(item_operations)
+
+    def _search_ad_operations(self, campaign_id, ad_group_name, headlines, descriptions, keywords,
+                              business_website, temporary_id):
+        ad_group_resource_name = self.get_service("AdGroupService").ad_group_path(self.customer_id, temporary_id)
+
+        ad_group_operation = self.client.get_type("MutateOperation")
+        ad_group = ad_group_operation.ad_group_operation.create
+        ad_group.resource_name = ad_group_resource_name
+        ad_group.name = ad_group_name
+        ad_group.campaign = self.get_service("CampaignService").campaign_path(self.customer_id, campaign_id)
+        ad_group.type_ = self.client.enums.AdGroupTypeEnum.SEARCH_STANDARD
+
+        # Create responsive search ad
+        ad_group_ad_operation = self.client.get_type("MutateOperation")
+        ad_group_ad = ad_group_ad_operation.ad_group_ad_operation.create
+        ad_group_ad.ad_group = ad_group_resource_name
+        ad_group_ad.status = self.client.enums.AdGroupAdStatusEnum.PAUSED
+        ad = ad_group_ad.ad
+        for headline in headlines:
+            ad.responsive_search_ad.headlines.append({"text": headline})
+        for description in descriptions:
+            ad.responsive_search_ad.descriptions.append({"text": description})
+        ad.final_urls.append(business_website)
+
+        operations = [ad_group_operation, ad_group_ad_operation]
+
+        # Add keywords
+        for keyword in keywords:
+            criterion_operation = self.client.get_type("MutateOperation")
+            criterion = criterion_operation.ad_group_criterion_operation.create
+            criterion.ad_group = ad_group_resource_name
+            criterion.keyword.text = keyword
+            criterion.keyword.match_type = self.client.enums.KeywordMatchTypeEnum.EXACT
+            operations.append(criterion_operation)
+
+        return operations
+
+    def _partial_failure_errors(self, response):
+        errors = {}
+        partial_failure = response.partial_failure_error
+        if not partial_failure or partial_failure.code == 0:
+            return errors
+        failure_type = type(self.client.get_type("GoogleAdsFailure"))
+        for detail in partial_failure.details:
+            failure = failure_type.deserialize(detail.value)
+            for error in failure.errors:
+                index = error.location.field_path_elements[0].index
+                errors.setdefault(index, []).append(error.message)
+        return errors
+
     def upload_logo(self, campaign_name, file):
+        result = self.upload_logos(campaign_name, [file])[0]
+        if result["error"]:
+            raise ValueError(result["error"])
+        return result["asset_id"]
+
+    def upload_logos(self, campaign_name, files):
         self.initialize_client()
-        asset_service = self.client.get_service("AssetService")
-        asset_operation = self.client.get_type("AssetOperation")
-        asset = asset_operation.create
-        asset.name = f"{campaign_name} Logo"
-        asset.image_asset.data = file.file.read()
-        asset.image_asset.mime_type = self.client.enums.MimeTypeEnum.IMAGE_PNG
-        response = asset_service.mutate_assets(customer_id=self.customer_id, operations=[asset_operation])
-        return response.results[0].resource_name
+        results = []
+        waiting = {}
+        uploads = []
+        for file in files:
+            result = {"filename": file.filename, "asset_id": None, "deduplicated": False, "error": None}
+            results.append(result)
+            try:
+                digest, mime_type, size = scan_image(file.file)
+            except ValueError as e:
+                result["error"] = str(e)
+                continue
+            if digest in waiting:
+                result["deduplicated"] = True
+                waiting[digest].append(result)
+                continue
+            waiting[digest] = [result]
+            uploads.append((digest, file, mime_type, size))
 
-    def upload_price(self, campaign_name, price):
+        existing = {}
+        if uploads:
+            self._ensure_asset_index()
+            existing = asset_index.get_many(self.customer_id, IMAGE, waiting, self._asset_index_scope())
+        batch = []
+        batch_bytes = 0
+        for upload in uploads:
+            digest, _, _, size = upload
+            if digest in existing:
+                for result in waiting[digest]:
+                    result["asset_id"] = existing[digest]
+                    result["deduplicated"] = True
+                continue
+            if batch and (batch_bytes + size > MAX_UPLOAD_BATCH_BYTES or len(batch) >= MAX_UPLOAD_BATCH_SIZE):
+                self._upload_logo_batch(campaign_name, batch, waiting)
+                batch, batch_bytes = [], 0
+            batch.append(upload)
+            batch_bytes += size
+        if batch:
+            self._upload_logo_batch(campaign_name, batch, waiting)
+        return results
+
+    def _upload_logo_batch(self, campaign_name, batch, waiting):
+        # Image bytes are only read here, so at most one batch is held in memory
+        operations = []
+        for digest, file, mime_type, _ in batch:
+            asset_operation = self.client.get_type("AssetOperation")
+            asset = asset_operation.create
+            asset.name = tagged_asset_name(f"{campaign_name} Logo", digest)
+            asset.image_asset.data = file.file.read()
+            asset.image_asset.mime_type = getattr(self.client.enums.MimeTypeEnum, mime_type)
+            operations.append(asset_operation)
+
+        try:
+            response = self._mutate(
+                "AssetService", "mutate_assets",
+                customer_id=self.customer_id, operations=operations, partial_failure=True
+            )
+        except GoogleAdsException as ex:
+            message = "; ".join(error.message for error in ex.failure.errors)
+            for digest, _, _, _ in batch:
+                for result in waiting[digest]:
+                    result["error"] = message
+            return
+
+        errors = self._partial_failure_errors(response)
+        for index, (digest, _, _, _) in enumerate(batch):
+            if index in errors:
+                for result in waiting[digest]:
+                    result["error"] = "; ".join(errors[index])
+                continue
+            resource_name = response.results[index].resource_name
+            asset_index.put(self.customer_id, IMAGE, digest, resource_name, self._asset_index_scope())
+            for result in waiting[digest]:
+                result["asset_id"] = resource_name
+        if len(errors) < len(batch):
+            response_cache.invalidate(self.customer_id)
+            change_mirror.mark_stale(self.customer_id)
+
+    def upload_price(self, campaign_name, price_asset):
+        """Creates a price asset from ``price_asset`` (type, language_code, price_qualifier, offerings).
+
+        Each offering needs a header, description, price, currency_code and
+        final_url, and may set a unit. Returns the indexed asset instead if
+        identical content was already uploaded for the customer.
+        """
         self.initialize_client()
-        asset_service = self.client.get_service("AssetService")
+        price_asset = self._validate_price_asset(price_asset)
+        digest = price_digest(price_asset)
+        self._ensure_asset_index()
+        existing = asset_index.get(self.customer_id, PRICE, digest, self._asset_index_scope())
+        if existing:
+            return existing
+
+        enums = self.client.enums
         asset_operation = self.client.get_type("AssetOperation")
         asset = asset_operation.create
-        asset.name = f"{campaign_name} Price"
-        asset.price_asset.price = price
-        response = asset_service.mutate_assets(customer_id=self.customer_id, operations=[asset_operation])
-        return response.results[0].resource_name
+        asset.name = tagged_asset_name(f"{campaign_name} Price", digest)
+        asset.price_asset.type_ = getattr(enums.PriceExtensionTypeEnum, price_asset["type"])
+        asset.price_asset.language_code = price_asset["language_code"]
+        if price_asset["price_qualifier"]:
+            asset.price_asset.price_qualifier = getattr(
+                enums.PriceExtensionPriceQualifierEnum, price_asset["price_qualifier"]
+            )
+        for spec in price_asset["offerings"]:
+            offering = self.client.get_type("PriceOffering")
+            offering.header = spec["header"]
+            offering.description = spec["description"]
+            offering.price.amount_micros = int(Decimal(str(spec["price"])) * 1000000)
+            offering.price.currency_code = spec["currency_code"]
+            offering.final_url = spec["final_url"]
+            if spec["unit"]:
+                offering.unit = getattr(enums.PriceExtensionPriceUnitEnum, spec["unit"])
+            asset.price_asset.price_offerings.append(offering)
+        response = self._mutate("AssetService", "mutate_assets", customer_id=self.customer_id, operations=[asset_operation])
+        resource_name = response.results[0].resource_name
+        asset_index.put(self.customer_id, PRICE, digest, resource_name, self._asset_index_scope())
+        response_cache.invalidate(self.customer_id)
+        change_mirror.mark_stale(self.customer_id)
+        return resource_name
+
+    def _validate_price_asset(self, price_asset):
+        # Checked here so an invalid asset gets a clear error instead of a rejected mutate
+        enums = self.client.enums
+        offerings = price_asset.get("offerings") or []
+        if not PRICE_OFFERINGS_MIN <= len(offerings) <= PRICE_OFFERINGS_MAX:
+            raise ValueError(
+                f"A price asset needs {PRICE_OFFERINGS_MIN} to {PRICE_OFFERINGS_MAX} offerings, got {len(offerings)}"
+            )
+        price_type = (price_asset.get("type") or "").upper()
+        if price_type in ("", "UNSPECIFIED", "UNKNOWN") or not hasattr(enums.PriceExtensionTypeEnum, price_type):
+            raise ValueError(f"Invalid price asset type: {price_asset.get('type')!r}")
+        language_code = price_asset.get("language_code")
+        if not language_code:
+            raise ValueError("A price asset needs a language_code")
+        qualifier = (price_asset.get("price_qualifier") or "").upper() or None
+        if qualifier and not hasattr(enums.PriceExtensionPriceQualifierEnum, qualifier):
+            raise ValueError(f"Invalid price qualifier: {price_asset.get('price_qualifier')!r}")
+
+        normalized = []
+        for position, offering in enumerate(offerings, 1):
+            for field in ("header", "description"):
+                if not 1 <= len(offering.get(field) or "") <= PRICE_TEXT_MAX_LENGTH:
+                    raise ValueError(f"Offering {position} {field} must be 1 to {PRICE_TEXT_MAX_LENGTH} characters")
+            if offering.get("price") is None or offering["price"] < 0:
+                raise ValueError(f"Offering {position} needs a price of at least 0")
+            currency_code = (offering.get("currency_code") or "").upper()
+            if len(currency_code) != 3:
+                raise ValueError(f"Offering {position} needs a three-letter currency_code")
+            if not offering.get("final_url"):
+                raise ValueError(f"Offering {position} needs a final_url")
+            unit = (offering.get("unit") or "").upper() or None
+            if unit and not hasattr(enums.PriceExtensionPriceUnitEnum, unit):
+                raise ValueError(f"Offering {position} has an invalid unit: {offering.get('unit')!r}")
+            normalized.append({
+                "header": offering["header"],
+                "description": offering["description"],
+                "price": offering["price"],
+                "currency_code": currency_code,
+                "final_url": offering["final_url"],
+                "unit": unit,
+            })
+        return {
+            "type": price_type,
+            "language_code": language_code,
+            "price_qualifier": qualifier,
+            "offerings": normalized,
+        }
+
+    def _ensure_asset_index(self):
+        if asset_index.needs_rebuild(self.customer_id, self._asset_index_scope()):
+            self.refresh_asset_index()
+
+    def _asset_index_scope(self):
+        # Existing assets are only returned to credentials that listed the customer's assets themselves
+        return self._query_fingerprint("asset_index")
+
+    def refresh_asset_index(self):
+        # Concurrent uploads that find the index cold share a single rebuild
+        self._single_flight("refresh_asset_index", (), self._rebuild_asset_index)
+
+    def _rebuild_asset_index(self):
+        # Only assets created by this service carry a content digest in their name
+        self.initialize_client()
+        rows = self.reports.stream(
+            self.customer_id, "asset", ("asset.type", "asset.name", "asset.resource_name"),
+            where=[f"asset.type IN ({IMAGE}, {PRICE})", "asset.name LIKE '% #%'"]
+        )
+        asset_index.rebuild(
+            self.customer_id, ((row.asset_type, row.asset_name, row.asset_resource_name) for row in rows),
+            self._asset_index_scope()
+        )
 
     def get_logo_assets(self):
+        return self._single_flight("get_logo_assets", (), lambda: response_cache.get(
+            self.customer_id, self._query_fingerprint(LOGO_ASSETS_QUERY), lambda: list(self.iter_logo_assets())
+        ))
+
+    def iter_logo_assets(self):
         self.initialize_client()
-        ga_service = self.client.get_service("GoogleAdsService")
-        query = """
-            SELECT
-                asset.resource_name,
-                asset.name,
-                asset.image_asset.file_size,
-                asset.image_asset.full_size.width_pixels,
-                asset.image_asset.full_size.height_pixels,
-                asset.image_asset.full_size.url
-            FROM asset
-            WHERE asset.type = IMAGE
-            AND asset.name LIKE '%Logo%'
-        """
-        response = ga_service.search(customer_id=self.customer_id, query=query)
-        logo_assets = []
-        for row in response:
-            asset = row.asset
-            logo_assets.append({
-                "resource_name": asset.resource_name,
-                "name": asset.name,
-                "file_size": asset.image_asset.file_size,
-                "width": asset.image_asset.full_size.width_pixels,
-                "height": asset.image_asset.full_size.height_pixels,
-                "url": asset.image_asset.full_size.url
-            })
-        return logo_assets
+        for batch in self._search_stream(self.customer_id, LOGO_ASSETS_QUERY):
+            for row in batch.results:
+                yield _logo_asset(row.asset)
 
     def get_price_assets(self):
+        return self._single_flight("get_price_assets", (), lambda: response_cache.get(
+            self.customer_id, self._query_fingerprint(PRICE_ASSETS_QUERY), lambda: list(self.iter_price_assets())
+        ))
+
+    def list_assets(self, kind, page_size=None, page_token=None, fields=None,
+                    name_prefix=None, created_after_id=None):
+        """Returns one page of assets ordered by ID plus the token for the next page.
+
+        Pages are keyed on the last asset ID rather than an offset, so each page
+        costs one bounded query however deep the caller pages.
+        """
+        if kind not in ASSET_LISTINGS:
+            raise ValueError(f"Unknown asset kind: {kind}")
+        field_map, base_filters = ASSET_LISTINGS[kind]
+        keys = select_fields(field_map, fields)
+        page_size = validate_page_size(page_size or DEFAULT_PAGE_SIZE)
+
+        where = list(base_filters)
+        after_id = decode_page_token(page_token) if page_token else None
+        if created_after_id is not None:
+            after_id = max(after_id or 0, created_after_id)
+        if after_id is not None:
+            where.append(f"asset.id > {int(after_id)}")
+        if name_prefix:
+            where.append(f"asset.name LIKE '{like_prefix(name_prefix)}'")
+
+        def load():
+            self.initialize_client()
+            # Several output keys may read the same GAQL field
+            selected = list(dict.fromkeys(field_map[key] for key in keys))
+            rows = list(self.reports.stream(
+                self.customer_id, "asset", selected,
+                where=where, order_by="asset.id", limit=page_size + 1
+            ))
+            assets = []
+            for row in rows[:page_size]:
+                values = dict(zip(selected, row))
+                asset = {key: values[field_map[key]] for key in keys}
+                for key, transform in FIELD_TRANSFORMS.items():
+                    if key in asset:
+                        asset[key] = transform(asset[key])
+                assets.append(asset)
+            next_page_token = encode_page_token(assets[-1]["id"]) if len(rows) > page_size else None
+            return {"assets": assets, "next_page_token": next_page_token}
+
+        params = (kind, keys, where, page_size)
+        fingerprint = self._query_fingerprint(repr(params))
+        return self._single_flight(
+            "list_assets", params, lambda: response_cache.get(self.customer_id, fingerprint, load)
+        )
+
+    def _single_flight(self, method, params, fn):
+        # Identical concurrent reads for the same customer and credentials share one upstream call
+        key = (method, self.customer_id, self._query_fingerprint(repr(params)))
+        return single_flight.do(key, fn)
+
+    def _query_fingerprint(self, query):
+        # Scoped to the credentials so a cached response is only served to callers that could read it
+        scope = "\0".join((
+            self.developer_token, self.credentials['client_id'],
+            self.credentials['client_secret'], self.credentials['refresh_token']
+        ))
+        return hashlib.sha256(f"{scope}\0{query}".encode()).hexdigest()
+
+    def iter_price_assets(self):
         self.initialize_client()
-        ga_service = self.client.get_service("GoogleAdsService")
-        query = """
-            SELECT
-                asset.resource_name,
-                asset.name,
-                asset.price_asset.type,
-                asset.price_asset.price_offering.header,
-                asset.price_asset.price_offering.description,
-                asset.price_asset.price_offering.price.amount_micros,
-                asset.price_asset.price_offering.price.currency_code,
-                asset.price_asset.price_offering.unit
-            FROM asset
-            WHERE asset.type = PRICE
+        for batch in self._search_stream(self.customer_id, PRICE_ASSETS_QUERY):
+            for row in batch.results:
+                yield _price_asset(row.asset)
+
+    def sync_changes(self):
+        """Brings the local mirror of campaigns, budgets and assets up to date.
+
+        The first sync of an account loads everything. Later syncs read only the
+        change_status and change_event rows since the stored watermark and refetch
+        the resources they name, so their cost follows the number of changes
+        rather than the size of the account.
         """
-        response = ga_service.search(customer_id=self.customer_id, query=query)
-        price_assets = []
-        for row in response:
-            asset = row.asset
-            price_assets.append({
-                "resource_name": asset.resource_name,
-                "name": asset.name,
-                "type": asset.price_asset.type,
-                "header": asset.price_asset.price_offering.header,
-                "description": asset.price_asset.price_offering.description,
-                "price_amount": asset.price_asset.price_offering.price.amount_micros / 1000000,
-                "currency_code": asset.price_asset.price_offering.price.currency_code,
-                "unit": asset.price_asset.price_offering.unit
-            })
-        return price_assets
\ No newline at end of file
+        return self._single_flight("sync_changes", (), self._sync_changes)
+
+    def _sync_changes(self):
+        self.initialize_client()
+        batch = {"upserts": [], "removals": [], "replace": [], "states": [], "full_loads": 0}
+        for account in self.get_customer_ids():
+            self._sync_account_campaigns(account['id'], batch)
+        self._sync_assets(batch)
+        version, changed = change_mirror.apply(self.customer_id, **batch)
+        # Every sync queries the customer with the caller's credentials, which proves access
+        change_mirror.mark_verified(self.customer_id, self._query_fingerprint("mirror_access"), SYNC_ACCESS_TTL)
+        return {"version": version, "changed": changed, "full_loads": batch["full_loads"]}
+
+    def _sync_account_campaigns(self, account_id, batch):
+        state = change_mirror.stream_state(self.customer_id, account_id, "campaigns")
+        if (state is None or _watermark_expired(state["watermark"], CHANGE_STATUS_MAX_AGE)
+                or _watermark_expired(state["event_watermark"], CHANGE_EVENT_MAX_AGE)):
+            return self._load_account_campaigns(account_id, batch)
+
+        # Budget amounts live on the campaign_budget resource, which only change_event reports
+        campaigns = self._changes_since(
+            account_id, "change_status", "change_status.last_change_date_time", "change_status.campaign",
+            "change_status.resource_type = CAMPAIGN", state["watermark"]
+        )
+        budgets = self._changes_since(
+            account_id, "change_event", "change_event.change_date_time", "change_event.change_resource_name",
+            "change_event.change_resource_type = CAMPAIGN_BUDGET", state["event_watermark"]
+        )
+        if campaigns is None or budgets is None:
+            return self._load_account_campaigns(account_id, batch)
+        (changed_campaigns, watermark), (changed_budgets, event_watermark) = campaigns, budgets
+
+        found = set()
+        for where in _resource_name_filters("campaign.resource_name", changed_campaigns):
+            for row in self.reports.stream(account_id, "campaign", MIRROR_CAMPAIGN_FIELDS, where=[where]):
+                if row.campaign_status == "REMOVED":
+                    continue
+                found.add(row.campaign_resource_name)
+                self._mirror_campaign(account_id, row, batch)
+                changed_budgets.discard(row.campaign_campaign_budget)
+        batch["removals"].extend((CAMPAIGN, name) for name in changed_campaigns - found)
+
+        found = set()
+        for where in _resource_name_filters("campaign_budget.resource_name", changed_budgets):
+            for row in self.reports.stream(account_id, "campaign_budget", MIRROR_BUDGET_FIELDS, where=[where]):
+                found.add(row.campaign_budget_resource_name)
+                batch["upserts"].append((
+                    BUDGET, row.campaign_budget_resource_name, account_id,
+                    {"amount_micros": row.campaign_budget_amount_micros}
+                ))
+        batch["removals"].extend((BUDGET, name) for name in changed_budgets - found)
+        batch["states"].append((account_id, "campaigns", watermark, event_watermark))
+
+    def _load_account_campaigns(self, account_id, batch):
+        # Overlap the watermark by a day; re-reading a change does not alter the mirror
+        watermark = _sync_time(days=-1)
+        for row in self.reports.stream(
+            account_id, "campaign", MIRROR_CAMPAIGN_FIELDS, where=["campaign.status != 'REMOVED'"]
+        ):
+            self._mirror_campaign(account_id, row, batch)
+        batch["replace"].extend([(CAMPAIGN, account_id), (BUDGET, account_id)])
+        batch["states"].append((account_id, "campaigns", watermark, watermark))
+        batch["full_loads"] += 1
+
+    @staticmethod
+    def _mirror_campaign(account_id, row, batch):
+        batch["upserts"].append((CAMPAIGN, row.campaign_resource_name, account_id, {
+            "id": row.campaign_id,
+            "name": row.campaign_name,
+            "status": row.campaign_status,
+            "budget": row.campaign_campaign_budget
+        }))
+        if row.campaign_campaign_budget:
+            batch["upserts"].append((
+                BUDGET, row.campaign_campaign_budget, account_id, {"amount_micros": row.campaign_budget_amount_micros}
+            ))
+
+    def _sync_assets(self, batch):
+        state = change_mirror.stream_state(self.customer_id, self.customer_id, "assets")
+        changes = None
+        if state is not None and not _watermark_expired(state["watermark"], CHANGE_STATUS_MAX_AGE):
+            changes = self._changes_since(
+                self.customer_id, "change_status", "change_status.last_change_date_time", "change_status.asset",
+                "change_status.resource_type = ASSET", state["watermark"]
+            )
+
+        if changes is None:
+            watermark = _sync_time(days=-1)
+            filters = [None]
+            batch["replace"].append((ASSET, self.customer_id))
+            batch["full_loads"] += 1
+        else:
+            changed_assets, watermark = changes
+            filters = list(_resource_name_filters("asset.resource_name", changed_assets))
+
+        found = set()
+        for where in filters:
+            conditions = ["asset.type IN (IMAGE, PRICE)"] + ([where] if where else [])
+            query = build_query("asset", MIRROR_ASSET_FIELDS, where=conditions)
+            for stream_batch in self._search_stream(self.customer_id, query):
+                for row in stream_batch.results:
+                    asset = row.asset
+                    found.add(asset.resource_name)
+                    if asset.type_.name == IMAGE:
+                        data = {"kind": IMAGE, **_logo_asset(asset)}
+                    else:
+                        data = {"kind": PRICE, **_price_asset(asset)}
+                    batch["upserts"].append((ASSET, asset.resource_name, self.customer_id, data))
+        if changes is not None:
+            batch["removals"].extend((ASSET, name) for name in changed_assets - found)
+        batch["states"].append((self.customer_id, "assets", watermark, None))
+
+    def _changes_since(self, account_id, resource, time_field, name_field, condition, watermark):
+        """Returns the resource names changed since ``watermark`` and the new watermark.
+
+        Returns None when the change history cannot answer, i.e. the row limit was hit.
+        Otherwise every change up to now has been seen, so the watermark moves up to
+        a day ago even when nothing changed; it never ages out of the API's history.
+        """
+        rows = list(self.reports.stream(
+            account_id, resource, (time_field, name_field),
+            where=[condition, f"{time_field} >= '{watermark}'", f"{time_field} <= '{_sync_time(days=2)}'"],
+            order_by=time_field, limit=SYNC_CHANGE_LIMIT
+        ))
+        if len(rows) >= SYNC_CHANGE_LIMIT:
+            return None
+        watermark = max([watermark, _sync_time(days=-1), *(changed_at for changed_at, _ in rows)])
+        return {name for _, name in rows if name}, watermark
+
+    def _ensure_mirror(self):
+        # Reads of a fresh mirror may still list the customer hierarchy upstream
+        self.initialize_client()
+        if change_mirror.needs_sync(self.customer_id, SYNC_INTERVAL):
+            self.sync_changes()
+        else:
+            self.verify_mirror_access()
+
+    def verify_mirror_access(self):
+        """Checks, at most every ``SYNC_ACCESS_TTL`` seconds per credentials, that the caller can read the customer.
+
+        The mirror is shared by everyone reading a customer, so a fresh mirror
+        must not be served to credentials the API would reject.
+        """
+        fingerprint = self._query_fingerprint("mirror_access")
+        if change_mirror.is_verified(self.customer_id, fingerprint, SYNC_ACCESS_TTL):
+            return
+
+        def verify():
+            self.initialize_client()
+            if not list(self.reports.stream(self.customer_id, "customer", ("customer.id",), limit=1)):
+                raise ValueError(f"No access to customer {self.customer_id}")
+            change_mirror.mark_verified(self.customer_id, fingerprint, SYNC_ACCESS_TTL)
+        self._single_flight("verify_mirror_access", (), verify)
+
+    def invalidate_mirror(self):
+        self.verify_mirror_access()
+        change_mirror.invalidate(self.customer_id)
+
+    def get_mirrored_campaigns(self):
+        """Same shape as ``get_ad_campaigns``, read from the local mirror."""
+        self._ensure_mirror()
+        budgets = {name: data["amount_micros"] for name, _, data in change_mirror.entities(self.customer_id, BUDGET)}
+        by_account = {}
+        for _, account_id, data in change_mirror.entities(self.customer_id, CAMPAIGN):
+            by_account.setdefault(account_id, []).append(data)
+
+        campaigns_dict = {}
+        for account in self.get_customer_ids():
+            campaigns = sorted(by_account.get(account['id'], []), key=lambda campaign: campaign["id"])
+            campaigns_dict[account['id']] = {
+                "Account Name": account['name'],
+                "Campaigns": [{
+                    "Campaign ID": campaign["id"],
+                    "Campaign Name": campaign["name"],
+                    "Budget": budgets.get(campaign["budget"], 0) / 1000000
+                } for campaign in campaigns]
+            }
+        return campaigns_dict
+
+    def get_mirrored_assets(self, kind):
+        """Same shape as ``get_logo_assets`` (IMAGE) or ``get_price_assets`` (PRICE), read from the local mirror."""
+        self._ensure_mirror()
+        assets = []
+        for _, _, data in change_mirror.entities(self.customer_id, ASSET):
+            asset_kind = data.pop("kind")
+            if asset_kind != kind or (kind == IMAGE and "Logo" not in data["name"]):
+                continue
+            assets.append(data)
+        return assets
+
+    def get_mirror_changes(self, since_version=0):
+        """Returns everything that changed in the mirror after ``since_version``.
+
+        A ``since_version`` ahead of the mirror means it was rebuilt; the reply
+        then has ``reset`` set and carries every entity again.
+        """
+        self._ensure_mirror()
+        version, changes = change_mirror.changes(self.customer_id, since_version)
+        reset = since_version > version
+        if reset:
+            version, changes = change_mirror.changes(self.customer_id, 0)
+        return {"version": version, "reset": reset, "changes": changes}
@@ -0,0 +1,137 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class _Hierarchy:
+    __slots__ = ("accounts", "names", "loaded_at")
+
+    def __init__(self, accounts):
+        self.accounts = accounts
+        self.names = dict(accounts)
+        self.loaded_at = time.monotonic()
+
+
+class CustomerHierarchyCache:
+    """Caches the non-manager client accounts below each login customer.
+
+    Fresh entries are served for ``ttl`` seconds. For a further ``stale_ttl``
+    seconds the cached accounts are still returned while a background thread
+    reloads them; after that the next caller reloads synchronously. Entries are
+    keyed by login customer and a ``scope`` identifying the caller's credentials,
+    so a hierarchy is only served to credentials that loaded it themselves. Each
+    entry also indexes its accounts' descriptive names by customer ID.
+
+    Entries past ``ttl + stale_ttl`` are dropped whenever a hierarchy is stored,
+    and the entries loaded longest ago are evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, ttl=3600, stale_ttl=86400, max_entries=256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries = {}
+        self._refreshing = set()
+        self._load_locks = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, login_customer_id, loader, scope=None):
+        key = (login_customer_id, scope)
+        with self._lock:
+            entry = self._entries.get(key)
+            age = time.monotonic() - entry.loaded_at if entry else None
+            if entry and age < self.ttl:
+                self.hits += 1
+                return self._as_dicts(entry)
+            if entry and age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                if key not in self._refreshing:
+                    self._refreshing.add(key)
+                    threading.Thread(target=self._refresh, args=(key, loader), daemon=True).start()
+                return self._as_dicts(entry)
+            self.misses += 1
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        with load_lock:
+            # Another caller may have loaded it while we waited
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and time.monotonic() - entry.loaded_at < self.ttl:
+                    return self._as_dicts(entry)
+            return self._as_dicts(self._load(key, loader))
+
+    def get_name(self, login_customer_id, customer_id, scope=None):
+        """Returns the descriptive name of a cached child account, or None if it is not cached."""
+        with self._lock:
+            entry = self._entries.get((login_customer_id, scope))
+            return entry.names.get(str(customer_id)) if entry else None
+
+    def _refresh(self, key, loader):
+        try:
+            self._load(key, loader)
+        except Exception as e:
+            logger.error(f'Failed to refresh customer hierarchy for {key[0]}: {e}')
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    def _load(self, key, loader):
+        entry = _Hierarchy(tuple((account['id'], account['name']) for account in loader()))
+        with self._lock:
+            self._entries[key] = entry
+            self._prune()
+        return entry
+
+    def _prune(self):
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if now - entry.loaded_at >= self.ttl + self.stale_ttl]
+        for key in expired:
+            del self._entries[key]
+        overflow = len(self._entries) - self.max_entries
+        if overflow > 0:
+            for key in sorted(self._entries, key=lambda key: self._entries[key].loaded_at)[:overflow]:
+                del self._entries[key]
+        self.evictions += len(expired) + max(overflow, 0)
+        # A lock still held belongs to a load in progress, which stores its entry when it finishes
+        for key in [key for key, lock in self._load_locks.items() if key not in self._entries and not lock.locked()]:
+            del self._load_locks[key]
+
+    @staticmethod
+    def _as_dicts(entry):
+        return [{'id': account_id, 'name': name} for account_id, name in entry.accounts]
+
+    def invalidate(self, login_customer_id=None):
+        with self._lock:
+            if login_customer_id is None:
+                self._entries.clear()
+                self._load_locks.clear()
+                return
+            for key in [key for key in self._entries if key[0] == login_customer_id]:
+                del self._entries[key]
+            for key in [key for key in self._load_locks if key[0] == login_customer_id]:
+                del self._load_locks[key]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "names": sum(len(entry.names) for entry in self._entries.values()),
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+hierarchy_cache = CustomerHierarchyCache(
+    ttl=float(os.getenv("GOOGLE_ADS_HIERARCHY_TTL", "3600")),
+    stale_ttl=float(os.getenv("GOOGLE_ADS_HIERARCHY_STALE_TTL", "86400")),
+    max_entries=int(os.getenv("GOOGLE_ADS_HIERARCHY_MAX_ENTRIES", "256")),
+)
@@ -0,0 +1,50 @@
+import hashlib
+import re
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+# Asset names carry a content digest so identical uploads can be matched later
+DIGEST_LENGTH = 32
+DIGEST_PATTERN = re.compile(r"#([0-9a-f]{%d})$" % DIGEST_LENGTH)
+
+IMAGE_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "IMAGE_PNG"),
+    (b"\xff\xd8\xff", "IMAGE_JPEG"),
+    (b"GIF87a", "IMAGE_GIF"),
+    (b"GIF89a", "IMAGE_GIF"),
+)
+
+
+def sniff_image_mime_type(header):
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if header.startswith(signature):
+            return mime_type
+    raise ValueError("Unsupported image format, expected PNG, JPEG or GIF")
+
+
+def scan_image(fileobj):
+    """Hashes and sniffs an image file in chunks without loading it into memory.
+
+    Returns (digest, mime type name, size in bytes) and leaves the file rewound.
+    """
+    fileobj.seek(0)
+    sha256 = hashlib.sha256()
+    header = fileobj.read(HASH_CHUNK_SIZE)
+    mime_type = sniff_image_mime_type(header)
+    size = 0
+    chunk = header
+    while chunk:
+        sha256.update(chunk)
+        size += len(chunk)
+        chunk = fileobj.read(HASH_CHUNK_SIZE)
+    fileobj.seek(0)
+    return sha256.hexdigest()[:DIGEST_LENGTH], mime_type, size
+
+
+def tagged_asset_name(name, digest):
+    return f"{name} #{digest}"
+
+
+def asset_name_digest(name):
+    match = DIGEST_PATTERN.search(name)
+    return match.group(1) if match else None
@@ -0,0 +1,94 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from services.errors import describe_error
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFull(Exception):
+    pass
+
+
+class JobQueue:
+    """Runs long Google Ads operations on a bounded worker pool.
+
+    Jobs move through pending -> running -> complete/failed and are kept in an
+    in-memory table for ``result_ttl`` seconds after they finish. At most
+    ``max_pending`` jobs may be queued or running at once; further submissions
+    raise JobQueueFull so callers can shed load instead of piling up threads.
+    """
+
+    def __init__(self, max_workers=4, max_pending=100, result_ttl=3600):
+        self.max_pending = max_pending
+        self.result_ttl = result_ttl
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, kind, fn, *args, **kwargs):
+        with self._lock:
+            self._evict_expired()
+            if self._active >= self.max_pending:
+                raise JobQueueFull(f"Job queue is full ({self.max_pending} jobs pending)")
+            job_id = str(uuid.uuid4())
+            self._jobs[job_id] = {
+                "job_id": job_id,
+                "kind": kind,
+                "status": "pending",
+                "submitted_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "result": None,
+                "error": None,
+            }
+            self._active += 1
+        self._executor.submit(self._run, job_id, fn, args, kwargs)
+        return job_id
+
+    def _run(self, job_id, fn, args, kwargs):
+        self._update(job_id, status="running", started_at=time.time())
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            logger.error(f'Job {job_id} failed: {e}')
+            self._update(job_id, status="failed", error=describe_error(e), finished_at=time.time())
+        else:
+            self._update(job_id, status="complete", result=result, finished_at=time.time())
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _evict_expired(self):
+        cutoff = time.time() - self.result_ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job["finished_at"] is not None and job["finished_at"] < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def stats(self):
+        with self._lock:
+            counts = {"pending": 0, "running": 0, "complete": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job["status"]] += 1
+            return {"max_pending": self.max_pending, **counts}
+
+
+job_queue = JobQueue(
+    max_workers=int(os.getenv("GOOGLE_ADS_JOB_WORKERS", "4")),
+    max_pending=int(os.getenv("GOOGLE_ADS_JOB_MAX_PENDING", "100")),
+    result_ttl=float(os.getenv("GOOGLE_ADS_JOB_RESULT_TTL", "3600")),
+)
@@ -0,0 +1,142 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+class _Series:
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size):
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class _Span:
+    __slots__ = ("registry", "method", "scope", "started")
+
+    def __init__(self, registry, method, scope):
+        self.registry = registry
+        self.method = method
+        self.scope = scope
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            outcome = "ok"
+        elif exc_type is GeneratorExit:
+            # The caller stopped reading a stream before it finished
+            outcome = "cancelled"
+        else:
+            outcome = "error"
+        self.registry.observe(self.method, self.scope, outcome, time.perf_counter() - self.started)
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class MetricsRegistry:
+    """Latency histograms for upstream calls plus stats of the process-wide caches.
+
+    ``span(method, scope)`` times a block and records it under
+    ``<prefix>_request_duration_seconds``, labelled by method, ``scope_label``
+    (e.g. the customer) and an ok/error/cancelled outcome.
+    Stats sources registered with ``register_stats`` are rendered as gauges,
+    except the keys listed in ``counters``: those only ever grow and are
+    rendered as counters with a ``_total`` suffix.
+    When disabled, ``span`` returns a shared no-op context manager.
+    """
+
+    def __init__(self, prefix, scope_label="customer", enabled=True, buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.scope_label = scope_label
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._stats_sources = {}
+        self._lock = threading.Lock()
+
+    def span(self, method, scope=None):
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _Span(self, method, scope)
+
+    def observe(self, method, scope, outcome, seconds):
+        key = (method, scope or "", outcome)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = _Series(len(self.buckets))
+                self._series[key] = series
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    series.buckets[index] += 1
+                    break
+            series.sum += seconds
+            series.count += 1
+
+    def register_stats(self, name, stats, counters=()):
+        self._stats_sources[name] = (stats, frozenset(counters))
+
+    def render(self):
+        """Returns all metrics in the Prometheus text exposition format."""
+        name = f"{self.prefix}_request_duration_seconds"
+        lines = [f"# TYPE {name} histogram"]
+        with self._lock:
+            series = [(key, list(s.buckets), s.sum, s.count) for key, s in self._series.items()]
+        for (method, scope, outcome), buckets, total, count in sorted(series):
+            labels = f'method="{_escape(method)}",{self.scope_label}="{_escape(scope)}",outcome="{outcome}"'
+            cumulative = 0
+            for bound, bucket in zip(self.buckets, buckets):
+                cumulative += bucket
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{name}_sum{{{labels}}} {total}")
+            lines.append(f"{name}_count{{{labels}}} {count}")
+
+        for source, (stats, counters) in sorted(self._stats_sources.items()):
+            try:
+                values = stats()
+            except Exception as e:
+                logger.warning(f'Failed to collect {source} stats: {e}')
+                continue
+            for key, value in values.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                metric = f"{self.prefix}_{source}_{key}"
+                if key in counters:
+                    lines.append(f"# TYPE {metric}_total counter")
+                    lines.append(f"{metric}_total {value}")
+                else:
+                    lines.append(f"# TYPE {metric} gauge")
+                    lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = MetricsRegistry(
+    "google_ads",
+    enabled=os.getenv("GOOGLE_ADS_METRICS_ENABLED", "true").lower() in ("1", "true", "yes"),
+)
@@ -0,0 +1,18 @@
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def ndjson_lines(rows):
+    try:
+        for row in rows:
+            if hasattr(row, "_asdict"):
+                row = row._asdict()
+            yield json.dumps(row, default=str) + "\n"
+    except Exception as e:
+        # Headers are already sent, so report the failure in-band as the last line
+        logger.error(f'Streaming response failed: {e}')
+        yield json.dumps({"error": str(e)}) + "\n"
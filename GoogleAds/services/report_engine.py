@@ -0,0 +1,73 @@
+import enum
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+FIELD_PATTERN = re.compile(r"^[a-z_]+(\.[a-z_]+)+$")
+RESOURCE_PATTERN = re.compile(r"^[a-z_]+$")
+
+
+def validate_fields(fields):
+    fields = tuple(fields)
+    if not fields:
+        raise ValueError("At least one field must be selected")
+    for field in fields:
+        if not FIELD_PATTERN.match(field):
+            raise ValueError(f"Invalid GAQL field: {field}")
+    return fields
+
+
+@lru_cache(maxsize=128)
+def row_type(fields):
+    return namedtuple("ReportRow", [field.replace(".", "_") for field in fields])
+
+
+def build_query(resource, fields, where=None, order_by=None, limit=None):
+    if not RESOURCE_PATTERN.match(resource):
+        raise ValueError(f"Invalid GAQL resource: {resource}")
+    query = f"SELECT {', '.join(validate_fields(fields))} FROM {resource}"
+    if where:
+        query += " WHERE " + " AND ".join(where)
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit:
+        query += f" LIMIT {int(limit)}"
+    return query
+
+
+def _getter(field):
+    # proto-plus renames fields that shadow Python builtins, e.g. asset.type -> type_
+    root, *parts = field.split(".")
+
+    def get(row):
+        value = getattr(row, root)
+        for part in parts:
+            try:
+                value = getattr(value, part)
+            except AttributeError:
+                value = getattr(value, part + "_")
+        if isinstance(value, enum.Enum):
+            return value.name
+        return value
+    return get
+
+
+class ReportEngine:
+    """Runs GAQL reports over search_stream and yields compact namedtuple rows.
+
+    Rows are produced lazily as each stream batch arrives, with one attribute per
+    selected field (``campaign.id`` becomes ``campaign_id``), so callers can
+    serialize or aggregate them without holding the full result in memory.
+    """
+
+    def __init__(self, search_stream):
+        self.search_stream = search_stream
+
+    def stream(self, customer_id, resource, fields, where=None, order_by=None, limit=None, timeout=None):
+        fields = validate_fields(fields)
+        query = build_query(resource, fields, where=where, order_by=order_by, limit=limit)
+        make_row = row_type(fields)._make
+        getters = [_getter(field) for field in fields]
+        for batch in self.search_stream(customer_id, query, timeout=timeout):
+            for row in batch.results:
+                yield make_row(get(row) for get in getters)
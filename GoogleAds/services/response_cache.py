@@ -0,0 +1,195 @@
+import json
+import logging
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryBackend:
+    """In-process LRU store. Entries are dropped after their ttl or when ``max_entries`` is exceeded.
+
+    Every entry belongs to a scope (a customer) with a generation counter. The
+    counter is dropped together with the scope's last entry, and counters of at
+    most ``max_entries`` scopes without entries are kept. Generations are drawn
+    from one sequence, so a dropped counter never comes back with a generation
+    an older entry was stored under.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._scope_sizes = {}
+        self._generations = OrderedDict()
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            value, expires_at, _ = item
+            if time.time() >= expires_at:
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, scope):
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, time.time() + ttl, scope)
+            self._scope_sizes[scope] = self._scope_sizes.get(scope, 0) + 1
+            while len(self._entries) > self.max_entries:
+                self._drop(next(iter(self._entries)))
+
+    def _drop(self, key):
+        _, _, scope = self._entries.pop(key)
+        remaining = self._scope_sizes[scope] - 1
+        if remaining:
+            self._scope_sizes[scope] = remaining
+        else:
+            del self._scope_sizes[scope]
+            self._generations.pop(scope, None)
+
+    def generation(self, scope):
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def bump(self, scope):
+        with self._lock:
+            self._generations[scope] = next(self._sequence)
+            self._generations.move_to_end(scope)
+            if len(self._generations) > len(self._scope_sizes) + self.max_entries:
+                # Forget the longest-unchanged scope that has nothing cached
+                for idle in self._generations:
+                    if idle not in self._scope_sizes:
+                        del self._generations[idle]
+                        break
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisBackend:
+    """Redis-compatible store shared by every worker. Values must be JSON serializable.
+
+    Counting the keys would scan the whole keyspace, so it has no length and
+    the cache reports no entry count for it.
+    """
+
+    def __init__(self, url, prefix="google_ads:response_cache:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("The redis package is required for GOOGLE_ADS_RESPONSE_CACHE_URL")
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url)
+
+    def get(self, key):
+        raw = self._redis.get(self.prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key, value, ttl, scope):
+        self._redis.set(self.prefix + key, json.dumps(value), ex=max(1, int(ttl)))
+
+    def generation(self, scope):
+        raw = self._redis.get(f"{self.prefix}generation:{scope}")
+        return 0 if raw is None else int(raw)
+
+    def bump(self, scope):
+        self._redis.incr(f"{self.prefix}generation:{scope}")
+
+
+class ResponseCache:
+    """Read-through cache for API responses keyed by customer and query fingerprint.
+
+    Entries are fresh for ``ttl`` seconds. For a further ``stale_ttl`` seconds a
+    stale entry is still returned while a background thread reloads it. Writes
+    call ``invalidate`` for their customer, which bumps a per-customer generation
+    that is part of every key, so older entries are never read again.
+    """
+
+    def __init__(self, backend, ttl=60, stale_ttl=300):
+        self.backend = backend
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+
+    def _key(self, customer_id, fingerprint):
+        generation = self.backend.generation(customer_id)
+        return f"{customer_id}:{generation}:{fingerprint}"
+
+    def get(self, customer_id, fingerprint, loader):
+        key = self._key(customer_id, fingerprint)
+        entry = self.backend.get(key)
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < self.ttl:
+                self.hits += 1
+                return entry["value"]
+            self.stale_hits += 1
+            self._refresh_in_background(customer_id, key, loader)
+            return entry["value"]
+
+        self.misses += 1
+        return self._load(customer_id, key, loader)
+
+    def _load(self, customer_id, key, loader):
+        value = loader()
+        self.backend.set(key, {"value": value, "stored_at": time.time()}, self.ttl + self.stale_ttl, customer_id)
+        return value
+
+    def _refresh_in_background(self, customer_id, key, loader):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                self._load(customer_id, key, loader)
+            except Exception as e:
+                logger.warning(f'Background refresh of {key} failed: {e}')
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, daemon=True).start()
+
+    def invalidate(self, customer_id):
+        self.backend.bump(customer_id)
+
+    def stats(self):
+        stats = {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+        }
+        if isinstance(self.backend, MemoryBackend):
+            stats["entries"] = len(self.backend)
+        return stats
+
+
+def build_backend():
+    url = os.getenv("GOOGLE_ADS_RESPONSE_CACHE_URL")
+    if url:
+        return RedisBackend(url)
+    return MemoryBackend(max_entries=int(os.getenv("GOOGLE_ADS_RESPONSE_CACHE_SIZE", "1024")))
+
+
+response_cache = ResponseCache(
+    build_backend(),
+    ttl=float(os.getenv("GOOGLE_ADS_RESPONSE_CACHE_TTL", "60")),
+    stale_ttl=float(os.getenv("GOOGLE_ADS_RESPONSE_CACHE_STALE_TTL", "300")),
+)
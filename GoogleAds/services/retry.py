@@ -0,0 +1,46 @@
+import logging
+import random
+import time
+import grpc
+from google.ads.googleads.errors import GoogleAdsException
+
+logger = logging.getLogger(__name__)
+
+# Quota errors (RESOURCE_EXHAUSTED) are retried by the request scheduler
+RETRYABLE_STATUS_CODES = {
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.DEADLINE_EXCEEDED,
+    grpc.StatusCode.INTERNAL,
+}
+
+
+def status_code(ex):
+    if isinstance(ex, GoogleAdsException):
+        return ex.error.code()
+    if isinstance(ex, grpc.RpcError):
+        return ex.code()
+    return None
+
+
+def is_retryable(ex):
+    return status_code(ex) in RETRYABLE_STATUS_CODES
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    delay = min(max_delay, base_delay * (2 ** attempt))
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+def call_with_retry(fn, *args, max_retries=3, base_delay=0.5, max_delay=8.0,
+                    retryable=is_retryable, **kwargs):
+    attempt = 0
+    while True:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as ex:
+            if attempt >= max_retries or not retryable(ex):
+                raise
+            delay = backoff_delay(attempt, base_delay, max_delay)
+            logger.warning(f'Retrying after error ({status_code(ex)}), attempt {attempt + 1} in {delay:.2f}s')
+            time.sleep(delay)
+            attempt += 1
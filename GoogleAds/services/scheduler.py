@@ -0,0 +1,212 @@
+import logging
+import os
+import threading
+import time
+import grpc
+from google.ads.googleads.errors import GoogleAdsException
+from services.retry import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+READ = "read"
+MUTATE = "mutate"
+
+MAX_CUSTOMER_BUCKETS = 10000
+
+QUOTA_ERRORS = {"RESOURCE_EXHAUSTED", "RESOURCE_TEMPORARILY_EXHAUSTED"}
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request would have to wait longer than ``max_wait`` for its rate limit."""
+
+    def __init__(self, customer_id, retry_after):
+        super().__init__(f"Rate limit reached for customer {customer_id}, retry in {retry_after:.0f}s")
+        self.customer_id = customer_id
+        self.retry_after = retry_after
+
+
+def quota_error(ex):
+    """Returns ``(retry_delay, developer_scope)`` for quota errors, or None for other errors.
+
+    ``retry_delay`` is the server's suggested delay in seconds, or 0 without a
+    hint. ``developer_scope`` is True when the exhausted quota belongs to the
+    developer token rather than the customer.
+    """
+    if isinstance(ex, GoogleAdsException):
+        for error in ex.failure.errors:
+            if getattr(error.error_code.quota_error, "name", None) in QUOTA_ERRORS:
+                details = error.details.quota_error_details
+                developer_scope = getattr(details.rate_scope, "name", None) == "DEVELOPER"
+                retry_delay = details.retry_delay
+                if hasattr(retry_delay, "total_seconds"):
+                    return retry_delay.total_seconds(), developer_scope
+                return retry_delay.seconds + retry_delay.nanos / 1e9, developer_scope
+        return (0, False) if ex.error.code() == grpc.StatusCode.RESOURCE_EXHAUSTED else None
+    if isinstance(ex, grpc.RpcError) and ex.code() == grpc.StatusCode.RESOURCE_EXHAUSTED:
+        return 0, False
+    return None
+
+
+class TokenBucket:
+    __slots__ = ("rate", "capacity", "tokens", "updated", "blocked_until")
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, now, needed):
+        if now < self.blocked_until:
+            return self.blocked_until - now
+        if self.tokens >= needed:
+            return 0
+        return (needed - self.tokens) / self.rate
+
+
+class RequestScheduler:
+    """Paces Google Ads RPCs with token buckets and retries quota errors.
+
+    Every call takes one token from the developer token's bucket and one from
+    the bucket for its customer and priority class. Reads may only draw the
+    developer token bucket down to ``mutate_reserve`` of its capacity, leaving
+    the rest for mutates. A quota error blocks the customer's buckets, and the
+    developer token's bucket only if the developer token's quota ran out, for
+    the server's ``retry_delay`` so concurrent callers back off together. A call
+    that would wait longer than ``max_wait`` raises RateLimitExceeded instead of
+    being sent over the limit.
+    """
+
+    def __init__(self, developer_token_rate=50, customer_read_rate=10, customer_mutate_rate=5,
+                 burst=2, mutate_reserve=0.2, max_wait=30, max_retries=3):
+        self.developer_token_rate = developer_token_rate
+        self.customer_rates = {READ: customer_read_rate, MUTATE: customer_mutate_rate}
+        self.burst = burst
+        self.mutate_reserve = mutate_reserve
+        self.max_wait = max_wait
+        self.max_retries = max_retries
+        self._developer_buckets = {}
+        self._customer_buckets = {}
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.rejected = 0
+        self.quota_errors = 0
+
+    def _buckets(self, developer_token, customer_id, priority):
+        developer_bucket = self._developer_buckets.get(developer_token)
+        if developer_bucket is None:
+            developer_bucket = TokenBucket(self.developer_token_rate, self.developer_token_rate * self.burst)
+            self._developer_buckets[developer_token] = developer_bucket
+        key = (developer_token, customer_id, priority)
+        customer_bucket = self._customer_buckets.get(key)
+        if customer_bucket is None:
+            if len(self._customer_buckets) >= MAX_CUSTOMER_BUCKETS:
+                self._prune(time.monotonic())
+            rate = self.customer_rates[priority]
+            customer_bucket = TokenBucket(rate, rate * self.burst)
+            self._customer_buckets[key] = customer_bucket
+        return developer_bucket, customer_bucket
+
+    def _prune(self, now):
+        # Full, unblocked buckets carry no state worth keeping
+        for key, bucket in list(self._customer_buckets.items()):
+            bucket.refill(now)
+            if bucket.tokens >= bucket.capacity and bucket.blocked_until <= now:
+                del self._customer_buckets[key]
+
+    def acquire(self, developer_token, customer_id, priority=READ):
+        deadline = time.monotonic() + self.max_wait
+        throttled = False
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                developer_bucket, customer_bucket = self._buckets(developer_token, customer_id, priority)
+                developer_bucket.refill(now)
+                customer_bucket.refill(now)
+                reserve = developer_bucket.capacity * self.mutate_reserve if priority == READ else 0
+                wait = max(developer_bucket.wait_time(now, 1 + reserve), customer_bucket.wait_time(now, 1))
+                if wait == 0:
+                    developer_bucket.tokens -= 1
+                    customer_bucket.tokens -= 1
+                    return
+                if wait > deadline - now:
+                    self.rejected += 1
+                    raise RateLimitExceeded(customer_id, wait)
+                if not throttled:
+                    throttled = True
+                    self.throttled += 1
+            time.sleep(min(wait, deadline - now, 1.0))
+
+    def block(self, developer_token, customer_id, delay, developer_scope=False):
+        until = time.monotonic() + delay
+        with self._lock:
+            for priority in (READ, MUTATE):
+                developer_bucket, customer_bucket = self._buckets(developer_token, customer_id, priority)
+                customer_bucket.blocked_until = max(customer_bucket.blocked_until, until)
+            # Other customers on the token keep their own quota unless the token's is exhausted
+            if developer_scope:
+                developer_bucket.blocked_until = max(developer_bucket.blocked_until, until)
+
+    def _on_quota_error(self, developer_token, customer_id, attempt, error):
+        self.quota_errors += 1
+        delay, developer_scope = error
+        delay = delay or backoff_delay(attempt, 1.0, self.max_wait)
+        scope = "developer token" if developer_scope else f"customer {customer_id}"
+        logger.warning(f'Quota exhausted for {scope}, retrying in {delay:.2f}s')
+        self.block(developer_token, customer_id, delay, developer_scope)
+
+    def execute(self, developer_token, customer_id, priority, fn, /, *args, **kwargs):
+        attempt = 0
+        while True:
+            self.acquire(developer_token, customer_id, priority)
+            try:
+                return fn(*args, **kwargs)
+            except Exception as ex:
+                error = quota_error(ex)
+                if error is None or attempt >= self.max_retries:
+                    raise
+                self._on_quota_error(developer_token, customer_id, attempt, error)
+                attempt += 1
+
+    def execute_stream(self, developer_token, customer_id, fn, /, *args, **kwargs):
+        # A stream can only be retried until its first batch has been handed out
+        attempt = 0
+        while True:
+            self.acquire(developer_token, customer_id, READ)
+            started = False
+            try:
+                for batch in fn(*args, **kwargs):
+                    started = True
+                    yield batch
+                return
+            except Exception as ex:
+                error = quota_error(ex)
+                if started or error is None or attempt >= self.max_retries:
+                    raise
+                self._on_quota_error(developer_token, customer_id, attempt, error)
+                attempt += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "developer_tokens": len(self._developer_buckets),
+                "customer_buckets": len(self._customer_buckets),
+                "throttled": self.throttled,
+                "rejected": self.rejected,
+                "quota_errors": self.quota_errors,
+            }
+
+
+scheduler = RequestScheduler(
+    developer_token_rate=float(os.getenv("GOOGLE_ADS_DEVELOPER_TOKEN_QPS", "50")),
+    customer_read_rate=float(os.getenv("GOOGLE_ADS_CUSTOMER_READ_QPS", "10")),
+    customer_mutate_rate=float(os.getenv("GOOGLE_ADS_CUSTOMER_MUTATE_QPS", "5")),
+    burst=float(os.getenv("GOOGLE_ADS_RATE_BURST_SECONDS", "2")),
+    max_wait=float(os.getenv("GOOGLE_ADS_RATE_MAX_WAIT", "30")),
+    max_retries=int(os.getenv("GOOGLE_ADS_QUOTA_MAX_RETRIES", "3")),
+)
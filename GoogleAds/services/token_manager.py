@@ -0,0 +1,153 @@
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+
+logger = logging.getLogger(__name__)
+
+TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+
+class _TokenEntry:
+    __slots__ = ("credentials", "lock", "last_used")
+
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+
+
+class TokenManager:
+    """Caches OAuth credentials per refresh token and renews access tokens ahead of expiry.
+
+    The same Credentials object is handed to every client built for a refresh
+    token, so renewing it in place keeps all of them valid. A token is renewed
+    once it is within ``refresh_margin`` seconds of expiry: by a daemon thread
+    for credentials used in the last ``idle_ttl`` seconds, otherwise by the next
+    caller. Concurrent renewals of one credential collapse into a single
+    token-endpoint request.
+    """
+
+    def __init__(self, refresh_margin=300, idle_ttl=3600, check_interval=30, request_factory=Request):
+        self.refresh_margin = refresh_margin
+        self.idle_ttl = idle_ttl
+        self.check_interval = check_interval
+        self.request_factory = request_factory
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._renewal_thread = None
+        self.hits = 0
+        self.refreshes = 0
+        self.background_refreshes = 0
+        self.failures = 0
+
+    @staticmethod
+    def make_key(config):
+        # Callers with the wrong client secret must not get credentials cached for the right one
+        return (
+            config["client_id"],
+            hashlib.sha256(config["client_secret"].encode()).hexdigest(),
+            hashlib.sha256(config["refresh_token"].encode()).hexdigest(),
+        )
+
+    def get_credentials(self, config):
+        key = self.make_key(config)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = _TokenEntry(Credentials(
+                    token=None,
+                    refresh_token=config["refresh_token"],
+                    client_id=config["client_id"],
+                    client_secret=config["client_secret"],
+                    token_uri=config.get("token_uri") or TOKEN_URI,
+                    scopes=config.get("scopes"),
+                ))
+                self._entries[key] = entry
+            entry.last_used = time.monotonic()
+        self._start_renewal()
+
+        if not self._needs_refresh(entry.credentials):
+            with self._lock:
+                self.hits += 1
+            return entry.credentials
+        with entry.lock:
+            # Whoever held the lock may already have renewed the token
+            if self._needs_refresh(entry.credentials):
+                self._refresh(entry)
+        return entry.credentials
+
+    def _needs_refresh(self, credentials):
+        if not credentials.token:
+            return True
+        if credentials.expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return (credentials.expiry - now).total_seconds() <= self.refresh_margin
+
+    def _refresh(self, entry):
+        try:
+            entry.credentials.refresh(self.request_factory())
+        except Exception:
+            with self._lock:
+                self.failures += 1
+            raise
+        with self._lock:
+            self.refreshes += 1
+
+    def _start_renewal(self):
+        if self._renewal_thread is None:
+            with self._lock:
+                if self._renewal_thread is None:
+                    self._renewal_thread = threading.Thread(target=self._renewal_loop, daemon=True)
+                    self._renewal_thread.start()
+
+    def _renewal_loop(self):
+        while True:
+            time.sleep(self.check_interval)
+            now = time.monotonic()
+            with self._lock:
+                for key, entry in list(self._entries.items()):
+                    if now - entry.last_used >= self.idle_ttl:
+                        del self._entries[key]
+                entries = list(self._entries.values())
+            for entry in entries:
+                if not self._needs_refresh(entry.credentials) or not entry.lock.acquire(blocking=False):
+                    continue
+                try:
+                    self._refresh(entry)
+                    with self._lock:
+                        self.background_refreshes += 1
+                except Exception as e:
+                    logger.warning(f'Background token renewal failed for client {entry.credentials.client_id}: {e}')
+                finally:
+                    entry.lock.release()
+
+    def invalidate(self, config=None):
+        with self._lock:
+            if config is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(self.make_key(config), None)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "credentials": len(self._entries),
+                "hits": self.hits,
+                "refreshes": self.refreshes,
+                "background_refreshes": self.background_refreshes,
+                "failures": self.failures,
+            }
+
+
+token_manager = TokenManager(
+    refresh_margin=float(os.getenv("GOOGLE_ADS_TOKEN_REFRESH_MARGIN", "300")),
+    idle_ttl=float(os.getenv("GOOGLE_ADS_TOKEN_IDLE_TTL", "3600")),
+    check_interval=float(os.getenv("GOOGLE_ADS_TOKEN_CHECK_INTERVAL", "30")),
+)
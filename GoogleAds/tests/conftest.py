@@ -0,0 +1,50 @@
+import os
+import sys
+
+import pytest
+
+GOOGLE_ADS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, GOOGLE_ADS)
+sys.path.insert(0, os.path.join(os.path.dirname(GOOGLE_ADS), "benchmarks"))
+
+# Keep test state out of the working directory
+for name in ("ASSET_INDEX", "AUTH_STATE", "SYNC"):
+    os.environ.setdefault(f"GOOGLE_ADS_{name}_PATH", ":memory:")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from fake_google_ads import FakeGoogleAds, install  # noqa: E402
+
+CUSTOMER_ID = "1234567890"
+CREDENTIALS = {
+    "refresh_token": "fake-refresh-token",
+    "token_uri": "https://oauth2.googleapis.com/token",
+    "client_id": "fake-client-id",
+    "client_secret": "fake-client-secret",
+    "scopes": ["https://www.googleapis.com/auth/adwords"],
+    "universe_domain": "googleapis.com",
+    "account": "",
+    "expiry": "",
+    "developer_token": "fake-developer-token",
+}
+
+
+@pytest.fixture
+def backend():
+    from services.asset_index import asset_index
+    from services.campaign_index import campaign_index
+    from services.change_mirror import change_mirror
+    from services.hierarchy_cache import hierarchy_cache
+    from services.response_cache import response_cache
+    backend = FakeGoogleAds(accounts=2, campaigns=3, assets=2, price_assets=2, latency=0)
+    install(backend)
+    # Every test starts from a fresh fake, so nothing cached from an earlier one may be served
+    hierarchy_cache.invalidate()
+    for cache in (asset_index, campaign_index, change_mirror, response_cache):
+        cache.invalidate(CUSTOMER_ID)
+    return backend
+
+
+@pytest.fixture
+def client(backend):
+    from main import app
+    return TestClient(app)
@@ -0,0 +1,82 @@
+import json
+
+from conftest import CREDENTIALS, CUSTOMER_ID
+
+BODY = {"customer_id": CUSTOMER_ID, "campaign_name": "Campaign 1", "credentials": CREDENTIALS}
+
+
+def test_get_price_assets(client):
+    response = client.post("/get_price_assets", json=BODY)
+
+    assert response.status_code == 200, response.text
+    assets = response.json()["assets"]
+    assert [asset["price_amount"] for asset in assets] == [3.0, 4.0]
+    assert assets[0]["currency_code"] == "USD"
+
+
+def test_get_price_assets_ndjson(client):
+    response = client.post("/get_price_assets", params={"format": "ndjson"}, json=BODY)
+
+    assert response.status_code == 200, response.text
+    assets = [json.loads(line) for line in response.text.splitlines()]
+    assert [asset["header"] for asset in assets] == ["Service 3", "Service 4"]
+
+
+PRICE_BODY = {
+    **BODY,
+    "type": "SERVICES",
+    "offerings": [
+        {"header": f"Plan {n}", "description": "Monthly plan", "price": 9.5 * n, "currency_code": "USD",
+         "final_url": "https://example.com/pricing", "unit": "PER_MONTH"}
+        for n in range(1, 4)
+    ],
+}
+
+
+def test_upload_price_reuses_identical_price(client, backend):
+    first = client.post("/upload_price", json=PRICE_BODY)
+    second = client.post("/upload_price", json=PRICE_BODY)
+
+    assert first.status_code == 200, first.text
+    assert second.json()["asset_id"] == first.json()["asset_id"]
+    assert backend.snapshot()["AssetService.mutate_assets"] == 1
+
+
+def test_upload_price_does_not_share_assets_with_different_offerings(client, backend):
+    first = client.post("/upload_price", json=PRICE_BODY)
+    other_campaign = client.post("/upload_price", json={**PRICE_BODY, "campaign_name": "Campaign 2"})
+    renamed = [{**PRICE_BODY["offerings"][0], "header": "Starter"}, *PRICE_BODY["offerings"][1:]]
+    other_header = client.post("/upload_price", json={**PRICE_BODY, "offerings": renamed})
+
+    # Assets belong to the customer, so only the content decides whether one is reused
+    assert other_campaign.json()["asset_id"] == first.json()["asset_id"]
+    assert other_header.json()["asset_id"] != first.json()["asset_id"]
+    assert backend.snapshot()["AssetService.mutate_assets"] == 2
+
+
+def test_asset_index_is_scoped_to_credentials(client, backend):
+    other = {**PRICE_BODY, "credentials": {**CREDENTIALS, "refresh_token": "other-refresh-token"}}
+    client.post("/upload_price", json=PRICE_BODY)
+    searches = backend.snapshot()["GoogleAdsService.search_stream"]
+
+    response = client.post("/upload_price", json=other)
+
+    # The other credentials list the customer's assets themselves before a hit is served
+    assert response.status_code == 200, response.text
+    assert backend.snapshot()["GoogleAdsService.search_stream"] == searches + 1
+
+
+def test_upload_price_rejects_too_few_offerings(client, backend):
+    response = client.post("/upload_price", json={**PRICE_BODY, "offerings": PRICE_BODY["offerings"][:1]})
+
+    assert response.status_code == 400
+    assert "3 to 8 offerings" in response.json()["detail"]
+    assert backend.snapshot()["AssetService.mutate_assets"] == 0
+
+
+def test_upload_price_rejects_the_legacy_price_parameter(client, backend):
+    response = client.post("/upload_price", params={"price": 9.5}, json=BODY)
+
+    assert response.status_code == 400
+    assert "no longer supported" in response.json()["detail"]
+    assert backend.snapshot()["AssetService.mutate_assets"] == 0
\ No newline at end of file
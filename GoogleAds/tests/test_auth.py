@@ -0,0 +1,56 @@
+import os
+import stat
+from urllib.parse import parse_qs, urlparse
+
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import Flow
+
+from conftest import CUSTOMER_ID
+from services.auth_state import SQLiteAuthStateBackend, auth_states
+
+WEB = {
+    "client_id": "fake-client-id",
+    "client_secret": "fake-client-secret",
+    "auth_uri": "https://accounts.google.com/o/oauth2/auth",
+    "token_uri": "https://oauth2.googleapis.com/token",
+}
+
+
+def test_oauth_state_keeps_no_plaintext_secrets(client, monkeypatch):
+    exchanged = {}
+
+    def fetch_token(flow, **kwargs):
+        exchanged["code_verifier"] = flow.code_verifier
+        exchanged["client_secret"] = flow.client_config["client_secret"]
+        flow.oauth2session.token = {"access_token": "access", "refresh_token": "new-refresh-token"}
+
+    monkeypatch.setattr(Flow, "fetch_token", fetch_token)
+    monkeypatch.setattr(Flow, "credentials", property(
+        lambda flow: Credentials("access", refresh_token=flow.oauth2session.token["refresh_token"])
+    ))
+
+    response = client.post("/authenticate", json={"customer_id": CUSTOMER_ID, "credentials": {"web": WEB}})
+    assert response.status_code == 200, response.text
+    state = response.json()["state"]
+    stored = auth_states.get(state)
+    assert "fake-client-secret" not in str(stored)
+    assert parse_qs(urlparse(response.json()["auth_url"]).query)["code_challenge_method"] == ["S256"]
+
+    callback = client.get("/oauth2callback", params={"state": state, "code": "auth-code"})
+    assert callback.status_code == 200, callback.text
+    # The callback redeems the code with the verifier behind the challenge sent to Google
+    assert exchanged == {"code_verifier": stored["code_verifier"], "client_secret": "fake-client-secret"}
+    assert "new-refresh-token" not in str(auth_states.get(state))
+    assert auth_states.get(state)["client_secret"] is None
+
+    status = client.get(f"/check_auth_status/{state}")
+    assert status.json() == {"status": "complete", "refresh_token": "new-refresh-token"}
+    # The token is handed out once
+    assert auth_states.get(state) is None
+
+
+def test_sqlite_state_file_is_private(tmp_path):
+    path = str(tmp_path / "auth_state.sqlite3")
+    SQLiteAuthStateBackend(path)
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
@@ -0,0 +1,85 @@
+import datetime
+
+from conftest import CREDENTIALS, CUSTOMER_ID
+
+CAMPAIGN = {"campaign_name": "Spring Sale", "daily_budget": 12.5, "start_date": "2026-03-01", "end_date": "2026-03-31"}
+
+
+def test_campaign_operations_use_current_api_fields(client, backend):
+    from services.google_ads_manager import GoogleAdsManager
+    manager = GoogleAdsManager(client=CREDENTIALS, customer_id=CUSTOMER_ID)
+    manager.initialize_client()
+
+    budget_operation, campaign_operation = manager._campaign_operations(
+        "Spring Sale", 12.5, datetime.date(2026, 3, 1), datetime.date(2026, 3, 31), -1
+    )
+
+    campaign = campaign_operation.campaign_operation.create
+    assert campaign.start_date_time == "2026-03-01 00:00:00"
+    assert campaign.end_date_time == "2026-03-31 23:59:59"
+    assert campaign.campaign_budget == budget_operation.campaign_budget_operation.create.resource_name
+    assert budget_operation.campaign_budget_operation.create.amount_micros == 12500000
+
+
+def test_create_campaign(client, backend):
+    response = client.post("/create_campaign", json={**CAMPAIGN, "customer_id": CUSTOMER_ID, "credentials": CREDENTIALS})
+
+    assert response.status_code == 200, response.text
+    assert backend.snapshot()["GoogleAdsService.mutate"] == 1
+
+
+def test_create_campaigns(client, backend):
+    campaigns = [{**CAMPAIGN, "campaign_name": f"Spring Sale {n}"} for n in range(3)]
+    response = client.post("/create_campaigns", json={
+        "customer_id": CUSTOMER_ID, "credentials": CREDENTIALS, "campaigns": campaigns
+    })
+
+    assert response.status_code == 200, response.text
+    assert all(not result["errors"] for result in response.json()["results"])
+
+
+def test_update_campaign_budget(client, backend):
+    body = {"customer_id": CUSTOMER_ID, "credentials": CREDENTIALS, "campaign_name": "Campaign 1", "new_budget": 20}
+    response = client.post("/update_campaign", json=body)
+
+    assert response.status_code == 200, response.text
+    assert response.json()["success"] is True
+    assert backend.snapshot()["CampaignBudgetService.mutate_campaign_budgets"] == 1
+
+
+def test_campaign_index_is_scoped_to_credentials(client, backend):
+    from services.campaign_index import campaign_index
+    from services.google_ads_manager import GoogleAdsManager
+    owner = GoogleAdsManager(client=CREDENTIALS, customer_id=CUSTOMER_ID)
+    other = GoogleAdsManager(client={**CREDENTIALS, "refresh_token": "other"}, customer_id=CUSTOMER_ID)
+    owner.initialize_client()
+    other.initialize_client()
+
+    assert owner.find_campaign("Campaign 1") is not None
+    assert campaign_index.get(CUSTOMER_ID, "Campaign 1", other._campaign_index_scope()) is None
+
+
+def test_get_campaigns_streams_ndjson(client, backend):
+    response = client.post("/get_campaigns", params={"format": "ndjson"}, json={
+        "customer_id": CUSTOMER_ID, "credentials": CREDENTIALS
+    })
+
+    assert response.status_code == 200, response.text
+    assert len(response.text.splitlines()) == 2
+
+
+def test_get_campaigns_rejects_unknown_format(client, backend):
+    response = client.post("/get_campaigns", params={"format": "csv"}, json={
+        "customer_id": CUSTOMER_ID, "credentials": CREDENTIALS
+    })
+
+    assert response.status_code == 422
+
+
+def test_get_campaigns_rejects_concurrent_ndjson(client, backend):
+    response = client.post("/get_campaigns", params={"format": "ndjson"}, json={
+        "customer_id": CUSTOMER_ID, "credentials": CREDENTIALS, "concurrent": True
+    })
+
+    assert response.status_code == 400
+    assert backend.snapshot()["GoogleAdsService.search_stream"] == 0
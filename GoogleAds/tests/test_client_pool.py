@@ -0,0 +1,65 @@
+import pytest
+
+from conftest import CREDENTIALS
+from services import client_pool as client_pool_module
+from services.client_pool import GoogleAdsClientPool
+
+
+class FakeTransport:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeService:
+    def __init__(self):
+        self.transport = FakeTransport()
+
+
+class FakeClient:
+    def __init__(self, config):
+        self.config = config
+
+    def get_service(self, name):
+        return FakeService()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client_pool_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_credentials_never_share_an_entry():
+    pool = GoogleAdsClientPool(factory=FakeClient)
+    other_secret = {**CREDENTIALS, "client_secret": "other-secret"}
+    other_token = {**CREDENTIALS, "refresh_token": "other-refresh-token"}
+
+    clients = [pool.get_client(config) for config in (CREDENTIALS, other_secret, other_token)]
+
+    assert len({id(client) for client in clients}) == 3
+    assert [client.config for client in clients] == [CREDENTIALS, other_secret, other_token]
+    assert pool.get_client(dict(CREDENTIALS)) is clients[0]
+    assert pool.stats()["hits"] == 1 and pool.stats()["misses"] == 3
+
+
+def test_retired_channels_close_after_grace(clock):
+    pool = GoogleAdsClientPool(max_size=1, close_grace=60, factory=FakeClient)
+    service = pool.get_service(CREDENTIALS, "GoogleAdsService")
+
+    # Evicting the entry only retires it; a request may still be streaming on its channel
+    pool.get_client({**CREDENTIALS, "refresh_token": "other-refresh-token"})
+    assert pool.stats()["retired"] == 1
+    assert not service.transport.closed
+
+    clock[0] += 59
+    pool.invalidate({**CREDENTIALS, "refresh_token": "third-refresh-token"})
+    assert not service.transport.closed
+
+    clock[0] += 1
+    pool.invalidate({**CREDENTIALS, "refresh_token": "third-refresh-token"})
+    assert service.transport.closed
+    assert pool.stats()["retired"] == 0
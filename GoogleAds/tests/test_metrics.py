@@ -0,0 +1,7 @@
+def test_stats_counters_have_total_suffix(client):
+    lines = client.get("/metrics").text.splitlines()
+
+    assert "# TYPE google_ads_response_cache_hits_total counter" in lines
+    assert "# TYPE google_ads_response_cache_entries gauge" in lines
+    assert "# TYPE google_ads_client_pool_size gauge" in lines
+    assert not any(line.startswith("# TYPE") and line.endswith("_hits gauge") for line in lines)
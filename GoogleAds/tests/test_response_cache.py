@@ -0,0 +1,28 @@
+from services.response_cache import MemoryBackend, ResponseCache
+
+
+def test_generation_dropped_with_last_entry():
+    backend = MemoryBackend(max_entries=2)
+    cache = ResponseCache(backend)
+    cache.get("1", "query", lambda: "first")
+    cache.invalidate("1")
+    assert cache.get("1", "query", lambda: "second") == "second"
+
+    # Filling the store with other customers evicts both entries of customer 1
+    cache.get("2", "query", lambda: "other")
+    cache.get("3", "query", lambda: "other")
+
+    assert len(backend) == 2
+    assert "1" not in backend._generations
+    # The stale first entry is gone too, so starting over cannot serve it
+    assert cache.get("1", "query", lambda: "third") == "third"
+
+
+def test_generations_of_idle_customers_are_bounded():
+    backend = MemoryBackend(max_entries=2)
+    cache = ResponseCache(backend)
+    for customer_id in range(10):
+        cache.invalidate(str(customer_id))
+
+    assert list(backend._generations) == ["8", "9"]
+
@@ -0,0 +1,31 @@
+import pytest
+
+from services.scheduler import MUTATE, READ, RateLimitExceeded, RequestScheduler
+
+
+def test_acquire_rejects_calls_over_the_limit():
+    scheduler = RequestScheduler(customer_read_rate=1, burst=1, max_wait=0.5)
+    scheduler.acquire("token", "1", READ)
+
+    with pytest.raises(RateLimitExceeded) as raised:
+        scheduler.acquire("token", "1", READ)
+
+    assert raised.value.retry_after > 0.5
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_customer_quota_error_does_not_block_other_customers():
+    scheduler = RequestScheduler(max_wait=0)
+    scheduler.block("token", "1", 60)
+
+    scheduler.acquire("token", "2", MUTATE)
+    with pytest.raises(RateLimitExceeded):
+        scheduler.acquire("token", "1", MUTATE)
+
+
+def test_developer_quota_error_blocks_every_customer():
+    scheduler = RequestScheduler(max_wait=0)
+    scheduler.block("token", "1", 60, developer_scope=True)
+
+    with pytest.raises(RateLimitExceeded):
+        scheduler.acquire("token", "2", MUTATE)
@@ -0,0 +1,79 @@
+import threading
+
+import grpc
+import pytest
+
+from conftest import CREDENTIALS, CUSTOMER_ID
+from services.hierarchy_cache import hierarchy_cache
+from services.response_cache import response_cache
+from services.single_flight import single_flight
+
+CALLERS = 8
+
+
+def run_concurrently(fn):
+    barrier = threading.Barrier(CALLERS)
+    results = [None] * CALLERS
+
+    def call(n):
+        barrier.wait()
+        try:
+            results[n] = fn()
+        except Exception as e:
+            results[n] = e
+
+    threads = [threading.Thread(target=call, args=(n,)) for n in range(CALLERS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def get_ad_campaigns():
+    from services.google_ads_manager import GoogleAdsManager
+    return GoogleAdsManager(client=CREDENTIALS, customer_id=CUSTOMER_ID).get_ad_campaigns()
+
+
+def reset_caches():
+    hierarchy_cache.invalidate()
+    response_cache.invalidate(CUSTOMER_ID)
+
+
+@pytest.fixture
+def slow_backend(backend):
+    # Each RPC takes long enough for every caller to join the leader's flight
+    backend.latency = 0.05
+    return backend
+
+
+def test_identical_calls_share_one_upstream_call(slow_backend):
+    get_ad_campaigns()
+    one_call = slow_backend.snapshot()
+    reset_caches()
+    executions = single_flight.stats()["executions"]
+
+    results = run_concurrently(get_ad_campaigns)
+
+    assert all(result is results[0] for result in results)
+    assert len(results[0]) == 2
+    assert single_flight.stats()["executions"] == executions + 1
+    # The concurrent callers issued the same reads as the single call before them
+    reads = slow_backend.snapshot() - one_call
+    del one_call["OAuth.token"]
+    assert reads == one_call
+
+
+def test_followers_receive_the_leaders_exception(slow_backend):
+    # Build the client first, so only the failing report is shared
+    get_ad_campaigns()
+    reset_caches()
+    slow_backend.error_rate = 1.0
+    slow_backend.error_code = grpc.StatusCode.PERMISSION_DENIED
+    before = slow_backend.snapshot()
+
+    results = run_concurrently(get_ad_campaigns)
+
+    assert isinstance(results[0], Exception)
+    assert all(result is results[0] for result in results)
+    assert (slow_backend.snapshot() - before)["errors"] == 1
@@ -0,0 +1,25 @@
+from conftest import CREDENTIALS, CUSTOMER_ID
+
+BODY = {"customer_id": CUSTOMER_ID, "credentials": CREDENTIALS}
+
+
+def test_mirror_read_after_hierarchy_invalidation(client):
+    assert client.post("/sync_changes", json=BODY).status_code == 200
+    assert client.post("/invalidate_customer_hierarchy", json=BODY).status_code == 200
+
+    # The mirror is fresh and the caller verified, so only the hierarchy is read upstream
+    response = client.post("/mirror/get_campaigns", json=BODY)
+
+    assert response.status_code == 200, response.text
+    campaigns = response.json()
+    assert len(campaigns) == 2
+    assert all(len(account["Campaigns"]) == 3 for account in campaigns.values())
+
+
+def test_mirrored_price_assets_match_live(client):
+    live = client.post("/get_price_assets", json={**BODY, "campaign_name": ""})
+    mirrored = client.post("/mirror/get_price_assets", json=BODY)
+
+    assert mirrored.status_code == 200, mirrored.text
+    assert mirrored.json()["assets"] == live.json()["assets"]
+    assert len(mirrored.json()["assets"]) == 2
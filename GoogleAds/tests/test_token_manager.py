@@ -0,0 +1,42 @@
+import datetime
+import threading
+import time
+
+from google.oauth2.credentials import Credentials
+
+from conftest import CREDENTIALS
+from services.token_manager import TokenManager
+
+
+def test_concurrent_gets_share_one_refresh(monkeypatch):
+    refreshes = []
+
+    def refresh(credentials, request):
+        refreshes.append(credentials.refresh_token)
+        # Hold the refresh long enough for every caller to find the token expired
+        time.sleep(0.05)
+        credentials.token = "access-token"
+        credentials.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(Credentials, "refresh", refresh)
+    manager = TokenManager(check_interval=3600, request_factory=object)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def get():
+        barrier.wait()
+        results.append(manager.get_credentials(CREDENTIALS))
+
+    threads = [threading.Thread(target=get) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert refreshes == [CREDENTIALS["refresh_token"]]
+    assert len({id(credentials) for credentials in results}) == 1
+    assert results[0].token == "access-token"
+    assert manager.stats()["refreshes"] == 1
+
+    manager.get_credentials(CREDENTIALS)
+    assert manager.stats()["hits"] == 1
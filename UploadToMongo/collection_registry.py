@@ -0,0 +1,91 @@
+import asyncio
+import logging
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+MAX_COLLECTION_NAME_LENGTH = 120
+
+
+class InvalidCollectionName(ValueError):
+    pass
+
+
+def validate_collection_name(name):
+    if not name or len(name) > MAX_COLLECTION_NAME_LENGTH:
+        raise InvalidCollectionName(f"Collection name must be 1 to {MAX_COLLECTION_NAME_LENGTH} characters")
+    if "$" in name or "\x00" in name or name.startswith("system.") or name.startswith(".") or name.endswith("."):
+        raise InvalidCollectionName(f"Invalid collection name: {name!r}")
+    return name
+
+
+class CollectionRegistry:
+    """Caches collection handles and creates the configured indexes once per collection.
+
+    ``indexes`` is a list of ``{"keys": [[field, direction], ...], "options": {...}}``
+    specs passed to ``create_index``. Index creation runs in the background after
+    the first write through this process that matched a document in a collection,
+    so names that were never written to do not create collections. Its outcome is
+    kept for the admin listing. At most ``max_handles`` handles are cached, least
+    recently used first out.
+    """
+
+    def __init__(self, db, indexes=None, max_handles=1000):
+        self.db = db
+        self.indexes = indexes or []
+        self.max_handles = max_handles
+        self._collections = OrderedDict()
+        self._index_status = {}
+        self._tasks = set()
+
+    def get(self, name):
+        collection = self._collections.get(name)
+        if collection is None:
+            validate_collection_name(name)
+            collection = self.db[name]
+            self._collections[name] = collection
+            if len(self._collections) > self.max_handles:
+                self._collections.popitem(last=False)
+        else:
+            self._collections.move_to_end(name)
+        return collection
+
+    def record_write(self, name):
+        # A matched document means the collection exists, so creating indexes cannot create it
+        if name in self._index_status:
+            return
+        if not self.indexes:
+            self._index_status[name] = "ready"
+            return
+        self._index_status[name] = "pending"
+        task = asyncio.get_running_loop().create_task(self._ensure_indexes(name, self.db[name]))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _ensure_indexes(self, name, collection):
+        try:
+            for spec in self.indexes:
+                keys = [tuple(key) for key in spec["keys"]]
+                await collection.create_index(keys, **spec.get("options", {}))
+            self._index_status[name] = "ready"
+        except Exception as e:
+            logger.error(f'Failed to create indexes on {name}: {e}')
+            self._index_status[name] = f"failed: {e}"
+
+    def stats(self):
+        statuses = list(self._index_status.values())
+        return {
+            "collections": len(self._collections),
+            "indexes_pending": statuses.count("pending"),
+            "indexes_failed": sum(1 for status in statuses if status.startswith("failed")),
+        }
+
+    async def describe(self):
+        collections = []
+        for name in sorted(await self.db.list_collection_names()):
+            collections.append({
+                "name": name,
+                "document_count": await self.db[name].estimated_document_count(),
+                "indexes": self._index_status.get(name, "unchecked"),
+            })
+        return collections
@@ -1,24 +1,211 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-from pymongo import MongoClient
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel, ValidationError
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from bson.errors import InvalidId
 from bson.objectid import ObjectId
+from collection_registry import CollectionRegistry, InvalidCollectionName
+from metrics import metrics
+from write_buffer import WriteBuffer, WriteConflict
+import json
 import os
 
 app = FastAPI()
 
-client = MongoClient(os.getenv("MONGO"))
+def mongo_client_options():
+    options = {
+        "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "100")),
+        "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+    }
+    write_concern = os.getenv("MONGO_WRITE_CONCERN")
+    if write_concern:
+        options["w"] = int(write_concern) if write_concern.isdigit() else write_concern
+    journal = os.getenv("MONGO_WRITE_CONCERN_JOURNAL")
+    if journal:
+        options["journal"] = journal.lower() in ("1", "true", "yes")
+    return options
+
+client = AsyncIOMotorClient(os.getenv("MONGO"), **mongo_client_options())
 db = client.conversions
 
+collections = CollectionRegistry(
+    db,
+    indexes=json.loads(os.getenv("MONGO_COLLECTION_INDEXES", "[]")),
+    max_handles=int(os.getenv("MONGO_MAX_COLLECTION_HANDLES", "1000")),
+)
+
+write_buffer = None
+if os.getenv("WRITE_BUFFER_ENABLED", "").lower() in ("1", "true", "yes"):
+    write_buffer = WriteBuffer(
+        collections.get,
+        on_written=collections.record_write,
+        window=float(os.getenv("WRITE_BUFFER_WINDOW", "0.05")),
+        max_age=float(os.getenv("WRITE_BUFFER_MAX_AGE", "1.0")),
+        max_pending=int(os.getenv("WRITE_BUFFER_MAX_PENDING", "1000")),
+        max_retries=int(os.getenv("WRITE_BUFFER_MAX_RETRIES", "5")),
+    )
+
+metrics.register_stats("collections", collections.stats)
+if write_buffer is not None:
+    metrics.register_stats(
+        "write_buffer", write_buffer.stats, counters=("received", "written", "flushes", "failed", "retried")
+    )
+
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "1000"))
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
 class UpdateItem(BaseModel):
     id: str
     data: dict
 
+def get_collection(business_name: str):
+    try:
+        return collections.get(business_name)
+    except InvalidCollectionName as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.on_event("startup")
+async def start_write_buffer():
+    if write_buffer is not None:
+        write_buffer.start()
+
+@app.on_event("shutdown")
+async def flush_write_buffer():
+    if write_buffer is not None:
+        await write_buffer.close()
+
 @app.post("/update/{business_name}")
 async def update_item(business_name: str, item: UpdateItem):
-    collection = db[business_name]
-    result = collection.update_one({"_id": ObjectId(item.id)}, {"$set": item.data})
+    collection = get_collection(business_name)
+    try:
+        object_id = ObjectId(item.id)
+    except InvalidId as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if write_buffer is not None:
+        # Buffered writes are applied later, so a missing document cannot be reported here
+        try:
+            await write_buffer.add(business_name, object_id, item.data)
+        except WriteConflict as e:
+            raise HTTPException(status_code=409, detail=str(e))
+        return JSONResponse(status_code=202, content={"message": "Item update queued"})
+
+    with metrics.span("update_one", business_name):
+        result = await collection.update_one({"_id": object_id}, {"$set": item.data})
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Item not found")
+    collections.record_write(business_name)
     
     return {"message": "Item updated successfully"}
+
+def parse_line(line):
+    # Earlier chunks may already be written, so a bad line becomes a per-item error
+    # instead of failing the request; the parse error is yielded in place of the item
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return e
+
+async def iter_bulk_items(request: Request):
+    if request.headers.get("content-type", "").startswith(NDJSON_MEDIA_TYPE):
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield parse_line(line)
+        if buffer.strip():
+            yield parse_line(buffer)
+    else:
+        try:
+            items = await request.json()
+        except ValueError as e:
+            # Nothing has been written yet
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON list of items")
+        for item in items:
+            yield item
+
+async def write_chunk(collection, chunk):
+    # chunk is a list of (result, ObjectId, data); bulk_write only reports totals,
+    # so per-item results carry errors but not whether a document matched
+    if write_buffer is not None:
+        # Older /update calls still buffered for these documents must land first
+        unwritten = await write_buffer.flush_documents(collection.name, [object_id for _, object_id, _ in chunk])
+        for result, object_id, _ in chunk:
+            if object_id in unwritten:
+                result["error"] = "An earlier buffered update to this document could not be written yet"
+        chunk = [item for item in chunk if "error" not in item[0]]
+        if not chunk:
+            return 0, 0
+    operations = [UpdateOne({"_id": object_id}, {"$set": data}) for _, object_id, data in chunk]
+    try:
+        with metrics.span("bulk_write", collection.name):
+            outcome = await collection.bulk_write(operations, ordered=False)
+        matched, modified = outcome.matched_count, outcome.modified_count
+    except BulkWriteError as e:
+        matched, modified = e.details["nMatched"], e.details["nModified"]
+        for error in e.details["writeErrors"]:
+            chunk[error["index"]][0]["error"] = error["errmsg"]
+    if matched:
+        collections.record_write(collection.name)
+    return matched, modified
+
+@app.post("/bulk_update/{business_name}")
+async def bulk_update(business_name: str, request: Request, chunk_size: int = BULK_CHUNK_SIZE):
+    if chunk_size < 1:
+        raise HTTPException(status_code=400, detail="chunk_size must be positive")
+    collection = get_collection(business_name)
+    results = []
+    chunk = []
+    matched_count = 0
+    modified_count = 0
+
+    async for raw_item in iter_bulk_items(request):
+        result = {"index": len(results), "id": None}
+        results.append(result)
+        if isinstance(raw_item, ValueError):
+            result["error"] = f"Invalid JSON: {raw_item}"
+            continue
+        try:
+            item = UpdateItem(**raw_item)
+            result["id"] = item.id
+            chunk.append((result, ObjectId(item.id), item.data))
+        except (ValidationError, InvalidId, TypeError) as e:
+            result["error"] = str(e)
+            continue
+        if len(chunk) >= chunk_size:
+            matched, modified = await write_chunk(collection, chunk)
+            matched_count += matched
+            modified_count += modified
+            chunk = []
+
+    if chunk:
+        matched, modified = await write_chunk(collection, chunk)
+        matched_count += matched
+        modified_count += modified
+
+    return {
+        "message": "Bulk update completed",
+        "matched_count": matched_count,
+        "modified_count": modified_count,
+        "results": results
+    }
+
+@app.get("/write_buffer/stats")
+async def write_buffer_stats():
+    if write_buffer is None:
+        return {"enabled": False}
+    return {"enabled": True, **write_buffer.stats()}
+
+@app.get("/admin/collections")
+async def list_collections():
+    return {"collections": await collections.describe()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,39 @@
+import os
+import sys
+
+import mongomock.collection
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# mongomock predates the sort argument newer pymongo passes for UpdateOne in bulk writes
+_add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+
+def _add_update_without_sort(self, *args, sort=None, **kwargs):
+    return _add_update(self, *args, **kwargs)
+
+
+mongomock.collection.BulkOperationBuilder.add_update = _add_update_without_sort
+
+
+@pytest.fixture
+def db():
+    return AsyncMongoMockClient().conversions
+
+
+@pytest.fixture
+def app(db, monkeypatch):
+    import main
+    from collection_registry import CollectionRegistry
+    monkeypatch.setattr(main, "db", db)
+    monkeypatch.setattr(main, "collections", CollectionRegistry(db))
+    monkeypatch.setattr(main, "write_buffer", None)
+    return main
+
+
+@pytest.fixture
+def client(app):
+    from fastapi.testclient import TestClient
+    return TestClient(app.app)
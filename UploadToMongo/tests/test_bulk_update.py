@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+import pytest
+
+
+@pytest.fixture
+def object_ids(db):
+    async def insert():
+        result = await db.leads.insert_many([{"clicks": 0}, {"clicks": 0}])
+        return [str(object_id) for object_id in result.inserted_ids]
+    return asyncio.run(insert())
+
+
+def read_clicks(db):
+    async def read():
+        return [doc["clicks"] async for doc in db.leads.find().sort("_id", 1)]
+    return asyncio.run(read())
+
+
+def test_json_list(client, db, object_ids):
+    body = [{"id": object_id, "data": {"clicks": 5}} for object_id in object_ids]
+
+    response = client.post("/bulk_update/leads", json=body, params={"chunk_size": 1})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["matched_count"] == 2
+    assert response.json()["modified_count"] == 2
+    assert response.json()["results"] == [{"index": 0, "id": object_ids[0]}, {"index": 1, "id": object_ids[1]}]
+    assert read_clicks(db) == [5, 5]
+
+
+def test_ndjson_reports_bad_lines_and_applies_the_rest(client, db, object_ids):
+    lines = [
+        json.dumps({"id": object_ids[0], "data": {"clicks": 1}}),
+        "{not json",
+        json.dumps({"id": "not-an-object-id", "data": {"clicks": 1}}),
+        "",
+        json.dumps({"id": object_ids[1], "data": {"clicks": 2}}),
+    ]
+
+    response = client.post(
+        "/bulk_update/leads",
+        content="\n".join(lines),
+        headers={"content-type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200, response.text
+    results = response.json()["results"]
+    assert [result["index"] for result in results] == [0, 1, 2, 3]
+    assert results[1]["error"].startswith("Invalid JSON")
+    assert results[2]["id"] == "not-an-object-id" and "error" in results[2]
+    assert "error" not in results[0] and "error" not in results[3]
+    assert response.json()["matched_count"] == 2
+    assert read_clicks(db) == [1, 2]
+
+
+@pytest.mark.parametrize("body", ["{not json", '{"id": "x"}'])
+def test_json_body_rejected_before_writing(client, db, object_ids, body):
+    response = client.post("/bulk_update/leads", content=body, headers={"content-type": "application/json"})
+
+    assert response.status_code == 400
+    assert read_clicks(db) == [0, 0]
+
+
+def test_update_with_invalid_id(client):
+    response = client.post("/update/leads", json={"id": "not-an-object-id", "data": {"clicks": 1}})
+
+    assert response.status_code == 400
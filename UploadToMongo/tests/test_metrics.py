@@ -0,0 +1,13 @@
+from metrics import MetricsRegistry
+
+
+def test_counters_rendered_with_total_suffix():
+    registry = MetricsRegistry("upload_to_mongo")
+    registry.register_stats("write_buffer", lambda: {"pending": 3, "written": 7}, counters=("written",))
+
+    lines = registry.render().splitlines()
+
+    assert "# TYPE upload_to_mongo_write_buffer_pending gauge" in lines
+    assert "upload_to_mongo_write_buffer_pending 3" in lines
+    assert "# TYPE upload_to_mongo_write_buffer_written_total counter" in lines
+    assert "upload_to_mongo_write_buffer_written_total 7" in lines
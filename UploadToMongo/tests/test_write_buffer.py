@@ -0,0 +1,183 @@
+import asyncio
+
+import pytest
+
+from write_buffer import WriteBuffer, WriteConflict, merge_set
+
+
+class FlakyCollection:
+    """Wraps a collection, failing the first ``failures`` bulk writes and recording the ones that ran."""
+
+    def __init__(self, collection, failures=0, delay=0):
+        self.collection = collection
+        self.failures = failures
+        self.delay = delay
+        self.writes = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def bulk_write(self, operations, ordered=True):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.failures:
+                self.failures -= 1
+                raise ConnectionError("connection reset")
+            self.writes.append([operation._doc["$set"] for operation in operations])
+            return await self.collection.bulk_write(operations, ordered=ordered)
+        finally:
+            self.in_flight -= 1
+
+
+def test_updates_to_one_document_are_coalesced(db):
+    async def run():
+        await db.leads.insert_one({"_id": 1})
+        collection = FlakyCollection(db.leads)
+        buffer = WriteBuffer(lambda name: collection)
+
+        await buffer.add("leads", 1, {"clicks": 1, "source": "ad"})
+        await buffer.add("leads", 1, {"clicks": 2})
+        await buffer.add("leads", 1, {"clicks": 3})
+        await buffer.flush()
+
+        assert collection.writes == [[{"clicks": 3, "source": "ad"}]]
+        assert await db.leads.find_one({"_id": 1}) == {"_id": 1, "clicks": 3, "source": "ad"}
+        assert buffer.stats()["received"] == 3
+        assert buffer.stats()["written"] == 1
+
+    asyncio.run(run())
+
+
+def test_concurrent_flushes_keep_later_values_last(db):
+    async def run():
+        await db.leads.insert_one({"_id": 1})
+        collection = FlakyCollection(db.leads, delay=0.05)
+        buffer = WriteBuffer(lambda name: collection, max_pending=1)
+
+        # Each add reaches max_pending and flushes, while the previous flush is still writing
+        await asyncio.gather(*(buffer.add("leads", 1, {"clicks": n}) for n in range(1, 4)))
+        await buffer.flush()
+
+        # The updates made while the first write ran are coalesced into the next one
+        assert collection.max_in_flight == 1
+        assert [write[0]["clicks"] for write in collection.writes] == [1, 3]
+        assert (await db.leads.find_one({"_id": 1}))["clicks"] == 3
+
+    asyncio.run(run())
+
+
+def test_failed_batch_is_requeued_under_newer_updates(db):
+    async def run():
+        await db.leads.insert_one({"_id": 1})
+        collection = FlakyCollection(db.leads, failures=1)
+        buffer = WriteBuffer(lambda name: collection, max_age=60)
+
+        await buffer.add("leads", 1, {"clicks": 1, "source": "ad"})
+        await buffer.flush()
+        await buffer.add("leads", 1, {"clicks": 2})
+
+        # The batch backs off, so a plain flush leaves it alone
+        await buffer.flush()
+        assert collection.writes == []
+        assert buffer.stats()["retried"] == 1
+
+        await buffer.flush(retrying=True)
+        assert collection.writes == [[{"clicks": 2, "source": "ad"}]]
+        assert buffer.stats()["pending"] == 0
+
+    asyncio.run(run())
+
+
+def test_batch_is_dropped_after_max_retries(db):
+    async def run():
+        await db.leads.insert_one({"_id": 1})
+        collection = FlakyCollection(db.leads, failures=3)
+        buffer = WriteBuffer(lambda name: collection, max_retries=2)
+
+        await buffer.add("leads", 1, {"clicks": 1})
+        for _ in range(3):
+            await buffer.flush(retrying=True)
+
+        assert collection.writes == []
+        assert buffer.stats()["pending"] == 0
+        assert buffer.stats()["failed"] == 1
+
+    asyncio.run(run())
+
+
+def test_close_drains_pending_updates(db):
+    async def run():
+        await db.leads.insert_many([{"_id": 1}, {"_id": 2}])
+        buffer = WriteBuffer(lambda name: db[name], window=60, max_age=60)
+        buffer.start()
+
+        await buffer.add("leads", 1, {"clicks": 1})
+        await buffer.add("leads", 2, {"clicks": 2})
+        await buffer.close()
+
+        assert [document async for document in db.leads.find().sort("_id")] == [
+            {"_id": 1, "clicks": 1},
+            {"_id": 2, "clicks": 2},
+        ]
+        assert buffer.stats()["pending"] == 0
+
+    asyncio.run(run())
+
+
+def test_merge_set_handles_overlapping_paths():
+    data = {"a.b": 1, "c": 1}
+    merge_set(data, {"a": {"x": 1}})
+    assert data == {"c": 1, "a": {"x": 1}}
+
+    merge_set(data, {"a.y": 2, "list.2": "z"})
+    assert data == {"c": 1, "a": {"x": 1, "y": 2}, "list.2": "z"}
+
+    with pytest.raises(WriteConflict):
+        merge_set(data, {"c.d": 1})
+    assert data == {"c": 1, "a": {"x": 1, "y": 2}, "list.2": "z"}
+
+
+def test_overlapping_updates_are_written_as_one(db):
+    async def run():
+        await db.leads.insert_one({"_id": 1, "a": {"b": 0, "keep": True}})
+        buffer = WriteBuffer(lambda name: db[name])
+
+        await buffer.add("leads", 1, {"a.b": 1})
+        await buffer.add("leads", 1, {"a": {"c": 2}})
+        await buffer.add("leads", 1, {"a.d": 3})
+        await buffer.flush()
+
+        assert await db.leads.find_one({"_id": 1}) == {"_id": 1, "a": {"c": 2, "d": 3}}
+        assert buffer.stats()["failed"] == 0
+
+    asyncio.run(run())
+
+
+def test_update_rejected_after_pending_scalar_raises(db):
+    async def run():
+        buffer = WriteBuffer(lambda name: db[name])
+        await buffer.add("leads", 1, {"a": 1})
+
+        with pytest.raises(WriteConflict):
+            await buffer.add("leads", 1, {"a.b": 2})
+        assert buffer._pending[("leads", 1)].data == {"a": 1}
+
+    asyncio.run(run())
+
+
+def test_bulk_update_writes_after_buffered_updates(app, client, db):
+    async def insert():
+        return (await db.leads.insert_one({"clicks": 0})).inserted_id
+    object_id = asyncio.run(insert())
+    app.write_buffer = WriteBuffer(app.collections.get, window=60, max_age=60)
+
+    assert client.post("/update/leads", json={"id": str(object_id), "data": {"clicks": 1}}).status_code == 202
+    response = client.post("/bulk_update/leads", json=[{"id": str(object_id), "data": {"clicks": 2}}])
+    assert response.status_code == 200, response.text
+    # The buffered update was written before the bulk item, so nothing is left to flush
+    assert app.write_buffer.stats()["pending"] == 0
+
+    async def read():
+        return await db.leads.find_one({"_id": object_id})
+    assert asyncio.run(read())["clicks"] == 2
@@ -0,0 +1,239 @@
+import asyncio
+import copy
+import logging
+import time
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class WriteConflict(Exception):
+    pass
+
+
+def _set_path(value, parts, new_value):
+    """Sets dotted ``parts`` below ``value`` the way $set would; returns False where $set would fail."""
+    head, rest = parts[0], parts[1:]
+    if isinstance(value, dict):
+        if not rest:
+            value[head] = new_value
+            return True
+        child = value.setdefault(head, {})
+    elif isinstance(value, list) and head.isdigit():
+        index = int(head)
+        # $set pads arrays with nulls up to the index it sets
+        value.extend([None] * (index + 1 - len(value)))
+        if not rest:
+            value[index] = new_value
+            return True
+        if value[index] is None:
+            value[index] = {}
+        child = value[index]
+    else:
+        return False
+    return _set_path(child, rest, new_value)
+
+
+def merge_set(data, updates):
+    """Merges the $set document ``updates`` into ``data`` as if it were applied after it.
+
+    Setting a field drops earlier sets of its subpaths, and setting a subpath of
+    an earlier set field writes into that field's value, so the merged document
+    never sets both "a" and "a.b". Raises WriteConflict, leaving ``data``
+    unchanged, when $set would reject ``updates`` after ``data``, e.g. "a.b"
+    after "a" was set to a number.
+    """
+    merged = dict(data)
+    for path, value in updates.items():
+        for key in [key for key in merged if key.startswith(path + ".")]:
+            del merged[key]
+        parent = next((key for key in merged if path.startswith(key + ".")), None)
+        if parent is None:
+            merged[path] = value
+            continue
+        parent_value = copy.deepcopy(merged[parent])
+        if not _set_path(parent_value, path[len(parent) + 1:].split("."), value):
+            raise WriteConflict(f"Setting '{path}' conflicts with the pending value of '{parent}'")
+        merged[parent] = parent_value
+    data.clear()
+    data.update(merged)
+
+
+class _PendingUpdate:
+    __slots__ = ("data", "first_at", "last_at", "attempts", "retry_at")
+
+    def __init__(self, data, now):
+        self.data = dict(data)
+        self.first_at = now
+        self.last_at = now
+        self.attempts = 0
+        self.retry_at = 0
+
+
+class WriteBuffer:
+    """Coalesces $set updates per (collection, _id) and writes them in bulk.
+
+    An update is held until its document has been quiet for ``window`` seconds,
+    but never longer than ``max_age`` seconds after it was first buffered.
+    Reaching ``max_pending`` buffered documents flushes everything at once.
+    Later values win when several updates set the same field, and updates are
+    merged with ``merge_set`` so overlapping paths behave as in sequential
+    $sets. ``add`` raises WriteConflict for an update that $set would reject
+    after the pending one. A batch that
+    fails as a whole is retried after ``max_age``, doubling the delay each
+    time, and dropped after ``max_retries`` failed attempts. ``on_written`` is
+    called with the collection name after a write that matched documents.
+    Flushes run one at a time, so an older $set to a document can never land
+    after a newer one.
+    """
+
+    def __init__(self, get_collection, window=0.05, max_age=1.0, max_pending=1000, max_retries=5,
+                 on_written=None):
+        self.get_collection = get_collection
+        self.on_written = on_written
+        self.window = window
+        self.max_age = max_age
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self._pending = {}
+        self._task = None
+        self._stopping = None
+        self._flush_lock = asyncio.Lock()
+        self.received = 0
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+        self.retried = 0
+
+    def start(self):
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def close(self):
+        if self._task is not None:
+            # Let the loop finish a flush in progress rather than cancelling it mid-write
+            self._stopping.set()
+            await self._task
+            self._task = None
+        await self.flush(retrying=True)
+        if self._pending:
+            logger.error(f'Write buffer closed with {len(self._pending)} updates still unwritten')
+
+    async def add(self, collection_name, object_id, data):
+        now = time.monotonic()
+        key = (collection_name, object_id)
+        pending = self._pending.get(key)
+        if pending is None:
+            self._pending[key] = _PendingUpdate(data, now)
+        else:
+            merge_set(pending.data, data)
+            pending.last_at = now
+        self.received += 1
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.window / 2)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush(due_only=True)
+            except Exception as e:
+                logger.error(f'Write buffer flush failed: {e}')
+
+    async def flush(self, due_only=False, retrying=False):
+        """Writes buffered updates: the due ones if ``due_only``, otherwise all of them.
+
+        Updates waiting to be retried are left alone unless ``retrying`` is set.
+        """
+        async with self._flush_lock:
+            now = time.monotonic()
+            await self._flush([
+                key for key, pending in self._pending.items()
+                if (retrying or now >= pending.retry_at) and (
+                    not due_only or now - pending.last_at >= self.window or now - pending.first_at >= self.max_age
+                )
+            ])
+
+    async def flush_documents(self, collection_name, object_ids):
+        """Writes the buffered updates of these documents now, retrying ones that failed before.
+
+        Returns the ids whose updates are still buffered because the write failed.
+        """
+        async with self._flush_lock:
+            keys = [(collection_name, object_id) for object_id in object_ids]
+            await self._flush([key for key in keys if key in self._pending])
+            return {object_id for _, object_id in keys if (collection_name, object_id) in self._pending}
+
+    async def _flush(self, keys):
+        if not keys:
+            return
+
+        batches = {}
+        for key in keys:
+            batches.setdefault(key[0], []).append((key, self._pending.pop(key)))
+
+        for collection_name, batch in batches.items():
+            operations = [UpdateOne({"_id": key[1]}, {"$set": pending.data}) for key, pending in batch]
+            try:
+                with metrics.span("buffered_bulk_write", collection_name):
+                    result = await self.get_collection(collection_name).bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                matched = e.details["nMatched"]
+                self.failed += len(e.details["writeErrors"])
+                logger.error(f'Write buffer dropped {len(e.details["writeErrors"])} updates to {collection_name}: '
+                             f'{e.details["writeErrors"][0]["errmsg"]}')
+            except asyncio.CancelledError:
+                # The write may not have happened; $set is idempotent, so keep the batch for a later flush
+                self._requeue(batch, count_attempt=False)
+                raise
+            except Exception as e:
+                # Nothing was confirmed written, so put the batch back under any newer updates
+                logger.error(f'Write buffer flush to {collection_name} failed: {e}')
+                self._requeue(batch)
+                continue
+            else:
+                matched = result.matched_count
+            self.written += matched
+            self.flushes += 1
+            if matched and self.on_written is not None:
+                self.on_written(collection_name)
+
+    def _requeue(self, batch, count_attempt=True):
+        now = time.monotonic()
+        for key, pending in batch:
+            if count_attempt:
+                pending.attempts += 1
+                if pending.attempts > self.max_retries:
+                    self.failed += 1
+                    logger.error(f'Write buffer dropped the update to {key} after {self.max_retries} retries')
+                    continue
+                self.retried += 1
+                pending.retry_at = now + self.max_age * 2 ** (pending.attempts - 1)
+            newer = self._pending.get(key)
+            if newer is not None:
+                try:
+                    merge_set(pending.data, newer.data)
+                except WriteConflict as e:
+                    # Mongo would reject the newer update once this one is written, as it does alone
+                    self.failed += 1
+                    logger.error(f'Write buffer dropped the update to {key}: {e}')
+                pending.last_at = newer.last_at
+            pending.first_at = now
+            self._pending[key] = pending
+
+    def stats(self):
+        return {
+            "pending": len(self._pending),
+            "received": self.received,
+            "written": self.written,
+            "flushes": self.flushes,
+            "failed": self.failed,
+            "retried": self.retried,
+            "coalescing_ratio": self.received / self.written if self.written else None,
+        }
@@ -0,0 +1,140 @@
+"""Drives the Google Ads service against FakeGoogleAds.
+
+Example:
+    python benchmarks/bench_google_ads.py --scenario get_campaigns --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import tempfile
+
+import grpc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "GoogleAds"))
+
+# Keep benchmark state out of the working directory
+_state_dir = tempfile.mkdtemp(prefix="google-ads-bench-")
+os.environ.setdefault("GOOGLE_ADS_ASSET_INDEX_PATH", os.path.join(_state_dir, "asset_index.sqlite3"))
+os.environ.setdefault("GOOGLE_ADS_AUTH_STATE_PATH", os.path.join(_state_dir, "auth_state.sqlite3"))
+os.environ.setdefault("GOOGLE_ADS_SYNC_PATH", os.path.join(_state_dir, "change_mirror.sqlite3"))
+
+from fake_google_ads import FakeGoogleAds, install  # noqa: E402
+from harness import run_scenario  # noqa: E402
+
+CUSTOMER_ID = "1234567890"
+CREDENTIALS = {
+    "refresh_token": "fake-refresh-token",
+    "token_uri": "https://oauth2.googleapis.com/token",
+    "client_id": "fake-client-id",
+    "client_secret": "fake-client-secret",
+    "scopes": ["https://www.googleapis.com/auth/adwords"],
+    "universe_domain": "googleapis.com",
+    "account": "",
+    "expiry": "",
+    "developer_token": "fake-developer-token",
+}
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def get_campaigns(args):
+    async def send(client, index):
+        body = {"customer_id": CUSTOMER_ID, "credentials": CREDENTIALS, "concurrent": args.concurrent_fan_out}
+        return await client.post("/get_campaigns", json=body)
+    return send
+
+
+def create_ad(args):
+    async def send(client, index):
+        return await client.post("/create_ad", json={
+            "customer_id": CUSTOMER_ID,
+            "campaign_name": f"Campaign {index % args.campaigns + 1}",
+            "headlines": ["Fast delivery", "Great prices", "Order today"],
+            "descriptions": ["Everything you need.", "Shipped in a day."],
+            "keywords": [f"keyword {index} {n}" for n in range(args.keywords)],
+            "credentials": CREDENTIALS,
+            "final_url": "https://example.com",
+        })
+    return send
+
+
+def upload_logos(args):
+    async def send(client, index):
+        files = []
+        for n in range(args.files):
+            # --distinct-images bounds how many different images exist, so repeats exercise deduplication
+            image_id = (index * args.files + n) % args.distinct_images
+            data = PNG_SIGNATURE + image_id.to_bytes(8, "big") * (args.image_bytes // 8)
+            files.append(("files", (f"logo-{image_id}.png", data, "image/png")))
+        form = {"customer_id": CUSTOMER_ID, "campaign_name": "Benchmark", "credentials": json.dumps(CREDENTIALS)}
+        return await client.post("/upload_logos", data=form, files=files)
+    return send
+
+
+def get_logo_assets(args):
+    async def send(client, index):
+        body = {"customer_id": CUSTOMER_ID, "campaign_name": "Benchmark", "credentials": CREDENTIALS}
+        return await client.post("/get_logo_assets", json=body)
+    return send
+
+
+SCENARIOS = {
+    "get_campaigns": get_campaigns,
+    "create_ad": create_ad,
+    "upload_logos": upload_logos,
+    "get_logo_assets": get_logo_assets,
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=0, help="unmeasured requests sent first")
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per fake RPC")
+    parser.add_argument("--batch-latency", type=float, default=0.0, help="seconds between streamed batches")
+    parser.add_argument("--page-size", type=int, default=1000, help="rows per search_stream batch")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability that a fake RPC fails")
+    parser.add_argument("--error-code", default="UNAVAILABLE", help="gRPC status of injected failures")
+    parser.add_argument("--accounts", type=int, default=5, help="child accounts per customer")
+    parser.add_argument("--campaigns", type=int, default=20, help="campaigns per account")
+    parser.add_argument("--assets", type=int, default=200, help="image assets per account")
+    parser.add_argument("--keywords", type=int, default=5, help="keywords per created ad")
+    parser.add_argument("--files", type=int, default=3, help="images per upload request")
+    parser.add_argument("--distinct-images", type=int, default=1000)
+    parser.add_argument("--image-bytes", type=int, default=64 * 1024)
+    parser.add_argument("--concurrent-fan-out", action="store_true", help="use concurrent campaign listing")
+    return parser.parse_args()
+
+
+async def main(args):
+    backend = FakeGoogleAds(
+        accounts=args.accounts,
+        campaigns=args.campaigns,
+        assets=args.assets,
+        latency=args.latency,
+        batch_latency=args.batch_latency,
+        page_size=args.page_size,
+        error_rate=args.error_rate,
+        error_code=getattr(grpc.StatusCode, args.error_code),
+    )
+    install(backend)
+    from main import app
+
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    for name in names:
+        # Routes print request details; keep them out of the report
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            result = await run_scenario(
+                app, name, SCENARIOS[name](args), args.requests, args.concurrency,
+                warmup=args.warmup, counters=backend.snapshot
+            )
+        print(result.report())
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
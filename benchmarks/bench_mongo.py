@@ -0,0 +1,103 @@
+"""Drives the Mongo update service against mongomock or a local mongod.
+
+Example:
+    python benchmarks/bench_mongo.py --requests 2000 --concurrency 50 --buffered
+    python benchmarks/bench_mongo.py --mongo-url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import os
+import sys
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "UploadToMongo"))
+
+from harness import run_scenario  # noqa: E402
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=["update", "bulk_update", "all"], default="all")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=0, help="unmeasured requests sent first")
+    parser.add_argument("--documents", type=int, default=100, help="distinct documents updated")
+    parser.add_argument("--bulk-items", type=int, default=500, help="items per /bulk_update request")
+    parser.add_argument("--business", default="benchmark", help="collection to write to")
+    parser.add_argument("--buffered", action="store_true", help="enable the write-behind buffer")
+    parser.add_argument("--mongo-url", help="use a real MongoDB instead of mongomock")
+    return parser.parse_args()
+
+
+def use_mongomock(app_module):
+    from mongomock_motor import AsyncMongoMockClient
+    import mongomock.collection
+
+    # mongomock predates the sort argument newer pymongo passes for UpdateOne in bulk writes
+    add_update = mongomock.collection.BulkOperationBuilder.add_update
+
+    def add_update_without_sort(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+    mongomock.collection.BulkOperationBuilder.add_update = add_update_without_sort
+
+    app_module.client = AsyncMongoMockClient()
+    app_module.db = app_module.client.conversions
+    app_module.collections.db = app_module.db
+
+
+class OperationCounter:
+    """Counts Mongo calls as recorded by the service's metrics registry."""
+
+    def __init__(self, metrics):
+        self.metrics = metrics
+
+    def __call__(self):
+        counts = Counter()
+        for (method, _, _), series in list(self.metrics._series.items()):
+            counts[method] += series.count
+        return counts
+
+
+async def main(args):
+    if args.mongo_url:
+        os.environ["MONGO"] = args.mongo_url
+    if args.buffered:
+        os.environ["WRITE_BUFFER_ENABLED"] = "true"
+    os.environ["METRICS_ENABLED"] = "true"
+    import main as app_module
+    if not args.mongo_url:
+        use_mongomock(app_module)
+
+    collection = app_module.collections.get(args.business)
+    ids = [(await collection.insert_one({"seq": n})).inserted_id for n in range(args.documents)]
+
+    async def update(client, index):
+        body = {"id": str(ids[index % len(ids)]), "data": {"counter": index, f"field_{index % 10}": index}}
+        return await client.post(f"/update/{args.business}", json=body)
+
+    async def bulk_update(client, index):
+        items = [
+            {"id": str(ids[(index + n) % len(ids)]), "data": {"counter": index, "item": n}}
+            for n in range(args.bulk_items)
+        ]
+        return await client.post(f"/bulk_update/{args.business}", json=items)
+
+    scenarios = {"update": update, "bulk_update": bulk_update}
+    names = list(scenarios) if args.scenario == "all" else [args.scenario]
+    if app_module.write_buffer is not None:
+        app_module.write_buffer.start()
+    counter = OperationCounter(app_module.metrics)
+    for name in names:
+        result = await run_scenario(
+            app_module.app, name, scenarios[name], args.requests, args.concurrency,
+            warmup=args.warmup, counters=counter
+        )
+        print(result.report())
+    if app_module.write_buffer is not None:
+        await app_module.write_buffer.close()
+        print(f"write buffer    {app_module.write_buffer.stats()}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,255 @@
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import grpc
+from google.ads.googleads.client import GoogleAdsClient
+from google.auth.credentials import AnonymousCredentials
+
+FROM_PATTERN = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+LIMIT_PATTERN = re.compile(r"\bLIMIT\s+(\d+)", re.IGNORECASE)
+ASSET_TYPE_PATTERN = re.compile(r"\basset\.type\s*=\s*(\w+)", re.IGNORECASE)
+
+
+class FakeRpcError(grpc.RpcError):
+    def __init__(self, status_code, message="Injected failure"):
+        super().__init__(message)
+        self._status_code = status_code
+        self._message = message
+
+    def code(self):
+        return self._status_code
+
+    def details(self):
+        return self._message
+
+
+def _collection(snake_name):
+    # ad_group -> adGroups, campaign_budget -> campaignBudgets
+    first, *rest = snake_name.split("_")
+    return first + "".join(part.title() for part in rest) + "s"
+
+
+class _FakeService:
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def __getattr__(self, method):
+        if method.endswith("_path"):
+            collection = _collection(method[:-len("_path")])
+            return lambda customer_id, *ids: f"customers/{customer_id}/{collection}/{'~'.join(map(str, ids))}"
+        if method == "search_stream":
+            return self.backend.search_stream
+        if method == "mutate":
+            return self.backend.mutate
+        if method.startswith("mutate_"):
+            return lambda **kwargs: self.backend.mutate_resources(f"{self.name}.{method}", method, **kwargs)
+        raise AttributeError(method)
+
+
+def _check_price_asset(operation):
+    # The fields the API requires of a new price asset; a request missing any is rejected whole
+    asset = operation.create
+    if type(asset).pb(asset).WhichOneof("asset_data") != "price_asset":
+        return
+    price_asset = asset.price_asset
+    problems = []
+    if not price_asset.type_:
+        problems.append("type")
+    if not price_asset.language_code:
+        problems.append("language_code")
+    if not 3 <= len(price_asset.price_offerings) <= 8:
+        problems.append("price_offerings (3 to 8 required)")
+    for position, offering in enumerate(price_asset.price_offerings):
+        for field in ("header", "description", "final_url"):
+            if not getattr(offering, field):
+                problems.append(f"price_offerings[{position}].{field}")
+        if not offering.price.currency_code:
+            problems.append(f"price_offerings[{position}].price.currency_code")
+    if problems:
+        raise FakeRpcError(grpc.StatusCode.INVALID_ARGUMENT, f"Invalid price asset: {', '.join(problems)}")
+
+
+class FakeGoogleAds:
+    """In-process stand-in for the Google Ads API and the OAuth token endpoint.
+
+    Every customer has ``accounts`` child accounts, each with ``campaigns``
+    campaigns, ``assets`` image assets and ``price_assets`` price assets. Each RPC sleeps ``latency`` seconds
+    before answering, streams results in batches of ``page_size`` rows with
+    ``batch_latency`` seconds between batches, and fails with ``error_code``
+    with probability ``error_rate``. ``rpcs`` counts calls per method.
+    """
+
+    def __init__(self, accounts=5, campaigns=20, assets=200, latency=0.05, batch_latency=0.0,
+                 page_size=1000, error_rate=0.0, error_code=grpc.StatusCode.UNAVAILABLE, seed=0, price_assets=0):
+        self.accounts = accounts
+        self.campaigns = campaigns
+        self.assets = assets
+        self.price_assets = price_assets
+        self.latency = latency
+        self.batch_latency = batch_latency
+        self.page_size = page_size
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.rpcs = Counter()
+        self._random = random.Random(seed)
+        self._ids = itertools.count(10 ** 9)
+        self._rows = {}
+        self._lock = threading.Lock()
+        # Used only to build real proto-plus rows and enums
+        self._types = GoogleAdsClient(credentials=AnonymousCredentials(), developer_token="fake", use_proto_plus=True)
+
+    def build_client(self, config):
+        """Client pool factory returning a client whose services are answered by this fake."""
+        client = GoogleAdsClient(
+            credentials=AnonymousCredentials(),
+            developer_token=config["developer_token"],
+            login_customer_id=config.get("login_customer_id"),
+            use_proto_plus=True,
+        )
+        client.get_service = lambda name, *args, **kwargs: _FakeService(self, name)
+        return client
+
+    def token_request(self):
+        """Token manager request factory answering refresh-token exchanges locally."""
+        def request(url, method="GET", body=None, headers=None, **kwargs):
+            self._call("OAuth.token")
+            data = json.dumps({"access_token": "fake-access-token", "expires_in": 3600}).encode()
+            return SimpleNamespace(status=200, headers={}, data=data)
+        return request
+
+    def snapshot(self):
+        with self._lock:
+            return Counter(self.rpcs)
+
+    def _call(self, method):
+        with self._lock:
+            self.rpcs[method] += 1
+            failed = self._random.random() < self.error_rate
+            if failed:
+                self.rpcs["errors"] += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            raise FakeRpcError(self.error_code)
+
+    def _next_id(self):
+        with self._lock:
+            return next(self._ids)
+
+    def search_stream(self, customer_id, query, timeout=None, **kwargs):
+        self._call("GoogleAdsService.search_stream")
+        rows = self._resource_rows(customer_id, FROM_PATTERN.search(query).group(1))
+        asset_type = ASSET_TYPE_PATTERN.search(query)
+        if asset_type:
+            rows = [row for row in rows if row.asset.type_.name == asset_type.group(1).upper()]
+        limit = LIMIT_PATTERN.search(query)
+        if limit:
+            rows = rows[:int(limit.group(1))]
+        for start in range(0, max(len(rows), 1), self.page_size):
+            if start and self.batch_latency:
+                time.sleep(self.batch_latency)
+            batch = self._types.get_type("SearchGoogleAdsStreamResponse")
+            batch.results.extend(rows[start:start + self.page_size])
+            yield batch
+
+    def _resource_rows(self, customer_id, resource):
+        key = (customer_id, resource)
+        rows = self._rows.get(key)
+        if rows is None:
+            rows = self._build_rows(customer_id, resource)
+            self._rows[key] = rows
+        return rows
+
+    def _build_rows(self, customer_id, resource):
+        enums = self._types.enums
+        rows = []
+        if resource == "customer":
+            row = self._types.get_type("GoogleAdsRow")
+            row.customer.id = int(customer_id)
+            rows.append(row)
+        elif resource == "customer_client":
+            for index in range(self.accounts):
+                row = self._types.get_type("GoogleAdsRow")
+                row.customer_client.id = 1000000000 + index
+                row.customer_client.descriptive_name = f"Account {index}"
+                rows.append(row)
+        elif resource == "campaign":
+            for campaign_id in range(1, self.campaigns + 1):
+                row = self._types.get_type("GoogleAdsRow")
+                row.customer.id = int(customer_id)
+                row.campaign.id = campaign_id
+                row.campaign.resource_name = f"customers/{customer_id}/campaigns/{campaign_id}"
+                row.campaign.name = f"Campaign {campaign_id}"
+                row.campaign.status = enums.CampaignStatusEnum.ENABLED
+                row.campaign.campaign_budget = f"customers/{customer_id}/campaignBudgets/{campaign_id}"
+                row.campaign_budget.amount_micros = 10000000 * campaign_id
+                rows.append(row)
+        elif resource == "asset":
+            for asset_id in range(1, self.assets + 1):
+                row = self._types.get_type("GoogleAdsRow")
+                row.asset.id = asset_id
+                row.asset.resource_name = f"customers/{customer_id}/assets/{asset_id}"
+                row.asset.name = f"Asset {asset_id} Logo"
+                row.asset.type_ = enums.AssetTypeEnum.IMAGE
+                row.asset.image_asset.file_size = 2048
+                row.asset.image_asset.full_size.width_pixels = 128
+                row.asset.image_asset.full_size.height_pixels = 128
+                row.asset.image_asset.full_size.url = f"https://example.com/{asset_id}.png"
+                rows.append(row)
+            for asset_id in range(self.assets + 1, self.assets + self.price_assets + 1):
+                row = self._types.get_type("GoogleAdsRow")
+                row.asset.id = asset_id
+                row.asset.resource_name = f"customers/{customer_id}/assets/{asset_id}"
+                row.asset.name = f"Asset {asset_id} Price"
+                row.asset.type_ = enums.AssetTypeEnum.PRICE
+                row.asset.price_asset.type_ = enums.PriceExtensionTypeEnum.SERVICES
+                offering = self._types.get_type("PriceOffering")
+                offering.header = f"Service {asset_id}"
+                offering.price.amount_micros = 1000000 * asset_id
+                offering.price.currency_code = "USD"
+                offering.unit = enums.PriceExtensionPriceUnitEnum.PER_HOUR
+                row.asset.price_asset.price_offerings.append(offering)
+                rows.append(row)
+        return rows
+
+    def mutate(self, customer_id, mutate_operations, partial_failure=False, **kwargs):
+        self._call("GoogleAdsService.mutate")
+        responses = []
+        for operation in mutate_operations:
+            field = type(operation).pb(operation).WhichOneof("operation")
+            resource = field[:-len("_operation")]
+            result = SimpleNamespace(resource_name=f"customers/{customer_id}/{_collection(resource)}/{self._next_id()}")
+            responses.append(SimpleNamespace(**{f"{resource}_result": result}))
+        return SimpleNamespace(mutate_operation_responses=responses, partial_failure_error=None)
+
+    def mutate_resources(self, name, method, customer_id, operations, partial_failure=False, **kwargs):
+        self._call(name)
+        if method == "mutate_assets":
+            for operation in operations:
+                _check_price_asset(operation)
+        collection = _collection(method[:-1][len("mutate_"):])
+        results = [
+            SimpleNamespace(resource_name=f"customers/{customer_id}/{collection}/{self._next_id()}")
+            for _ in operations
+        ]
+        return SimpleNamespace(results=results, partial_failure_error=None)
+
+
+def install(backend):
+    """Routes the Google Ads service's client pool and token manager to ``backend``.
+
+    Must be called after the GoogleAds directory is on sys.path.
+    """
+    from services.client_pool import client_pool
+    from services.token_manager import token_manager
+    client_pool.factory = backend.build_client
+    client_pool.invalidate()
+    token_manager.request_factory = backend.token_request
+    token_manager.invalidate()
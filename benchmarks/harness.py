@@ -0,0 +1,70 @@
+import asyncio
+import resource
+import time
+from collections import Counter
+
+import httpx
+
+
+class ScenarioResult:
+    def __init__(self, name, latencies, statuses, elapsed, rpcs=None):
+        self.name = name
+        self.latencies = sorted(latencies)
+        self.statuses = statuses
+        self.elapsed = elapsed
+        self.rpcs = rpcs or Counter()
+
+    def percentile(self, q):
+        if not self.latencies:
+            return 0.0
+        index = min(len(self.latencies) - 1, max(0, round(q / 100 * len(self.latencies)) - 1))
+        return self.latencies[index]
+
+    def report(self):
+        count = len(self.latencies)
+        lines = [
+            f"{self.name}",
+            f"  requests        {count} in {self.elapsed:.2f}s ({count / self.elapsed if self.elapsed else 0:.1f} req/s)",
+            f"  latency         p50 {self.percentile(50) * 1000:.1f} ms, p99 {self.percentile(99) * 1000:.1f} ms, "
+            f"max {self.latencies[-1] * 1000 if count else 0:.1f} ms",
+            f"  status codes    {dict(sorted(self.statuses.items()))}",
+        ]
+        for method, calls in sorted(self.rpcs.items()):
+            lines.append(f"  rpc {method:<40} {calls} ({calls / count if count else 0:.2f} per request)")
+        lines.append(f"  peak RSS        {peak_rss_mib():.1f} MiB")
+        return "\n".join(lines)
+
+
+def peak_rss_mib():
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def run_scenario(app, name, send, total, concurrency, warmup=0, counters=None):
+    """Sends ``total`` requests through ``send(client, index)`` with at most ``concurrency`` in flight.
+
+    ``counters`` is an optional callable returning a Counter of upstream calls;
+    its change over the measured requests is reported per request.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+        for index in range(warmup):
+            await send(client, index)
+
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies = []
+        statuses = Counter()
+
+        async def one(index):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await send(client, warmup + index)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] += 1
+
+        before = counters() if counters else Counter()
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(total)))
+        elapsed = time.perf_counter() - started
+        rpcs = counters() - before if counters else Counter()
+    return ScenarioResult(name, latencies, statuses, elapsed, rpcs)